@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+⏱️ Nina Benchmarks - Suite de performance (routage, agents, caches, points d'entrée)
+
+Usage :
+    python benchmarks/bench_nina.py                      # Mesure et compare à la référence
+    python benchmarks/bench_nina.py --save-baseline      # Enregistre la référence
+    python benchmarks/bench_nina.py --threshold 0.10     # Régression si +10% sur p50/p95
+    python benchmarks/bench_nina.py --only startup       # Démarrage à froid, coût des imports et budget
+    python benchmarks/bench_nina.py --only memory        # Octets par entrée de cache et par résultat
+"""
+
+import io
+import sys
+import json
+import time
+import hashlib
+import tracemalloc
+import argparse
+import tempfile
+import contextlib
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+CORPUS_FILE = Path(__file__).parent / "corpus_fr.tsv"
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+
+from agents.agent_manager import AgentManager
+from agents.math_agent import MathAgent
+from agents.knowledge_agent import KnowledgeAgent
+from agents.system_agent import SystemAgent
+from agents.system_sampler import StaticSampler
+from agents.agent_result import AgentResult
+from agents.config import CONFIG_FILE, load_section
+from agents.response_cache import ResponseCache, DEFAULT_SETTINGS as CACHE_SETTINGS
+
+
+def load_corpus(path: Path = CORPUS_FILE) -> List[Tuple[str, str]]:
+    """Charge le corpus (catégorie, requête)"""
+    corpus = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            category, query = line.split("\t", 1)
+            corpus.append((category, query))
+    return corpus
+
+
+def percentiles(samples_ns: List[int]) -> Dict:
+    """Résumé d'une série de mesures (en microsecondes)"""
+    ordered = sorted(samples_ns)
+    if not ordered:
+        return {"count": 0}
+
+    def rank(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        return ordered[index] / 1000
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered) / 1000,
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "max": ordered[-1] / 1000,
+    }
+
+
+@contextlib.contextmanager
+def quiet():
+    """Masque les messages d'initialisation des agents"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def build_agents() -> List[object]:
+    """Agents du benchmark, SystemAgent sur un instantané figé (résultats déterministes)"""
+    with quiet():
+        return [MathAgent(), KnowledgeAgent(), SystemAgent(sampler=StaticSampler())]
+
+
+def build_manager() -> AgentManager:
+    """AgentManager sur les agents du benchmark"""
+    with quiet():
+        return AgentManager(agents=build_agents())
+
+
+def bench_routing(corpus: List[Tuple[str, str]], iterations: int) -> Dict:
+    """Latence de AgentManager.find_best_agent"""
+    manager = build_manager()
+    samples = []
+    for _ in range(iterations):
+        for _, query in corpus:
+            start = time.perf_counter_ns()
+            manager.find_best_agent(query)
+            samples.append(time.perf_counter_ns() - start)
+    return {"routing": percentiles(samples)}
+
+
+def bench_agents(corpus: List[Tuple[str, str]], iterations: int) -> Dict:
+    """Latence de process() par agent, sur les requêtes que le routage lui confie"""
+    manager = build_manager()
+    samples = {agent.name: [] for agent in manager.agents}
+    routed = [(manager.find_best_agent(query), query) for _, query in corpus]
+
+    for _ in range(iterations):
+        for agent, query in routed:
+            if agent is None:
+                continue
+            start = time.perf_counter_ns()
+            agent.process(query)
+            samples[agent.name].append(time.perf_counter_ns() - start)
+
+    return {f"process.{name}": percentiles(values) for name, values in samples.items()}
+
+
+def bench_cache(corpus: List[Tuple[str, str]], iterations: int) -> Dict:
+    """Chemins succès/échec du cache dans BaseAgent.execute"""
+    manager = build_manager()
+    routed = [(manager.find_best_agent(query), query) for _, query in corpus]
+    routed = [(agent, query) for agent, query in routed if agent is not None]
+    hits, misses = [], []
+
+    for _ in range(iterations):
+        # Échec : cache vidé avant chaque appel
+        for agent, query in routed:
+            agent.cache.clear()
+            start = time.perf_counter_ns()
+            agent.execute(query)
+            misses.append(time.perf_counter_ns() - start)
+
+        # Succès : la réponse vient d'être calculée
+        for agent, query in routed:
+            start = time.perf_counter_ns()
+            agent.execute(query)
+            hits.append(time.perf_counter_ns() - start)
+
+    return {"execute.cache_miss": percentiles(misses), "execute.cache_hit": percentiles(hits)}
+
+
+def bench_end_to_end(corpus: List[Tuple[str, str]], iterations: int) -> Dict:
+    """NinaAdvanced.get_response : premier passage (froid) puis passages suivants (chaud)"""
+    from nina_advanced import NinaAdvanced
+
+    cold, warm = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        with quiet():
+            nina = NinaAdvanced(agent_manager=build_manager(), cache_db=Path(tmp) / "bench_cache.db")
+
+        for iteration in range(iterations):
+            for _, query in corpus:
+                start = time.perf_counter_ns()
+                nina.get_response(query)
+                (cold if iteration == 0 else warm).append(time.perf_counter_ns() - start)
+
+        nina.cache.close()
+
+    return {"end_to_end.cold": percentiles(cold), "end_to_end.warm": percentiles(warm)}
+
+
+STARTUP_CODE = (
+    "import sys, tempfile, pathlib; sys.path.insert(0, sys.argv[1]); "
+    "from nina_advanced import NinaAdvanced; "
+    "NinaAdvanced(cache_db=pathlib.Path(tempfile.mkdtemp()) / 'startup.db')"
+)
+
+
+def startup_time(env: Dict = None) -> int:
+    """Durée (ns) d'un démarrage à froid dans un nouvel interpréteur (`env` : environnement du processus)"""
+    start = time.perf_counter_ns()
+    subprocess.run([sys.executable, "-c", STARTUP_CODE, str(SRC_DIR)], check=True, env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter_ns() - start
+
+
+def bench_startup(runs: int) -> Dict:
+    """Démarrage à froid : nouvel interpréteur jusqu'à NinaAdvanced prête"""
+    return {"startup": percentiles([startup_time() for _ in range(runs)])}
+
+
+def traced_bytes(build) -> int:
+    """Mémoire encore allouée (octets) par ce que construit `build` (gardé en vie pendant la mesure)"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return allocated
+
+
+def bench_memory(corpus: List[Tuple[str, str]], entries: int = 2000) -> Dict:
+    """Octets par entrée de cache et par résultat : représentation d'avant (clé md5 hexadécimale, réponse en
+    clair, dictionnaire) et actuelle (empreinte brute de 16 octets, longues réponses compressées, AgentResult)"""
+    manager = build_manager()
+    responses = []
+    for _, query in corpus:
+        agent = manager.find_best_agent(query)
+        if agent is not None:
+            responses.append(agent.process(query))
+    # Réponses longues du type LLM : plusieurs paragraphes au-delà du seuil de compression
+    long_responses = ["\n\n".join(responses[i:i + 12] * 3) for i in range(len(responses))]
+
+    def fill(values: List[str], digest: bool, compress_threshold: int):
+        def build():
+            cache = ResponseCache(max_entries=entries, max_bytes=1 << 30, compress_threshold=compress_threshold)
+            for i in range(entries):
+                key = hashlib.md5(f"Agent:requête {i}".encode())
+                # Réponse neuve, comme celle produite par un agent (pas une chaîne partagée)
+                cache.set(key.digest() if digest else key.hexdigest(), f"{values[i % len(values)]} ({i})")
+            return cache
+        return traced_bytes(build) / entries
+
+    def results(compact: bool):
+        fields = {"response": responses[0], "agent": "MathAgent", "cached": False, "response_time": 0.25,
+                  "agent_confidence": 0.9, "confidence": 0.95, "total_time": 0.3, "error": None}
+        make = (lambda: AgentResult(**fields)) if compact else (lambda: dict(fields))
+        return traced_bytes(lambda: [make() for _ in range(entries)]) / entries
+
+    threshold = CACHE_SETTINGS["cache_compress_threshold"]
+    return {
+        "memory.cache_entry": {"before": fill(responses, False, None), "after": fill(responses, True, threshold)},
+        "memory.cache_entry_long": {"before": fill(long_responses, False, None),
+                                    "after": fill(long_responses, True, threshold)},
+        "memory.result": {"before": results(False), "after": results(True)},
+    }
+
+
+def print_memory(results: Dict):
+    """Affiche les octets par objet avant/après"""
+    labels = {"memory.cache_entry": "entrée de cache (réponse courte)",
+              "memory.cache_entry_long": "entrée de cache (réponse longue)",
+              "memory.result": "résultat de requête"}
+    print("\n🧮 Mémoire par objet (octets) :")
+    for metric, label in labels.items():
+        before, after = results[metric]["before"], results[metric]["after"]
+        print(f"   {label:<34}{before:>9.0f} → {after:>7.0f}  ({(after / before - 1) * 100:+.0f}%)")
+
+
+def import_report() -> List[Tuple[str, float]]:
+    """Coût des imports au démarrage (python -X importtime), en ms par paquet et par module de Nina"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", STARTUP_CODE, str(SRC_DIR)],
+                               check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    costs = {}
+    for line in completed.stderr.splitlines():
+        # "import time:  self [us] | cumulative | nom" (indentation = profondeur)
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        # Modules de Nina détaillés, dépendances regroupées par paquet (les temps propres s'additionnent)
+        key = name if name.startswith(("agents.", "nina_")) else name.split(".")[0]
+        # (un import concurrent, dans le thread de préchargement, peut donner un temps propre négatif)
+        costs[key] = costs.get(key, 0.0) + max(0, int(self_us)) / 1000
+    return sorted(costs.items(), key=lambda item: item[1], reverse=True)
+
+
+def print_import_report(costs: List[Tuple[str, float]], top: int):
+    """Affiche les imports les plus coûteux"""
+    total = sum(cost for _, cost in costs)
+    print(f"\n📦 Imports au démarrage : {total:.1f} ms ({len(costs)} paquets/modules)")
+    for name, cost in costs[:top]:
+        print(f"   {name:<32}{cost:>8.1f} ms  {cost / total:>5.1%}")
+
+
+def load_startup_budget() -> float:
+    """Budget de démarrage à froid (ms) lu dans la configuration (section "performance")"""
+    return float(load_section("performance", {"startup_budget_ms": 0})["startup_budget_ms"])
+
+
+def compare(results: Dict, baseline: Dict, threshold: float, min_delta_us: float) -> List[str]:
+    """Liste les métriques dont p50 ou p95 régresse au-delà du seuil"""
+    regressions = []
+    for metric, current in results.items():
+        reference = baseline.get(metric)
+        if not reference or not current.get("count"):
+            continue
+        for stat in ("p50", "p95"):
+            before, after = reference.get(stat, 0), current[stat]
+            if after - before > min_delta_us and before > 0 and after > before * (1 + threshold):
+                regressions.append(f"{metric} {stat} : {before:.1f}µs → {after:.1f}µs (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_results(results: Dict):
+    """Affiche les percentiles de chaque métrique"""
+    print(f"{'Métrique':<28}{'n':>7}{'p50':>11}{'p95':>11}{'p99':>11}{'max':>11}  (µs)")
+    for metric, stats in results.items():
+        if not stats.get("count"):
+            continue
+        print(f"{metric:<28}{stats['count']:>7}{stats['p50']:>11.1f}{stats['p95']:>11.1f}"
+              f"{stats['p99']:>11.1f}{stats['max']:>11.1f}")
+
+
+SUITES = {
+    "routing": bench_routing,
+    "agents": bench_agents,
+    "cache": bench_cache,
+    "end_to_end": bench_end_to_end,
+}
+
+
+def main():
+    """Point d'entrée des benchmarks"""
+    parser = argparse.ArgumentParser(description="Benchmarks de performance de Nina")
+    parser.add_argument("--iterations", type=int, default=20, help="Passages sur le corpus par suite")
+    parser.add_argument("--startup-runs", type=int, default=5, help="Démarrages à froid mesurés (0 = ignorer)")
+    parser.add_argument("--only", nargs="*", choices=list(SUITES) + ["startup", "memory"], help="Suites à exécuter")
+    parser.add_argument("--corpus", type=Path, default=CORPUS_FILE, help="Corpus de requêtes (TSV)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="Fichier de référence")
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistre les résultats comme référence")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Régression tolérée (0.20 = +20%%)")
+    parser.add_argument("--min-delta-us", type=float, default=5.0, help="Écart absolu ignoré (bruit)")
+    parser.add_argument("--output", type=Path, help="Écrit les résultats en JSON")
+    parser.add_argument("--startup-budget-ms", type=float, default=load_startup_budget(),
+                        help="Échec si le p50 du démarrage à froid dépasse ce budget (0 = aucun)")
+    parser.add_argument("--import-top", type=int, default=15, help="Imports affichés dans le rapport de démarrage")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    selected = args.only or list(SUITES) + ["startup", "memory"]
+
+    results = {}
+    for name in selected:
+        if name == "startup":
+            if args.startup_runs > 0:
+                results.update(bench_startup(args.startup_runs))
+        elif name == "memory":
+            results.update(bench_memory(corpus))
+        else:
+            results.update(SUITES[name](corpus, args.iterations))
+
+    print_results(results)
+    if "memory.result" in results:
+        print_memory(results)
+
+    over_budget = False
+    if "startup" in results:
+        print_import_report(import_report(), args.import_top)
+        if args.startup_budget_ms > 0:
+            startup_ms = results["startup"]["p50"] / 1000
+            over_budget = startup_ms > args.startup_budget_ms
+            mark = "❌" if over_budget else "✅"
+            print(f"\n{mark} Démarrage à froid : {startup_ms:.0f} ms (budget {args.startup_budget_ms:.0f} ms)")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\n💾 Référence enregistrée : {args.baseline}")
+        return 1 if over_budget else 0
+
+    if not args.baseline.exists():
+        print(f"\nℹ️ Pas de référence ({args.baseline}), comparaison ignorée")
+        return 1 if over_budget else 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.threshold, args.min_delta_us)
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) au-delà de {args.threshold:.0%} :")
+        for regression in regressions:
+            print(f"   • {regression}")
+        return 1
+
+    print(f"\n✅ Aucune régression au-delà de {args.threshold:.0%}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+🚦 Nina Load - Générateur de charge : rejoue un flux de requêtes à débit cible ou concurrence fixe
+
+Usage :
+    python benchmarks/load_nina.py --qps 2000 --duration 10                 # Boucle ouverte, 2000 requêtes/s
+    python benchmarks/load_nina.py --concurrency 16 --processes 4           # Boucle fermée, 4 processus x 16 threads
+    python benchmarks/load_nina.py --journal cache/journal --target nina    # Rejoue le trafic journalisé
+    python benchmarks/load_nina.py --zipf 1.1 --real-system --json out.json # Flux synthétique, vrai psutil
+"""
+
+import sys
+import json
+import time
+import queue
+import random
+import argparse
+import threading
+import multiprocessing
+from itertools import cycle
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_nina import CORPUS_FILE, load_corpus, build_agents, quiet
+
+from agents.agent_manager import AgentManager
+
+# Échantillon : (instant d'émission relatif en s, latence en ns, agent, réponse du cache, erreur)
+Sample = Tuple[float, int, str, bool, bool]
+
+
+def load_queries(args) -> List[str]:
+    """Requêtes du flux : journal enregistré ou corpus du benchmark"""
+    if args.journal:
+        from agents.journal import iter_journal, read_journal
+        path = Path(args.journal)
+        records = read_journal(path) if path.is_file() else iter_journal(path)
+        queries = [entry["query"] for entry in records if args.source is None or entry.get("src") == args.source]
+        if not queries:
+            raise SystemExit(f"❌ Aucune requête dans le journal {path}")
+        return queries
+    return [query for _, query in load_corpus(Path(args.corpus))]
+
+
+class QueryStream:
+    """Flux de requêtes partagé par les threads : ordre enregistré, ou tirage de Zipf (requêtes populaires)"""
+
+    def __init__(self, queries: List[str], zipf: float = 0.0, seed: int = 0):
+        self._lock = threading.Lock()
+        if zipf > 0:
+            distinct = list(dict.fromkeys(queries))
+            random.Random(seed).shuffle(distinct)
+            weights = [1.0 / (rank ** zipf) for rank in range(1, len(distinct) + 1)]
+            rng = random.Random(seed + 1)
+            self._next = lambda: rng.choices(distinct, weights)[0]
+        else:
+            self._next = cycle(queries).__next__
+
+    def next(self) -> str:
+        with self._lock:
+            return self._next()
+
+
+def build_target(target: str, real_system: bool):
+    """Fonction appelée pour chaque requête : retourne (agent, réponse du cache)"""
+    with quiet():
+        if real_system:
+            from agents.math_agent import MathAgent
+            from agents.knowledge_agent import KnowledgeAgent
+            from agents.system_agent import SystemAgent
+            agents = [MathAgent(), KnowledgeAgent(), SystemAgent()]
+        else:
+            # SystemAgent sur un instantané figé : mêmes réponses sur toute machine Linux
+            agents = build_agents()
+        manager = AgentManager(agents=agents)
+
+    if target == "manager":
+        def call(query: str) -> Tuple[str, bool]:
+            result = manager.process_query(query)
+            return result["agent"], result.get("cached", False)
+        return call
+
+    import tempfile
+    from nina_advanced import NinaAdvanced
+    with quiet():
+        nina = NinaAdvanced(agent_manager=manager, cache_db=Path(tempfile.mkdtemp()) / "load_cache.db")
+
+    def call(query: str) -> Tuple[str, bool]:
+        # Réponse texte : agent et cache lus dans la ligne de métriques ajoutée par NinaAdvanced
+        response = nina.get_response(query)
+        if "⚡ (cache:" in response:
+            return "NinaAdvanced", True
+        if "⚡ (" in response:
+            return "NinaAdvanced", False
+        metrics = response.rsplit("Agent: ", 1)
+        if len(metrics) == 1:
+            return "NinaAdvanced", False
+        agent, status = metrics[1].split(" | ", 1)
+        return agent, status.startswith("📋")
+    return call
+
+
+def run_load(target: str, queries: List[str], duration: float, qps: float, concurrency: int, zipf: float,
+             seed: int, poisson: bool, real_system: bool) -> List[Sample]:
+    """Génère la charge dans ce processus (boucle ouverte si qps > 0, fermée sinon)"""
+    call = build_target(target, real_system)
+    stream = QueryStream(queries, zipf, seed)
+    samples: List[Sample] = []
+    samples_lock = threading.Lock()
+
+    def execute(query: str, scheduled_ns: int, t0_ns: int):
+        try:
+            agent, cached = call(query)
+            error = False
+        except Exception:
+            agent, cached, error = "error", False, True
+        end_ns = time.perf_counter_ns()
+        with samples_lock:
+            samples.append(((scheduled_ns - t0_ns) / 1e9, end_ns - scheduled_ns, agent, cached, error))
+
+    t0_ns = time.perf_counter_ns()
+    end_ns = t0_ns + int(duration * 1e9)
+
+    if qps > 0:
+        # Boucle ouverte : arrivées planifiées, latence mesurée depuis l'instant prévu (file d'attente comprise)
+        arrivals = queue.Queue()
+
+        def worker():
+            while True:
+                item = arrivals.get()
+                if item is None:
+                    return
+                execute(item[1], item[0], t0_ns)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+
+        rng = random.Random(seed)
+        scheduled = t0_ns
+        while scheduled < end_ns:
+            delay = scheduled - time.perf_counter_ns()
+            if delay > 0:
+                time.sleep(delay / 1e9)
+            arrivals.put((scheduled, stream.next()))
+            gap = rng.expovariate(qps) if poisson else 1.0 / qps
+            scheduled += int(gap * 1e9)
+        for _ in threads:
+            arrivals.put(None)
+    else:
+        # Boucle fermée : chaque thread enchaîne ses requêtes
+        def worker():
+            while time.perf_counter_ns() < end_ns:
+                execute(stream.next(), time.perf_counter_ns(), t0_ns)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def _process_main(conn, options: Dict):
+    """Point d'entrée d'un processus générateur : renvoie ses échantillons au parent"""
+    conn.send(run_load(**options))
+    conn.close()
+
+
+def run_processes(processes: int, options: Dict) -> List[Sample]:
+    """Répartit la charge sur plusieurs processus (débit cible partagé) et fusionne les échantillons"""
+    context = multiprocessing.get_context("spawn")
+    share = dict(options, qps=options["qps"] / processes)
+    children = []
+    for index in range(processes):
+        parent_conn, child_conn = context.Pipe(duplex=False)
+        process = context.Process(target=_process_main, args=(child_conn, dict(share, seed=share["seed"] + index)))
+        process.start()
+        child_conn.close()
+        children.append((process, parent_conn))
+
+    samples = []
+    for process, conn in children:
+        samples.extend(conn.recv())
+        process.join()
+    return samples
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict:
+    """Débit, percentiles (ms), taux de cache, erreurs et part de chaque agent"""
+    latencies = sorted(sample[1] for sample in samples)
+    count = len(latencies)
+    if not count:
+        return {"requests": 0, "throughput": 0.0}
+
+    def rank(p: float) -> float:
+        return latencies[min(count - 1, max(0, int(round(p / 100 * count)) - 1))] / 1e6
+
+    agents = {}
+    for sample in samples:
+        agents[sample[2]] = agents.get(sample[2], 0) + 1
+    return {
+        "requests": count,
+        "throughput": count / elapsed if elapsed > 0 else 0.0,
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "max": latencies[-1] / 1e6,
+        "cache_hit_rate": sum(1 for sample in samples if sample[3]) / count,
+        "errors": sum(1 for sample in samples if sample[4]),
+        "agents": {name: n / count for name, n in sorted(agents.items(), key=lambda item: -item[1])},
+    }
+
+
+def report(samples: List[Sample], duration: float, interval: float) -> Dict:
+    """Affiche le résumé par fenêtre de temps puis global, retourne les chiffres"""
+    windows = []
+    for index in range(int(duration / interval + 0.999)):
+        start = index * interval
+        window = [sample for sample in samples if start <= sample[0] < start + interval]
+        windows.append(dict(summarize(window, min(interval, duration - start)), start=start))
+
+    print(f"{'t (s)':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  {'cache':>6}  agents")
+    for window in windows:
+        if not window["requests"]:
+            continue
+        shares = " | ".join(f"{name} {share * 100:.0f}%" for name, share in window["agents"].items())
+        print(f"{window['start']:6.1f} {window['throughput']:9.0f} {window['p50']:8.3f} {window['p95']:8.3f} "
+              f"{window['p99']:8.3f}  {window['cache_hit_rate'] * 100:5.1f}%  {shares}")
+
+    total = summarize(samples, duration)
+    if total["requests"]:
+        print(f"\n📊 {total['requests']} requêtes en {duration:.1f}s : {total['throughput']:.0f} req/s | "
+              f"p50 {total['p50']:.3f}ms | p95 {total['p95']:.3f}ms | p99 {total['p99']:.3f}ms | "
+              f"max {total['max']:.3f}ms | cache {total['cache_hit_rate'] * 100:.1f}% | {total['errors']} erreurs")
+        print("🤖 " + " | ".join(f"{name} {share * 100:.1f}%" for name, share in total["agents"].items()))
+    return {"total": total, "windows": windows}
+
+
+def main():
+    """Point d'entrée du générateur de charge"""
+    parser = argparse.ArgumentParser(description="Générateur de charge de Nina")
+    parser.add_argument("--target", choices=("manager", "nina"), default="manager",
+                        help="AgentManager.process_query ou NinaAdvanced.get_response")
+    parser.add_argument("--corpus", default=str(CORPUS_FILE), help="Corpus catégorie<TAB>requête")
+    parser.add_argument("--journal", help="Dossier ou fichier de journal à rejouer (à la place du corpus)")
+    parser.add_argument("--source", choices=("agents", "nina"), help="Enregistrements du journal retenus")
+    parser.add_argument("--zipf", type=float, default=0.0,
+                        help="Flux synthétique : tirage de Zipf d'exposant donné (0 : ordre du flux)")
+    parser.add_argument("--qps", type=float, default=0.0, help="Débit cible (boucle ouverte) ; 0 : boucle fermée")
+    parser.add_argument("--poisson", action="store_true", help="Arrivées de Poisson au lieu d'un pas fixe")
+    parser.add_argument("--concurrency", type=int, default=8, help="Threads par processus")
+    parser.add_argument("--processes", type=int, default=1, help="Processus générateurs")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de la charge (s)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Fenêtre du rapport (s)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine des tirages")
+    parser.add_argument("--real-system", action="store_true", help="SystemAgent sur le vrai psutil (non reproductible)")
+    parser.add_argument("--json", type=Path, help="Écrit le rapport en JSON")
+    args = parser.parse_args()
+
+    options = {
+        "target": args.target,
+        "queries": load_queries(args),
+        "duration": args.duration,
+        "qps": args.qps,
+        "concurrency": args.concurrency,
+        "zipf": args.zipf,
+        "seed": args.seed,
+        "poisson": args.poisson,
+        "real_system": args.real_system,
+    }
+    mode = f"{args.qps:g} req/s visées" if args.qps > 0 else f"boucle fermée, {args.concurrency} threads"
+    print(f"🚦 Charge sur {args.target} : {mode}, {args.processes} processus, {args.duration:g}s, "
+          f"{len(options['queries'])} requêtes dans le flux")
+
+    if args.processes > 1:
+        samples = run_processes(args.processes, options)
+    else:
+        samples = run_load(**options)
+
+    result = report(samples, args.duration, args.interval)
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"💾 Rapport écrit : {args.json}")
+
+
+if __name__ == "__main__":
+    main()
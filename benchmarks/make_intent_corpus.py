@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+🎯 Make Intent Corpus - Corpus synthétique de requêtes étiquetées par agent (requête<TAB>agent)
+
+Usage :
+    python benchmarks/make_intent_corpus.py                  # écrit benchmarks/intent_fr.tsv
+    cd src && python -m agents.intent_classifier ../benchmarks/intent_fr.tsv ../data/intent.model
+"""
+
+import random
+import argparse
+from pathlib import Path
+from typing import List, Tuple
+
+OUTPUT_FILE = Path(__file__).parent / "intent_fr.tsv"
+
+NUMBERS = [2, 3, 5, 7, 8, 12, 15, 25, 42, 64, 100, 144, 256, 1000]
+
+MATH = [
+    "{a}+{b}", "{a} + {b}", "{a}*{b}", "{a} - {b}", "{a}/{b}", "{a}^{b}",
+    "combien font {a} + {b}", "combien fait {a} fois {b}", "calcule {a} * {b}", "calculer {a} moins {b}",
+    "quel est le résultat de {a} / {b}", "somme de {a} et {b}", "racine carrée de {a}", "sqrt({a})",
+    "{a} puissance {b}", "{a} au carré", "combien font {a} divisé par {b}", "pow({a}, {b})",
+    "résultat de {a} + {b} * {b}", "combien de fois {b} dans {a}",
+]
+
+KNOWLEDGE = [
+    "pourquoi {phenomenon}", "qu'est-ce que {concept}", "comment fonctionne {thing}", "explique-moi {concept}",
+    "que signifie {word}", "définir {word}", "qui est {person}", "qui a inventé {thing}",
+    "c'est quoi {concept}", "comment marche {thing}",
+]
+PHENOMENA = [
+    "le ciel est bleu", "la mer est salée", "les feuilles tombent en automne", "il y a des saisons",
+    "la lune change de forme", "les avions volent", "le pain lève", "on rêve",
+]
+CONCEPTS = [
+    "l'ia", "la photosynthèse", "python", "linux", "la relativité", "un trou noir", "l'inflation",
+    "la démocratie", "le machine learning", "un algorithme",
+]
+THINGS = ["internet", "un ordinateur", "le gps", "un moteur", "la blockchain", "le wifi", "un vaccin", "une batterie"]
+WORDS = ["entropie", "résilience", "épistémologie", "paradigme", "latence", "heuristique"]
+PERSONS = ["Ada Lovelace", "Alan Turing", "Marie Curie", "Victor Hugo", "Linus Torvalds", "Albert Einstein"]
+
+SYSTEM = [
+    "{prefix}utilisation du cpu", "{prefix}combien de ram", "{prefix}mémoire disponible",
+    "{prefix}espace disque libre", "{prefix}état du réseau", "{prefix}température du processeur",
+    "{prefix}uptime", "{prefix}liste des processus", "{prefix}charge cpu", "{prefix}info système",
+    "{prefix}combien de mémoire reste", "{prefix}usage du disque", "{prefix}statut de la machine",
+]
+SYSTEM_PREFIXES = ["", "montre-moi ", "quelle est ", "donne-moi ", "affiche ", "peux-tu vérifier "]
+
+LLM = [
+    "raconte-moi une blague", "écris un poème sur {topic}", "donne-moi une idée de {topic}",
+    "bonjour, tu vas bien ?", "merci beaucoup", "propose un nom pour {topic}",
+    "traduis « bonne nuit » en anglais", "résume-moi l'histoire de {topic}", "j'ai besoin d'un conseil pour {topic}",
+    "écris une histoire courte sur {topic}", "invente un slogan pour {topic}", "tu préfères {topic} ou la plage ?",
+    "aide-moi à rédiger un mail sur {topic}", "donne-moi trois arguments pour {topic}",
+]
+TOPICS = ["la montagne", "un chat", "mon anniversaire", "un café", "la rentrée", "un voyage à Lyon", "le printemps",
+          "une startup", "le télétravail", "un jardin"]
+
+
+def fill(template: str, rng: random.Random) -> str:
+    """Remplace les champs d'un modèle de requête"""
+    return template.format(
+        a=rng.choice(NUMBERS), b=rng.choice(NUMBERS), prefix=rng.choice(SYSTEM_PREFIXES),
+        phenomenon=rng.choice(PHENOMENA), concept=rng.choice(CONCEPTS), thing=rng.choice(THINGS),
+        word=rng.choice(WORDS), person=rng.choice(PERSONS), topic=rng.choice(TOPICS),
+    )
+
+
+def generate(per_agent: int = 300, seed: int = 0) -> List[Tuple[str, str]]:
+    """Requêtes distinctes étiquetées, `per_agent` au plus par agent"""
+    rng = random.Random(seed)
+    examples = []
+    for agent, templates in (("MathAgent", MATH), ("KnowledgeAgent", KNOWLEDGE),
+                             ("SystemAgent", SYSTEM), ("LLMAgent", LLM)):
+        queries = set()
+        for _ in range(per_agent * 20):
+            if len(queries) >= per_agent:
+                break
+            query = fill(rng.choice(templates), rng)
+            # Variantes de casse et de ponctuation, comme à la saisie
+            if rng.random() < 0.2:
+                query = query.capitalize()
+            if rng.random() < 0.2 and not query.endswith("?"):
+                query += " ?"
+            queries.add(query)
+        examples.extend((query, agent) for query in sorted(queries))
+    rng.shuffle(examples)
+    return examples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère le corpus d'entraînement du modèle de routage")
+    parser.add_argument("output", type=Path, nargs="?", default=OUTPUT_FILE, help="Fichier TSV requête<TAB>agent")
+    parser.add_argument("--per-agent", type=int, default=300, help="Requêtes par agent")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur")
+    args = parser.parse_args()
+
+    examples = generate(args.per_agent, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write("# Corpus synthétique du modèle de routage : requête<TAB>agent (make_intent_corpus.py)\n")
+        for query, agent in examples:
+            f.write(f"{query}\t{agent}\n")
+    print(f"✅ {len(examples)} requêtes écrites dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
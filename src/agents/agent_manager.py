@@ -3,72 +3,307 @@
 🎯 Agent Manager - Gestionnaire intelligent des agents IA spécialisés
 """
 
+import os
 import time
+import asyncio
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import List, Dict, Optional
 from .math_agent import MathAgent
-from .knowledge_agent import KnowledgeAgent
 from .system_agent import SystemAgent
+from .llm_agent import load_llm_settings
+from .registry import AGENT_SPECS, FALLBACK_SPEC, LazyAgent
+from .process_pool import AgentProcessPool, load_pool_settings
+from .response_cache import FreshnessPolicy
+from .routing import RoutingIndex
+from .query_normalizer import canonicalize
+from .metrics import LatencyHistogram, render_prometheus, write_prometheus
+from .journal import get_journal
+from .deadline import Deadline, DeadlineExceeded, deadline_scope
+from .cache_snapshot import CacheSnapshotter, configured_prewarm_queries, prewarm
+from .streaming import ResponseStream, AsyncResponseStream
+from .agent_result import AgentResult
+
+# Modèle de routage entraîné hors ligne (python -m agents.intent_classifier)
+INTENT_MODEL = Path(__file__).parent.parent.parent / "data" / "intent.model"
+
+class DeadlineRace:
+    """Déroulé d'une requête à budget, commun aux versions synchrone et asynchrone (qui ne fournissent
+    que le lancement d'un agent et l'attente) : agent principal, relance au p95, candidat suivant en cas
+    d'échec, abandon à l'échéance"""
+    
+    def __init__(self, manager: "AgentManager", best_agent, query: str, deadline: Deadline, start_ns: int,
+                 launch, hedge: bool = False):
+        self.manager = manager
+        self.best_agent = best_agent
+        self.query = query
+        self.deadline = deadline
+        self.start_ns = start_ns
+        self.launch = launch  # agent -> future ou tâche
+        self.running = {}
+        self.errors = []
+        self.hedged = False
+        self.hedge_at = manager._hedge_delay(best_agent) if hedge else None
+        self._alternatives = None
+        self._start(best_agent)
+    
+    def _start(self, agent):
+        self.running[self.launch(agent)] = agent
+    
+    def _next_alternative(self):
+        """Candidat suivant par score (None quand il n'y en a plus)"""
+        if self._alternatives is None:
+            self._alternatives = self.manager._alternatives(self.query, self.best_agent)
+        return self._alternatives.pop(0) if self._alternatives else None
+    
+    def proceed(self) -> bool:
+        """Indique s'il faut encore attendre ; lance le candidat suivant quand tous ont échoué avant l'échéance"""
+        if self.deadline.expired():
+            return False
+        if self.running:
+            return True
+        if not self.errors:
+            return False
+        agent = self._next_alternative()
+        if agent is None:
+            return False
+        self._start(agent)
+        self.errors = []
+        return True
+    
+    def timeout(self) -> float:
+        """Attente maximale avant la prochaine décision (échéance, ou p95 de l'agent principal)"""
+        timeout = self.deadline.remaining()
+        if self.hedge_at is not None:
+            elapsed = (time.perf_counter_ns() - self.start_ns) / 1e9
+            timeout = min(timeout, max(0.0, self.hedge_at - elapsed))
+        return timeout
+    
+    def settle(self, done) -> Optional[AgentResult]:
+        """Premier résultat obtenu parmi les exécutions terminées (échecs notés), sinon relance au p95"""
+        for future in done:
+            agent = self.running.pop(future)
+            try:
+                result = future.result()
+            except DeadlineExceeded:
+                continue  # Agent arrêté par l'échéance : un délai dépassé, pas une panne
+            except Exception as e:
+                self.errors.append((agent, e))
+                continue
+            return self.manager._deadline_winner(self.best_agent, agent, self.query, result, self.deadline,
+                                                 self.hedged, self.start_ns)
+        
+        if self.hedge_at is not None and not done and not self.deadline.expired():
+            # Agent principal plus lent que son p95 : le candidat suivant part en parallèle
+            self.hedge_at = None
+            runner_up = self._next_alternative()
+            if runner_up is not None:
+                self._start(runner_up)
+                self.hedged = True
+                with self.manager._stats_lock:
+                    self.manager.performance_stats["hedged"] += 1
+        return None
+    
+    def give_up(self, stale: Optional[str]) -> AgentResult:
+        """Budget épuisé ou candidats en échec : exécutions restantes abandonnées, repli"""
+        self.deadline.cancel()
+        return self.manager._deadline_fallback(self.best_agent, self.query, stale, self.deadline, self.errors,
+                                               self.start_ns)
+
 
 class AgentManager:
     """Gestionnaire intelligent des agents IA spécialisés"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 8, max_concurrency: int = 16, agents: List[object] = None,
+                 fallback_agent: object = None, process_pool: AgentProcessPool = None,
+                 intent_classifier: object = None, journal: object = None, snapshots: CacheSnapshotter = None,
+                 defer_warm_up: bool = False):
         self.agents = []
+        self.fallback_agent = fallback_agent
+        self.process_pool = process_pool
+        self.intent_classifier = intent_classifier
+        self.snapshots = snapshots
+        # Préchargements et préchauffages reportés à warm_up_agents() (maître préforké)
+        self.defer_warm_up = defer_warm_up
+        self.routing_stats = {"model": 0, "heuristics": 0}
+        
+        # Journal des requêtes (section "journal" de la configuration, désactivé par défaut)
+        self.journal = journal if journal is not None else get_journal()
         self.performance_stats = {
             "total_requests": 0,
             "agent_usage": {},
             "avg_response_time": 0.0,
-            "cache_hit_rate": 0.0
+            "cache_hit_rate": 0.0,
+            # Requêtes à budget : délais dépassés, relances parallèles (et gagnées), réponses périmées servies
+            "timeouts": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "stale_fallbacks": 0
         }
+        self._stats_lock = threading.RLock()
+        self._completed = 0
+        self._cache_served = 0
+        
+        # Distributions de latence : routage seul, requête complète, premier morceau d'un flux
+        self.latency = {"routing": LatencyHistogram(), "total": LatencyHistogram(), "first_chunk": LatencyHistogram()}
+        
+        # Pool de threads des traitements par lot (créé au premier lot)
+        self.max_workers = max_workers
+        self._executor = None
+        self._executor_workers = None
+        
+        # Exécutions à échéance : threads dédiés (un agent abandonné n'occupe pas ceux des lots)
+        self._deadline_executor = None
+        self.hedge_min_samples = 20  # Mesures nécessaires avant de relancer au p95 de l'agent
         
-        # Initialiser les agents
-        self._initialize_agents()
+        # Concurrence des requêtes asynchrones
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        self._semaphore_loop = None
+        
+        # Initialiser les agents (ou reprendre ceux fournis) puis compiler l'index de routage
+        if agents is not None:
+            self.agents = list(agents)
+        else:
+            self._initialize_agents()
+            
+            # Pool de processus des agents du registre (section "performance" de la configuration)
+            settings = load_pool_settings()
+            if self.process_pool is None and settings["process_workers"] > 0:
+                self.process_pool = AgentProcessPool(AGENT_SPECS, workers=settings["process_workers"],
+                                                     task_timeout=settings["task_timeout"])
+            
+            # Modèle de routage s'il a été entraîné (heuristiques seules sinon)
+            if self.intent_classifier is None and INTENT_MODEL.exists():
+                self.intent_classifier = self._load_intent_classifier(INTENT_MODEL)
+            
+            # Instantanés des caches (section "snapshots" de la configuration)
+            if self.snapshots is None:
+                self.snapshots = CacheSnapshotter.from_settings()
+        if self.fallback_agent is not None and self.fallback_agent not in self.agents:
+            self.agents.append(self.fallback_agent)
+        self.routing_index = RoutingIndex(self.agents)
+        self._agents_by_name = {agent.name: agent for agent in self.agents}
+        
+        # Caches restaurés à l'instanciation de chaque agent, sauvegardés périodiquement et à l'arrêt
+        if self.snapshots is not None:
+            for agent in self.agents:
+                self.snapshots.attach(agent)
+            self.start_snapshots()
+    
+    def start_snapshots(self):
+        """Lance la sauvegarde périodique des caches dans ce processus (à rappeler dans un worker forké)"""
+        if self.snapshots is not None:
+            self.snapshots.start(self.loaded_agents)
+    
+    def prewarm(self, queries: List[str] = None) -> Optional[Dict]:
+        """Calcule d'avance les réponses des requêtes données (par défaut : les plus fréquentes de `prewarm_file`,
+        section "snapshots" de la configuration) ; None sans requêtes à préchauffer"""
+        if queries is None:
+            try:
+                queries = configured_prewarm_queries()
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Préchauffage ignoré : {e}")
+                return None
+        if not queries:
+            return None
+        
+        stats = prewarm(self, queries)
+        print(f"🔥 Préchauffage : {stats['computed']} réponses calculées, {stats['cached']} déjà en cache "
+              f"({stats['elapsed_ms']:.0f}ms)")
+        return stats
+    
+    def _load_intent_classifier(self, path: Path) -> Optional[object]:
+        """Charge le modèle de routage (None s'il est illisible)"""
+        try:
+            from .intent_classifier import IntentClassifier
+            classifier = IntentClassifier.load(path)
+            print(f"🎯 Modèle de routage chargé ({len(classifier)} agents)")
+            return classifier
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Modèle de routage ignoré : {e}")
+            return None
     
     def _initialize_agents(self):
-        """Initialise tous les agents spécialisés"""
+        """Enregistre les agents du registre (instanciés au premier usage)"""
         try:
-            # Agent mathématiques
-            self.agents.append(MathAgent())
-            
-            # Agent connaissances générales
-            self.agents.append(KnowledgeAgent())
+            # Agents spécialisés : mathématiques, connaissances générales, système
+            self.agents.extend(LazyAgent(spec) for spec in AGENT_SPECS)
             
-            # Agent système
-            self.agents.append(SystemAgent())
+            # Agent LLM local (repli quand aucun agent spécialisé ne correspond), préchargé en arrière-plan
+            if self.fallback_agent is None and load_llm_settings()["enabled"]:
+                self.fallback_agent = LazyAgent(FALLBACK_SPEC, defer_on_load=self.defer_warm_up)
+                self.agents.append(self.fallback_agent)
+                if FALLBACK_SPEC.preload and not self.defer_warm_up:
+                    self.fallback_agent.preload()
             
-            print(f"✅ {len(self.agents)} agents initialisés avec succès")
+            print(f"✅ {len(self.agents)} agents enregistrés (chargés au premier usage)")
             
         except Exception as e:
             print(f"❌ Erreur initialisation agents : {e}")
     
-    def find_best_agent(self, query: str) -> Optional[object]:
-        """Trouve le meilleur agent pour traiter la requête"""
+    def find_best_agent(self, query: str, trace: Dict = None) -> Optional[object]:
+        """Trouve le meilleur agent pour traiter la requête (`trace` reçoit le détail de la décision)"""
+        start_ns = time.perf_counter_ns()
+        best_agent = self._select_agent(query, trace)
+        self.latency["routing"].record(time.perf_counter_ns() - start_ns)
+        return best_agent
+    
+    def _select_agent(self, query: str, trace: Dict = None) -> Optional[object]:
+        """Choisit l'agent prédit par le modèle de routage, sinon le meilleur score parmi les candidats de l'index"""
+        if self.intent_classifier is not None:
+            agent = self._classify(query, trace)
+            if agent is not None:
+                with self._stats_lock:
+                    self.routing_stats["model"] += 1
+                if trace is not None:
+                    trace["router"] = "model"
+                return agent
+        with self._stats_lock:
+            self.routing_stats["heuristics"] += 1
         
-        # Tester chaque agent
-        candidates = []
-        for agent in self.agents:
-            try:
-                if agent.can_handle(query):
-                    # Score basé sur la spécialisation et performance
-                    score = self._calculate_agent_score(agent, query)
-                    candidates.append((agent, score))
-            except Exception as e:
-                print(f"⚠️ Erreur évaluation agent {agent.name}: {e}")
-                continue
+        # Agents candidats et bonus de spécialisation, en une passe sur l'index
+        candidates = [
+            (agent, self._calculate_agent_score(agent, bonus))
+            for agent, bonus in self.routing_index.route(query)
+        ]
+        if trace is not None:
+            trace["router"] = "heuristics"
+            trace["scores"] = {agent.name: round(score, 3) for agent, score in candidates}
         
         if not candidates:
-            return None
+            return self._available_fallback()
         
         # Retourner l'agent avec le meilleur score
         best_agent = max(candidates, key=lambda x: x[1])[0]
         return best_agent
     
-    def _calculate_agent_score(self, agent, query: str) -> float:
-        """Calcule un score pour un agent selon la requête"""
+    def _classify(self, query: str, trace: Dict = None) -> Optional[object]:
+        """Agent prédit avec assez de confiance (None : laisser décider les heuristiques)"""
+        label, confidence = self.intent_classifier.predict(query)
+        if trace is not None:
+            trace["model"] = [label, round(confidence, 4)]
+        if confidence < self.intent_classifier.min_confidence:
+            return None
+        agent = self._agents_by_name.get(label)
+        if agent is not None and agent is self.fallback_agent:
+            return self._available_fallback()
+        return agent
+    
+    def _available_fallback(self) -> Optional[object]:
+        """Agent de repli s'il est joignable"""
+        fallback = self.fallback_agent
+        if fallback is not None and getattr(fallback, "is_available", lambda: True)():
+            return fallback
+        return None
+    
+    def _calculate_agent_score(self, agent, specialty_bonus: float) -> float:
+        """Calcule un score pour un agent selon ses performances et son bonus de spécialisation"""
         score = 1.0  # Score de base
         
-        # Bonus pour les performances passées
-        if agent.performance_stats["requests"] > 0:
+        # Bonus pour les performances passées (un agent pas encore chargé n'en a pas)
+        if getattr(agent, "loaded", True) and agent.performance_stats["requests"] > 0:
             # Bonus pour temps de réponse rapide
             if agent.performance_stats["avg_response_time"] < 100:  # < 100ms
                 score += 0.5
@@ -77,73 +312,453 @@ class AgentManager:
             cache_rate = agent.performance_stats["cache_hits"] / agent.performance_stats["requests"]
             score += cache_rate * 0.3
         
-        # Bonus spécifique par type d'agent
-        query_lower = query.lower()
-        
-        if isinstance(agent, MathAgent):
-            # Bonus pour requêtes mathématiques évidentes
-            if any(op in query_lower for op in ['+', '-', '*', '/', '=', 'calcul']):
-                score += 1.0
-        
-        elif isinstance(agent, SystemAgent):
-            # Bonus pour requêtes système évidentes
-            if any(word in query_lower for word in ['cpu', 'ram', 'disk', 'système', 'info']):
-                score += 1.0
-        
-        elif isinstance(agent, KnowledgeAgent):
-            # Bonus pour questions complexes
-            if any(word in query_lower for word in ['pourquoi', 'comment', 'qu\'est-ce']):
-                score += 0.8
+        # Bonus spécifique par type d'agent (déclaré par l'agent, calculé par l'index)
+        score += specialty_bonus
         
         return score
     
-    def process_query(self, query: str) -> Dict:
-        """Traite une requête via le meilleur agent"""
-        start_time = time.time()
+    def warm_up_process_pool(self) -> Optional[threading.Thread]:
+        """Lance les workers du pool de processus en arrière-plan (agents instanciés pendant que l'on continue)"""
+        if self.process_pool is None:
+            return None
+        thread = threading.Thread(target=self.process_pool.start, name="nina-process-pool", daemon=True)
+        thread.start()
+        return thread
+    
+    def _pool_for(self, agent, cpu_bound: Optional[bool]):
+        """Pool de processus à utiliser pour cette requête (None : exécution dans ce processus)"""
+        pool = self.process_pool
+        if pool is None or not pool.handles(agent.name):
+            return None
+        if cpu_bound is None:
+            cpu_bound = agent.cpu_bound
+        return pool if cpu_bound else None
+    
+    def process_query(self, query: str, cpu_bound: bool = None, deadline=None, hedge: bool = False) -> AgentResult:
+        """Traite une requête via le meilleur agent (cpu_bound force ou interdit le pool de processus ;
+        deadline : budget en secondes, au-delà duquel le travail est abandonné, sans fusion avec une requête
+        identique qui a aussi un budget ; hedge : relance au p95)"""
+        start_ns = time.perf_counter_ns()
         
         # Statistiques
-        self.performance_stats["total_requests"] += 1
+        with self._stats_lock:
+            self.performance_stats["total_requests"] += 1
         
         # Trouver le meilleur agent
-        best_agent = self.find_best_agent(query)
+        trace = {} if self.journal is not None else None
+        best_agent = self.find_best_agent(query, trace)
         
-        if not best_agent:
-            return {
-                "response": "🤔 Aucun agent spécialisé trouvé pour cette requête. Essayez une question plus spécifique !",
-                "agent": "AgentManager",
-                "cached": False,
-                "response_time": (time.time() - start_time) * 1000,
-                "confidence": 0.0
-            }
+        if deadline is None:
+            result = self._execute_with_agent(best_agent, query, start_ns, cpu_bound)
+        else:
+            result = self._execute_with_deadline(best_agent, query, start_ns, Deadline.coerce(deadline),
+                                                 cpu_bound, hedge)
+        if trace is not None:
+            self.journal_result(query, result, trace)
+        return result
+    
+    def journal_result(self, query: str, result: Dict, trace: Dict = None, source: str = "agents"):
+        """Dépose une requête traitée dans le journal (écriture différée, rien à faire s'il est désactivé)"""
+        if self.journal is None:
+            return
+        trace = trace or {}
+        self.journal.record({
+            "src": source,
+            "pid": os.getpid(),
+            "query": query,
+            "agent": result.get("agent"),
+            "router": trace.get("router"),
+            "scores": trace.get("scores"),
+            "model": trace.get("model"),
+            "cached": result.get("cached", False),
+            "stale": result.get("stale", False),
+            "coalesced": result.get("coalesced", False),
+            "confidence": result.get("confidence"),
+            "ms": result.get("total_time", result.get("response_time")),
+            "error": result.get("error"),
+        })
+    
+    def process_query_stream(self, query: str, trace: Dict = None, cpu_bound: bool = None) -> ResponseStream:
+        """Traite une requête en flux : les morceaux de l'agent sont transmis au fil de l'eau
+        (`trace` reçoit le détail du routage, pour le journal de l'appelant ; un agent confié au pool de
+        processus répond en un seul morceau)"""
+        def produce(stream):
+            start_ns = time.perf_counter_ns()
+            with self._stats_lock:
+                self.performance_stats["total_requests"] += 1
+            
+            best_agent = self.find_best_agent(query, trace)
+            if not best_agent:
+                stream.result = self._no_agent_result(start_ns)
+                yield stream.result["response"]
+                return
+            
+            pool = self._pool_for(best_agent, cpu_bound)
+            agent_stream = best_agent.execute_stream(query) if pool is None else self._pooled_stream(best_agent, pool, query)
+            try:
+                first_chunk = True
+                for chunk in agent_stream:
+                    if first_chunk:
+                        first_chunk = False
+                        self.latency["first_chunk"].record(time.perf_counter_ns() - start_ns)
+                    yield chunk
+            except Exception as e:
+                stream.result = self._error_result(best_agent, e, start_ns)
+                yield stream.result["response"]
+                return
+            
+            stream.result = self._finish_result(best_agent, query, agent_stream.result, start_ns)
         
-        # Exécuter l'agent
-        try:
-            result = best_agent.execute(query)
+        return ResponseStream(produce)
+    
+    def process_queries(self, queries: List[str], max_workers: int = None, cpu_bound: bool = None) -> List[AgentResult]:
+        """Traite un lot de requêtes sur un pool de threads borné (résultats dans l'ordre d'entrée)"""
+        start_ns = time.perf_counter_ns()
+        
+        with self._stats_lock:
+            self.performance_stats["total_requests"] += len(queries)
+        
+        # Dédupliquer les requêtes identiques une fois normalisées (même clé de cache)
+        unique_queries = {}
+        keys = []
+        for query in queries:
+            key = canonicalize(query)
+            unique_queries.setdefault(key, query)
+            keys.append(key)
+        
+        # Router l'ensemble du lot, puis exécuter chaque requête distincte une seule fois
+        traces = {key: {} for key in unique_queries} if self.journal is not None else {}
+        routed = {key: self.find_best_agent(query, traces.get(key)) for key, query in unique_queries.items()}
+        executor = self._get_executor(max_workers)
+        futures = {
+            key: executor.submit(self._execute_with_agent, routed[key], unique_queries[key], start_ns, cpu_bound)
+            for key in unique_queries
+        }
+        
+        results = []
+        seen = set()
+        for key in keys:
+            result = futures[key].result().copy()
+            result["deduplicated"] = key in seen
+            seen.add(key)
+            results.append(result)
+            if key in traces:
+                self.journal_result(queries[len(results) - 1], result, traces[key])
             
-            # Mettre à jour les statistiques
-            agent_name = best_agent.name
-            if agent_name not in self.performance_stats["agent_usage"]:
-                self.performance_stats["agent_usage"][agent_name] = 0
-            self.performance_stats["agent_usage"][agent_name] += 1
+            # Les doublons servis comptent aussi dans l'utilisation de l'agent
+            if result["deduplicated"] and routed[key] and result["error"] is None:
+                with self._stats_lock:
+                    usage = self.performance_stats["agent_usage"]
+                    usage[routed[key].name] = usage.get(routed[key].name, 0) + 1
+        
+        return results
+    
+    def _get_executor(self, max_workers: int = None) -> ThreadPoolExecutor:
+        """Pool de threads partagé par les traitements par lot"""
+        with self._stats_lock:
+            if self._executor is None or (max_workers and max_workers != self._executor_workers):
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                self._executor_workers = max_workers or self.max_workers
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._executor_workers, thread_name_prefix="nina-agent"
+                )
+            return self._executor
+    
+    async def aprocess_query(self, query: str, cpu_bound: bool = None, deadline=None, hedge: bool = False) -> AgentResult:
+        """Traite une requête de façon asynchrone (concurrence bornée par un sémaphore ; deadline et hedge
+        comme process_query)"""
+        start_ns = time.perf_counter_ns()
+        
+        with self._stats_lock:
+            self.performance_stats["total_requests"] += 1
+        
+        trace = {} if self.journal is not None else None
+        best_agent = self.find_best_agent(query, trace)
+        if not best_agent:
+            result = self._no_agent_result(start_ns)
+        elif deadline is not None:
+            async with self._get_semaphore():
+                result = await self._aexecute_with_deadline(best_agent, query, start_ns, Deadline.coerce(deadline),
+                                                            cpu_bound, hedge)
+        else:
+            async with self._get_semaphore():
+                try:
+                    pool = self._pool_for(best_agent, cpu_bound)
+                    if pool is not None:
+                        result = await best_agent.aexecute_in_pool(pool, query)
+                    else:
+                        result = await best_agent.aexecute(query)
+                except Exception as e:
+                    result = self._error_result(best_agent, e, start_ns)
+                else:
+                    result = self._finish_result(best_agent, query, result, start_ns)
+        
+        if trace is not None:
+            self.journal_result(query, result, trace)
+        return result
+    
+    def aprocess_query_stream(self, query: str, cpu_bound: bool = None) -> AsyncResponseStream:
+        """Version asynchrone de process_query_stream (concurrence bornée par le sémaphore)"""
+        async def produce(stream):
+            start_ns = time.perf_counter_ns()
+            with self._stats_lock:
+                self.performance_stats["total_requests"] += 1
             
-            # Calculer la confiance
-            confidence = self._calculate_confidence(best_agent, query, result)
-            result["confidence"] = confidence
+            best_agent = self.find_best_agent(query)
+            if not best_agent:
+                stream.result = self._no_agent_result(start_ns)
+                yield stream.result["response"]
+                return
             
-            return result
+            async with self._get_semaphore():
+                pool = self._pool_for(best_agent, cpu_bound)
+                agent_stream = (best_agent.aexecute_stream(query) if pool is None
+                                else self._apooled_stream(best_agent, pool, query))
+                try:
+                    first_chunk = True
+                    async for chunk in agent_stream:
+                        if first_chunk:
+                            first_chunk = False
+                            self.latency["first_chunk"].record(time.perf_counter_ns() - start_ns)
+                        yield chunk
+                except Exception as e:
+                    stream.result = self._error_result(best_agent, e, start_ns)
+                    yield stream.result["response"]
+                    return
             
+            stream.result = self._finish_result(best_agent, query, agent_stream.result, start_ns)
+        
+        return AsyncResponseStream(produce)
+    
+    def _pooled_stream(self, agent, pool, query: str) -> ResponseStream:
+        """Flux d'un seul morceau : réponse calculée dans un worker du pool de processus"""
+        def produce(stream):
+            stream.result = agent.execute_in_pool(pool, query)
+            yield stream.result["response"]
+        
+        return ResponseStream(produce)
+    
+    def _apooled_stream(self, agent, pool, query: str) -> AsyncResponseStream:
+        """Version asynchrone de _pooled_stream"""
+        async def produce(stream):
+            stream.result = await agent.aexecute_in_pool(pool, query)
+            yield stream.result["response"]
+        
+        return AsyncResponseStream(produce)
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Sémaphore de concurrence asynchrone (un par boucle d'événements)"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    def _execute_with_agent(self, best_agent, query: str, start_ns: int, cpu_bound: bool = None) -> AgentResult:
+        """Exécute la requête sur l'agent choisi (ici ou dans un worker) et annote le résultat"""
+        if not best_agent:
+            return self._no_agent_result(start_ns)
+        
+        # Exécuter l'agent
+        try:
+            pool = self._pool_for(best_agent, cpu_bound)
+            if pool is not None:
+                result = best_agent.execute_in_pool(pool, query)
+            else:
+                result = best_agent.execute(query)
         except Exception as e:
-            return {
-                "response": f"❌ Erreur lors du traitement par {best_agent.name}: {str(e)}",
-                "agent": best_agent.name,
-                "cached": False,
-                "response_time": (time.time() - start_time) * 1000,
-                "confidence": 0.0
-            }
-    
-    def _calculate_confidence(self, agent, query: str, result: Dict) -> float:
+            return self._error_result(best_agent, e, start_ns)
+        
+        return self._finish_result(best_agent, query, result, start_ns)
+    
+    def _run_agent(self, agent, query: str, cpu_bound: bool = None) -> AgentResult:
+        """Exécute l'agent (ici ou dans un worker du pool de processus)"""
+        pool = self._pool_for(agent, cpu_bound)
+        if pool is not None:
+            return agent.execute_in_pool(pool, query)
+        return agent.execute(query)
+    
+    async def _arun_agent(self, agent, query: str, cpu_bound: bool = None) -> AgentResult:
+        """Version asynchrone de _run_agent"""
+        pool = self._pool_for(agent, cpu_bound)
+        if pool is not None:
+            return await agent.aexecute_in_pool(pool, query)
+        return await agent.aexecute(query)
+    
+    def _get_deadline_executor(self) -> ThreadPoolExecutor:
+        """Pool de threads des exécutions à échéance"""
+        with self._stats_lock:
+            if self._deadline_executor is None:
+                self._deadline_executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers * 2, thread_name_prefix="nina-deadline"
+                )
+            return self._deadline_executor
+    
+    def _alternatives(self, query: str, best_agent) -> List[object]:
+        """Candidats suivants par score décroissant, puis l'agent de repli"""
+        candidates = sorted(
+            ((agent, self._calculate_agent_score(agent, bonus)) for agent, bonus in self.routing_index.route(query)),
+            key=lambda candidate: candidate[1], reverse=True
+        )
+        alternatives = [agent for agent, _ in candidates if agent is not best_agent]
+        fallback = self._available_fallback()
+        if fallback is not None and fallback is not best_agent and fallback not in alternatives:
+            alternatives.append(fallback)
+        return alternatives
+    
+    def _hedge_delay(self, agent) -> Optional[float]:
+        """Délai (s) avant de relancer en parallèle : p95 des réponses calculées de l'agent (None : trop peu de mesures)"""
+        summary = agent.latency["miss"].summary()
+        if summary["count"] < self.hedge_min_samples:
+            return None
+        return summary["p95"] / 1000
+    
+    def _deadline_start(self, best_agent, query: str, start_ns: int):
+        """Réponse périmée de repli et résultat servi par le cache (une entrée expirée est supprimée par
+        la lecture : la réponse périmée est gardée avant)"""
+        stale = best_agent.stale_response(query)
+        cached = best_agent.lookup_cached(query)
+        if cached is not None:
+            cached = self._finish_result(best_agent, query, cached, start_ns)
+        return stale, cached
+    
+    def _execute_with_deadline(self, best_agent, query: str, start_ns: int, deadline: Deadline,
+                               cpu_bound: bool = None, hedge: bool = False) -> AgentResult:
+        """Exécute la requête dans le budget : relance éventuelle au p95, candidat suivant si l'agent échoue,
+        réponse périmée ou délai dépassé quand le budget est épuisé (les agents qui vérifient l'échéance
+        s'arrêtent, les autres finissent en arrière-plan)"""
+        if not best_agent:
+            return self._no_agent_result(start_ns)
+        
+        stale, cached = self._deadline_start(best_agent, query, start_ns)
+        if cached is not None:
+            return cached
+        
+        executor = self._get_deadline_executor()
+        
+        def submit(agent):
+            def run():
+                with deadline_scope(deadline):
+                    return self._run_agent(agent, query, cpu_bound)
+            return executor.submit(run)
+        
+        race = DeadlineRace(self, best_agent, query, deadline, start_ns, submit, hedge)
+        while race.proceed():
+            done, _ = wait(race.running, timeout=race.timeout(), return_when=FIRST_COMPLETED)
+            result = race.settle(done)
+            if result is not None:
+                return result
+        return race.give_up(stale)
+    
+    async def _aexecute_with_deadline(self, best_agent, query: str, start_ns: int, deadline: Deadline,
+                                      cpu_bound: bool = None, hedge: bool = False) -> AgentResult:
+        """Version asynchrone de _execute_with_deadline (tâches abandonnées jamais annulées : un calcul
+        partagé avec des appels fusionnés doit aboutir pour eux)"""
+        stale, cached = self._deadline_start(best_agent, query, start_ns)
+        if cached is not None:
+            return cached
+        
+        def start(agent):
+            # La tâche copie le contexte courant, échéance comprise
+            with deadline_scope(deadline):
+                task = asyncio.ensure_future(self._arun_agent(agent, query, cpu_bound))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            return task
+        
+        race = DeadlineRace(self, best_agent, query, deadline, start_ns, start, hedge)
+        while race.proceed():
+            done, _ = await asyncio.wait(race.running, timeout=race.timeout(), return_when=asyncio.FIRST_COMPLETED)
+            result = race.settle(done)
+            if result is not None:
+                return result
+        return race.give_up(stale)
+    
+    def _deadline_winner(self, best_agent, agent, query: str, result: AgentResult, deadline: Deadline, hedged: bool,
+                         start_ns: int) -> AgentResult:
+        """Premier résultat obtenu dans le budget ; les exécutions concurrentes sont prévenues de leur abandon"""
+        deadline.cancel()
+        if agent is not best_agent:
+            result["fallback_from"] = best_agent.name
+            if hedged:
+                with self._stats_lock:
+                    self.performance_stats["hedge_wins"] += 1
+        return self._finish_result(agent, query, result, start_ns)
+    
+    def _deadline_fallback(self, best_agent, query: str, stale: Optional[str], deadline: Deadline, errors: List,
+                           start_ns: int) -> AgentResult:
+        """Budget épuisé (ou tous les candidats en échec) : réponse périmée si un agent en garde une"""
+        if not errors:
+            with self._stats_lock:
+                self.performance_stats["timeouts"] += 1
+        
+        for agent in [best_agent] + self._alternatives(query, best_agent):
+            if agent is not best_agent:
+                if not getattr(agent, "loaded", True):
+                    continue
+                stale = agent.stale_response(query)
+            if stale is not None:
+                with self._stats_lock:
+                    self.performance_stats["stale_fallbacks"] += 1
+                result = AgentResult(stale, agent.name, True, (time.perf_counter_ns() - start_ns) / 1e6,
+                                     stale=True, deadline_exceeded=not errors)
+                return self._finish_result(agent, query, result, start_ns)
+        
+        if errors:
+            return self._error_result(errors[0][0], errors[0][1], start_ns)
+        result = self._error_result(best_agent, DeadlineExceeded(f"budget de {deadline.budget * 1000:.0f}ms dépassé"),
+                                    start_ns)
+        result["deadline_exceeded"] = True
+        return result
+    
+    def _no_agent_result(self, start_ns: int) -> AgentResult:
+        """Réponse quand aucun agent ne correspond"""
+        total_time = self._record_total(start_ns, cached=False)
+        return AgentResult(
+            "🤔 Aucun agent spécialisé trouvé pour cette requête. Essayez une question plus spécifique !",
+            "AgentManager", False, total_time, confidence=0.0, total_time=total_time, error=None
+        )
+    
+    def _error_result(self, agent, error: Exception, start_ns: int) -> AgentResult:
+        """Réponse quand l'agent a échoué"""
+        total_time = self._record_total(start_ns, cached=False)
+        return AgentResult(
+            f"❌ Erreur lors du traitement par {agent.name}: {str(error)}",
+            agent.name, False, total_time, confidence=0.0, total_time=total_time, error=str(error)
+        )
+    
+    def _finish_result(self, agent, query: str, result: AgentResult, start_ns: int) -> AgentResult:
+        """Met à jour les statistiques et ajoute la confiance au résultat de l'agent"""
+        agent_name = agent.name
+        with self._stats_lock:
+            usage = self.performance_stats["agent_usage"]
+            usage[agent_name] = usage.get(agent_name, 0) + 1
+        
+        # Calculer la confiance
+        result.confidence = self._calculate_confidence(agent, query, result)
+        result.total_time = self._record_total(start_ns, cached=result.cached)
+        result.error = None
+        
+        return result
+    
+    def _record_total(self, start_ns: int, cached: bool) -> float:
+        """Enregistre la latence complète d'une requête et met à jour les moyennes, retourne des ms"""
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        self.latency["total"].record(elapsed_ns)
+        total_time = elapsed_ns / 1e6
+        
+        with self._stats_lock:
+            self._completed += 1
+            self._cache_served += cached
+            stats = self.performance_stats
+            stats["avg_response_time"] += (total_time - stats["avg_response_time"]) / self._completed
+            stats["cache_hit_rate"] = self._cache_served / self._completed
+        return total_time
+    
+    def _calculate_confidence(self, agent, query: str, result: AgentResult) -> float:
         """Calcule le niveau de confiance de la réponse"""
-        confidence = 0.5  # Confiance de base
+        # Confiance déclarée par l'agent (qualité de la correspondance), sinon confiance de base
+        confidence = result.get("agent_confidence", 0.5)
         
         # Bonus si réponse du cache (déjà validée)
         if result.get("cached", False):
@@ -154,12 +769,13 @@ class AgentManager:
             confidence += 0.2
         
         # Bonus spécifique par type d'agent
-        if isinstance(agent, MathAgent):
+        agent_type = getattr(agent, "agent_class", type(agent))
+        if issubclass(agent_type, MathAgent):
             # Math a une confiance élevée pour les calculs simples
             if any(op in query.lower() for op in ['+', '-', '*', '/']):
                 confidence += 0.3
         
-        elif isinstance(agent, SystemAgent):
+        elif issubclass(agent_type, SystemAgent):
             # System a une confiance élevée pour les infos système
             confidence += 0.3
         
@@ -170,21 +786,95 @@ class AgentManager:
         """Retourne le statut de tous les agents"""
         status = {
             "manager_stats": self.performance_stats,
+            "cache_stats": {"entries": 0, "bytes": 0, "hits": 0, "misses": 0, "near_hits": 0, "evictions": 0},
+            "inflight_stats": {"computations": 0, "coalesced": 0, "in_flight": 0},
+            "latency": {series: histogram.summary() for series, histogram in self.latency.items()},
             "agents": []
         }
         
-        for agent in self.agents:
+        for agent in self.loaded_agents():
             try:
                 agent_status = agent.get_status()
                 status["agents"].append(agent_status)
+                
+                # Agréger les statistiques de cache
+                for key in status["cache_stats"]:
+                    status["cache_stats"][key] += agent_status["cache"].get(key, 0)
+                for key in status["inflight_stats"]:
+                    status["inflight_stats"][key] += agent_status["inflight"].get(key, 0)
             except Exception as e:
                 status["agents"].append({
                     "name": getattr(agent, 'name', 'Unknown'),
                     "error": str(e)
                 })
         
+        if self.process_pool is not None:
+            status["process_pool"] = self.process_pool.get_stats()
+        
+        if self.intent_classifier is not None:
+            status["routing"] = dict(self.routing_stats)
+        
+        if self.journal is not None:
+            status["journal"] = self.journal.get_stats()
+        
+        if self.snapshots is not None:
+            status["snapshots"] = self.snapshots.get_stats()
+        
+        shared_cache = self.get_shared_cache_stats()
+        if shared_cache is not None:
+            status["shared_cache"] = shared_cache
+        
         return status
     
+    def get_shared_cache_stats(self) -> Optional[Dict]:
+        """Succès du cache partagé par worker (tous agents confondus) et au total, None sans cache partagé"""
+        workers = {}
+        for agent in self.loaded_agents():
+            global_stats = getattr(agent.cache, "global_stats", None)
+            if global_stats is None:
+                continue
+            for pid, counters in global_stats()["workers"].items():
+                worker = workers.setdefault(pid, {"hits": 0, "misses": 0})
+                worker["hits"] += counters["hits"]
+                worker["misses"] += counters["misses"]
+        
+        if not workers:
+            return None
+        
+        total = {"hits": sum(w["hits"] for w in workers.values()), "misses": sum(w["misses"] for w in workers.values())}
+        for counters in list(workers.values()) + [total]:
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        return {"workers": workers, "total": total, "this_worker": os.getpid()}
+    
+    def loaded_agents(self) -> List[object]:
+        """Agents déjà instanciés (les statuts et métriques ne chargent pas les autres)"""
+        return [agent for agent in self.agents if getattr(agent, "loaded", True)]
+    
+    def load_all(self):
+        """Instancie tous les agents (avant un fork, pour les partager entre workers)"""
+        for agent in self.agents:
+            if not getattr(agent, "loaded", True):
+                agent.load()
+    
+    def warm_up_agents(self):
+        """Lance les préchauffages reportés (dans chaque worker, après le fork)"""
+        for agent in self.agents:
+            if isinstance(agent, LazyAgent):
+                agent.run_on_load()
+    
+    def get_agent(self, name: str) -> Optional[object]:
+        """Retourne l'agent portant ce nom"""
+        for agent in self.agents:
+            if agent.name == name:
+                return agent
+        return None
+    
+    def get_freshness(self, agent_name: str) -> FreshnessPolicy:
+        """Retourne la politique de fraîcheur de l'agent (indéfinie par défaut)"""
+        agent = self.get_agent(agent_name)
+        return agent.freshness if agent else FreshnessPolicy.forever()
+    
     def get_agent_list(self) -> List[str]:
         """Retourne la liste des agents disponibles"""
         return [f"{agent.name} ({agent.speciality})" for agent in self.agents]
@@ -192,25 +882,91 @@ class AgentManager:
     def clear_all_caches(self):
         """Vide le cache de tous les agents"""
         cleared = 0
-        for agent in self.agents:
+        for agent in self.loaded_agents():
             try:
-                cache_size = len(agent.cache)
-                agent.cache.clear()
-                cleared += cache_size
+                cleared += agent.cache.clear()
             except:
                 pass
         
         return f"🧹 {cleared} entrées de cache supprimées"
     
+    def get_latency_series(self) -> List[tuple]:
+        """Séries (nom, aide, étiquettes, histogramme) exportables vers Prometheus"""
+        series = [
+            ("nina_routing_latency_seconds", "Durée du choix de l'agent",
+             {}, self.latency["routing"]),
+            ("nina_request_latency_seconds", "Durée complète d'une requête (routage, agent, confiance)",
+             {}, self.latency["total"]),
+            ("nina_first_chunk_latency_seconds", "Délai avant le premier morceau d'une réponse en flux",
+             {}, self.latency["first_chunk"]),
+        ]
+        for agent in self.loaded_agents():
+            for cache_state, histogram in agent.latency.items():
+                series.append(("nina_agent_latency_seconds", "Durée d'exécution d'un agent",
+                               {"agent": agent.name, "cache": cache_state}, histogram))
+        for agent in self.loaded_agents():
+            series.append(("nina_agent_first_chunk_seconds", "Délai avant le premier morceau calculé par un agent",
+                           {"agent": agent.name}, agent.first_chunk_latency))
+        if self.process_pool is not None:
+            series.append(("nina_process_pool_task_seconds", "Durée de calcul d'une tâche dans un worker du pool",
+                           {}, self.process_pool.latency))
+        return series
+    
+    def export_prometheus(self, path=None) -> str:
+        """Métriques au format texte Prometheus (écrites dans `path` si fourni)"""
+        series = self.get_latency_series()
+        if path is not None:
+            write_prometheus(series, path)
+        return render_prometheus(series)
+    
+    def shutdown(self):
+        """Arrête les pools de threads, les workers du pool de processus et le journal, sauve les caches"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._deadline_executor is not None:
+            self._deadline_executor.shutdown(wait=False)
+            self._deadline_executor = None
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+        if self.journal is not None:
+            self.journal.close()
+        if self.snapshots is not None:
+            self.snapshots.close()
+    
     def get_performance_summary(self) -> str:
         """Retourne un résumé des performances"""
         stats = self.performance_stats
         
+        total = self.latency["total"].summary()
+        routing = self.latency["routing"].summary()
+        
         summary = f"""📊 **PERFORMANCES AGENT MANAGER**
 🎯 Requêtes totales : {stats['total_requests']}
-⚡ Temps moyen : {stats.get('avg_response_time', 0):.1f}ms
-
-🤖 **UTILISATION AGENTS**"""
+⚡ Latence : p50 {total['p50']:.2f}ms | p95 {total['p95']:.2f}ms | p99 {total['p99']:.2f}ms | max {total['max']:.2f}ms
+🧭 Routage : p50 {routing['p50'] * 1000:.0f}µs | p99 {routing['p99'] * 1000:.0f}µs
+💾 Taux de cache : {stats['cache_hit_rate'] * 100:.1f}%"""
+        
+        if stats["timeouts"] or stats["hedged"]:
+            summary += (f"\n⏳ Échéances : {stats['timeouts']} délais dépassés | {stats['stale_fallbacks']} réponses "
+                        f"périmées servies | {stats['hedged']} relances parallèles ({stats['hedge_wins']} gagnées)")
+        
+        coalesced = sum(agent.inflight.stats["coalesced"] for agent in self.loaded_agents())
+        if coalesced:
+            summary += f"\n🔗 Requêtes fusionnées : {coalesced} calculs identiques évités"
+        
+        if self.process_pool is not None:
+            pool = self.process_pool.get_stats()
+            summary += (f"\n🏭 Pool de processus : {pool['alive']}/{pool['workers']} workers | {pool['tasks']} tâches | "
+                        f"{pool['timeouts']} délais dépassés | {pool['respawns']} redémarrages")
+        
+        shared_cache = self.get_shared_cache_stats()
+        if shared_cache is not None:
+            own = shared_cache["workers"].get(shared_cache["this_worker"], {"hit_rate": 0.0})
+            summary += (f"\n🤝 Cache partagé : {shared_cache['total']['hit_rate'] * 100:.1f}% global "
+                        f"({len(shared_cache['workers'])} workers) | ce worker {own['hit_rate'] * 100:.1f}%")
+        
+        summary += "\n\n🤖 **UTILISATION AGENTS**"
         
         for agent_name, count in stats["agent_usage"].items():
             percentage = (count / stats["total_requests"] * 100) if stats["total_requests"] > 0 else 0
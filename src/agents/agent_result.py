@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+📦 Agent Result - Résultat compact d'une requête (__slots__), lisible comme un dictionnaire
+"""
+
+from typing import Any, Dict, Iterator, Tuple
+
+
+class AgentResult:
+    """Résultat d'un agent puis de l'AgentManager : un attribut par champ, sans dictionnaire par instance
+    (result["agent"], result.get("cached") et "stale" in result restent valables ; un champ jamais
+    renseigné est absent, comme une clé manquante)"""
+
+    __slots__ = (
+        "response", "agent", "cached", "response_time",
+        # Champs facultatifs, renseignés selon le chemin suivi
+        "stale", "coalesced", "agent_confidence", "confidence", "total_time", "error",
+        "deduplicated", "fallback_from", "deadline_exceeded",
+    )
+
+    def __init__(self, response: str, agent: str, cached: bool = False, response_time: float = 0.0, **fields):
+        self.response = response
+        self.agent = agent
+        self.cached = cached
+        self.response_time = response_time
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return getattr(self, name)
+        except (AttributeError, TypeError):
+            raise KeyError(name) from None
+
+    def __setitem__(self, name: str, value: Any):
+        try:
+            setattr(self, name, value)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __contains__(self, name: str) -> bool:
+        return isinstance(name, str) and hasattr(self, name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return getattr(self, name, default)
+
+    def keys(self) -> Iterator[str]:
+        """Champs renseignés"""
+        return (name for name in self.__slots__ if hasattr(self, name))
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((name, getattr(self, name)) for name in self.keys())
+
+    def copy(self) -> "AgentResult":
+        return AgentResult(**dict(self.items()))
+
+    def to_dict(self) -> Dict:
+        """Dictionnaire des champs renseignés (réponse JSON)"""
+        return dict(self.items())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (AgentResult, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"AgentResult({self.to_dict()!r})"
@@ -3,93 +3,426 @@
 🤖 Base Agent - Classe de base pour tous les agents IA de Nina
 """
 
-import json
+import re
+import sys
 import time
+import asyncio
 import hashlib
+import threading
+import contextvars
 from abc import ABC, abstractmethod
 from datetime import datetime
-from pathlib import Path
-from rich.console import Console
-
-console = Console()
+from .response_cache import ResponseCache, FreshnessPolicy, STALE, create_response_cache
+from .query_normalizer import canonicalize, has_literals
+from .metrics import LatencyHistogram
+from .streaming import ResponseStream, AsyncResponseStream
+from .singleflight import FlightAbandoned, SingleFlight
+from .agent_result import AgentResult
+from .deadline import current_deadline
 
 class BaseAgent(ABC):
     """Classe de base pour tous les agents IA de Nina"""
     
-    def __init__(self, name: str, speciality: str):
-        self.name = name
+    # Politique de fraîcheur du cache (surchargée par les agents volatils)
+    freshness = FreshnessPolicy.forever()
+    
+    # Déclarations de routage (compilées une fois par l'index de l'AgentManager)
+    routing_keywords = ()        # Sous-chaînes qui rendent l'agent candidat
+    routing_patterns = ()        # Expressions régulières qui rendent l'agent candidat
+    routing_bonus_keywords = ()  # Sous-chaînes qui donnent le bonus de score
+    routing_bonus = 0.0
+    
+    # Similarité (0-1) à partir de laquelle une requête proche déjà en cache répond (None : désactivé)
+    near_duplicate_threshold = None
+    
+    # Traitement gourmand en CPU : confié au pool de processus de l'AgentManager quand il existe
+    cpu_bound = False
+    
+    def __init__(self, name: str, speciality: str, cache: ResponseCache = None):
+        # Nom internalisé : une seule chaîne partagée par les résultats, statistiques et journaux
+        self.name = sys.intern(name)
         self.speciality = speciality
         self.created_at = datetime.now()
-        self.cache = {}
+        # Backend choisi par la configuration (performance.cache_backend), un espace par agent
+        self.cache = cache if cache is not None else create_response_cache(
+            name, near_duplicate_threshold=self.near_duplicate_threshold
+        )
         self.performance_stats = {
             "requests": 0,
             "cache_hits": 0,
             "avg_response_time": 0.0
         }
+        # Distributions de latence : réponses servies par le cache / calculées
+        self.latency = {"hit": LatencyHistogram(), "miss": LatencyHistogram()}
+        self.first_chunk_latency = LatencyHistogram()
+        self._stats_lock = threading.Lock()
+        self._reported = threading.local()
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        # Requêtes identiques simultanées (même clé de cache) : un seul calcul
+        self.inflight = SingleFlight()
+    
+    @classmethod
+    def routing_exact_queries(cls):
+        """Requêtes reconnues telles quelles (en minuscules)"""
+        return ()
     
-    @abstractmethod
     def can_handle(self, query: str) -> bool:
         """Détermine si cet agent peut traiter la requête"""
-        pass
+        query_clean = query.lower().strip()
+        
+        if query_clean in self.routing_exact_queries():
+            return True
+        
+        if any(keyword in query_clean for keyword in self.routing_keywords):
+            return True
+        
+        return any(re.search(pattern, query_clean) for pattern in self.routing_patterns)
     
     @abstractmethod
     def process(self, query: str) -> str:
         """Traite la requête et retourne une réponse"""
         pass
     
-    def get_cache_key(self, query: str) -> str:
-        """Génère une clé de cache pour la requête"""
-        return hashlib.md5(f"{self.name}:{query.lower()}".encode()).hexdigest()
+    def report_confidence(self, confidence: float):
+        """Déclare, depuis process, la confiance (0-1) de la réponse en cours"""
+        self._reported.confidence = confidence
+    
+    def _take_confidence(self):
+        """Récupère (et efface) la confiance déclarée dans ce thread"""
+        confidence = getattr(self._reported, "confidence", None)
+        self._reported.confidence = None
+        return confidence
+    
+    def _process_with_confidence(self, query: str):
+        """process et confiance déclarée, lus dans le même thread"""
+        self._take_confidence()
+        return self.process(query), self._take_confidence()
+    
+    @staticmethod
+    def _may_lead() -> bool:
+        """Un appel borné par une échéance rejoint un calcul identique en cours mais n'en mène jamais :
+        son budget (délai de lecture, abandon) ne doit pas s'imposer aux appels fusionnés sans échéance.
+        Des appels identiques qui ont tous une échéance (POST /query avec deadline_ms) ne sont donc pas
+        fusionnés : chacun calcule dans son propre budget"""
+        return current_deadline() is None
+    
+    def _compute(self, query: str):
+        """Calcul d'une réponse manquante, mise en cache avant d'être partagée avec les appels fusionnés"""
+        response, confidence = self._process_with_confidence(query)
+        self.cache_response(query, response)
+        return response, confidence
+    
+    def _compute_in_pool(self, pool, query: str):
+        """_compute exécuté dans un worker du pool"""
+        response, confidence = pool.run(self.name, query)
+        self.cache_response(query, response)
+        return response, confidence
+    
+    async def _acompute(self, query: str):
+        """Version asynchrone de _compute"""
+        self._take_confidence()
+        response = await self.aprocess(query)
+        confidence = self._take_confidence()
+        self.cache_response(query, response)
+        return response, confidence
+    
+    def process_stream(self, query: str):
+        """Produit la réponse par morceaux (par défaut : la réponse complète en un seul morceau)"""
+        yield self.process(query)
+    
+    async def aprocess_stream(self, query: str):
+        """Version asynchrone de process_stream"""
+        if type(self).process_stream is BaseAgent.process_stream:
+            yield await self.aprocess(query)
+            return
+        
+        # Générateur synchrone surchargé : chaque morceau est attendu dans un thread
+        loop = asyncio.get_running_loop()
+        chunks = self.process_stream(query)
+        end = object()
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, end)
+            if chunk is end:
+                return
+            yield chunk
+    
+    def get_cache_key(self, query: str) -> bytes:
+        """Génère une clé de cache pour la requête (forme canonique : casse, accents, ponctuation) :
+        empreinte brute de 16 octets, deux fois plus petite que sa forme hexadécimale"""
+        return hashlib.md5(f"{self.name}:{canonicalize(query)}".encode()).digest()
     
     def get_cached_response(self, query: str) -> str:
         """Récupère une réponse du cache si disponible"""
-        cache_key = self.get_cache_key(query)
-        if cache_key in self.cache:
+        entry = self._lookup_cache(query)
+        return entry[0] if entry else None
+    
+    def _lookup_cache(self, query: str):
+        """Consulte le cache selon la politique de fraîcheur, retourne (réponse, état) ou None"""
+        if not self.freshness.is_cacheable():
+            return None
+        
+        entry = self.cache.lookup(self.get_cache_key(query), self.freshness, self._near_duplicate_text(query))
+        if entry is None:
+            return None
+        
+        with self._stats_lock:
             self.performance_stats["cache_hits"] += 1
-            return self.cache[cache_key]
-        return None
+        
+        # Réponse périmée : la servir tout de suite et la recalculer en arrière-plan
+        if entry[1] == STALE:
+            self._refresh_in_background(query)
+        return entry
+    
+    def _refresh_in_background(self, query: str):
+        """Recalcule une réponse périmée sans bloquer l'appelant"""
+        cache_key = self.get_cache_key(query)
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+        
+        def refresh():
+            try:
+                # Une requête manquée pendant le recalcul le rejoint au lieu d'en lancer un autre
+                self.inflight.do(cache_key, self._compute, query)
+            except Exception:
+                pass
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(cache_key)
+        
+        threading.Thread(target=refresh, name=f"{self.name}-refresh", daemon=True).start()
     
     def cache_response(self, query: str, response: str):
         """Met en cache une réponse"""
-        cache_key = self.get_cache_key(query)
-        self.cache[cache_key] = response
+        if self.freshness.is_cacheable():
+            self.cache.set(self.get_cache_key(query), response, text=self._near_duplicate_text(query))
+    
+    def _near_duplicate_text(self, query: str):
+        """Texte indexé pour la recherche de quasi-doublons (None si le cache ne la fait pas, ou pour une requête
+        avec chiffres ou opérateurs : "2+3" ne doit jamais répondre à "2+2")"""
+        if self.cache.near_duplicates is None or has_literals(query):
+            return None
+        return canonicalize(query)
     
-    def execute(self, query: str) -> dict:
+    def execute(self, query: str) -> AgentResult:
         """Exécute l'agent avec mesure de performance"""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Vérifier le cache d'abord
-        cached = self.get_cached_response(query)
-        if cached:
-            return {
-                "response": cached,
-                "agent": self.name,
-                "cached": True,
-                "response_time": 0.0
-            }
-        
-        # Traiter la requête
-        response = self.process(query)
+        cached = self._cached_result(query, start_ns)
+        if cached is not None:
+            return cached
         
-        # Mesurer le temps
-        response_time = (time.time() - start_time) * 1000  # en ms
+        # Traiter la requête (ou attendre le calcul identique déjà en cours)
+        (response, confidence), coalesced = self.inflight.do(self.get_cache_key(query), self._compute, query,
+                                                            lead=self._may_lead())
+        
+        return self._record_result(query, response, start_ns, confidence, already_cached=True, coalesced=coalesced)
+    
+    def execute_in_pool(self, pool, query: str) -> AgentResult:
+        """Exécute process dans un worker du pool ; cache, mesures et statistiques restent dans ce processus"""
+        start_ns = time.perf_counter_ns()
         
-        # Mettre à jour les stats
-        self.performance_stats["requests"] += 1
-        self.performance_stats["avg_response_time"] = (
-            (self.performance_stats["avg_response_time"] * (self.performance_stats["requests"] - 1) + response_time) /
-            self.performance_stats["requests"]
+        cached = self._cached_result(query, start_ns)
+        if cached is not None:
+            return cached
+        
+        (response, confidence), coalesced = self.inflight.do(
+            self.get_cache_key(query), self._compute_in_pool, pool, query, lead=self._may_lead()
         )
+        return self._record_result(query, response, start_ns, confidence, already_cached=True, coalesced=coalesced)
+    
+    async def aexecute_in_pool(self, pool, query: str) -> AgentResult:
+        """Version asynchrone de execute_in_pool (l'attente du worker occupe un thread, pas la boucle)"""
+        start_ns = time.perf_counter_ns()
+        
+        cached = self._cached_result(query, start_ns)
+        if cached is not None:
+            return cached
+        
+        async def compute():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._compute_in_pool, pool, query)
+        
+        (response, confidence), coalesced = await self.inflight.ado(self.get_cache_key(query), compute,
+                                                                    lead=self._may_lead())
+        return self._record_result(query, response, start_ns, confidence, already_cached=True, coalesced=coalesced)
+    
+    async def aprocess(self, query: str) -> str:
+        """Version asynchrone de process (par défaut : process exécuté dans un thread)"""
+        loop = asyncio.get_running_loop()
+        # Contexte copié : l'échéance de la requête reste visible dans le thread
+        context = contextvars.copy_context()
+        response, confidence = await loop.run_in_executor(None, context.run, self._process_with_confidence, query)
+        if confidence is not None:
+            # Retour direct vers _acompute, sans autre tâche entre les deux : même thread
+            self.report_confidence(confidence)
+        return response
+    
+    async def aexecute(self, query: str) -> AgentResult:
+        """Exécute l'agent de façon asynchrone avec mesure de performance"""
+        start_ns = time.perf_counter_ns()
+        
+        # Vérifier le cache d'abord
+        cached = self._cached_result(query, start_ns)
+        if cached is not None:
+            return cached
+        
+        # Traiter la requête (I/O asynchrones possibles dans aprocess), une fois par groupe d'appels identiques
+        (response, confidence), coalesced = await self.inflight.ado(self.get_cache_key(query), self._acompute, query,
+                                                                    lead=self._may_lead())
+        
+        return self._record_result(query, response, start_ns, confidence, already_cached=True, coalesced=coalesced)
+    
+    def execute_stream(self, query: str) -> ResponseStream:
+        """Exécute l'agent en flux ; la réponse assemblée est mise en cache à la fin du flux
+        (un flux identique déjà en cours est attendu, puis sa réponse servie en un seul morceau)"""
+        def produce(stream):
+            start_ns = time.perf_counter_ns()
+            
+            cached = self._cached_result(query, start_ns)
+            if cached is not None:
+                stream.result = cached
+                yield cached["response"]
+                return
+            
+            key = self.get_cache_key(query)
+            future, leader = self.inflight.join(key, self._may_lead())
+            if not leader:
+                try:
+                    (response, confidence), coalesced = future.result(), True
+                except FlightAbandoned:
+                    (response, confidence), coalesced = self.inflight.do(key, self._compute, query, lead=self._may_lead())
+                stream.result = self._record_result(query, response, start_ns, confidence,
+                                                    already_cached=True, coalesced=coalesced)
+                yield response
+                return
+            
+            parts = []
+            try:
+                self._take_confidence()
+                for chunk in self.process_stream(query):
+                    if not parts:
+                        self.first_chunk_latency.record(time.perf_counter_ns() - start_ns)
+                    parts.append(chunk)
+                    yield chunk
+                response, confidence = "".join(parts), self._take_confidence()
+                self.cache_response(query, response)
+            except BaseException as e:
+                self.inflight.finish(key, future, error=self._flight_error(e))
+                raise
+            self.inflight.finish(key, future, (response, confidence))
+            
+            stream.result = self._record_result(query, response, start_ns, confidence, already_cached=True)
+        
+        return ResponseStream(produce)
+    
+    def aexecute_stream(self, query: str) -> AsyncResponseStream:
+        """Version asynchrone de execute_stream"""
+        async def produce(stream):
+            start_ns = time.perf_counter_ns()
+            
+            cached = self._cached_result(query, start_ns)
+            if cached is not None:
+                stream.result = cached
+                yield cached["response"]
+                return
+            
+            key = self.get_cache_key(query)
+            future, leader = self.inflight.join(key, self._may_lead())
+            if not leader:
+                try:
+                    # shield : l'annulation de ce flux n'annule pas celui qu'il attend
+                    (response, confidence), coalesced = await asyncio.shield(asyncio.wrap_future(future)), True
+                except FlightAbandoned:
+                    (response, confidence), coalesced = await self.inflight.ado(key, self._acompute, query, lead=self._may_lead())
+                stream.result = self._record_result(query, response, start_ns, confidence,
+                                                    already_cached=True, coalesced=coalesced)
+                yield response
+                return
+            
+            parts = []
+            try:
+                self._take_confidence()
+                async for chunk in self.aprocess_stream(query):
+                    if not parts:
+                        self.first_chunk_latency.record(time.perf_counter_ns() - start_ns)
+                    parts.append(chunk)
+                    yield chunk
+                response, confidence = "".join(parts), self._take_confidence()
+                self.cache_response(query, response)
+            except BaseException as e:
+                self.inflight.finish(key, future, error=self._flight_error(e))
+                raise
+            self.inflight.finish(key, future, (response, confidence))
+            
+            stream.result = self._record_result(query, response, start_ns, confidence, already_cached=True)
+        
+        return AsyncResponseStream(produce)
+    
+    def _flight_error(self, error: BaseException) -> BaseException:
+        """Erreur transmise aux flux en attente : un flux simplement fermé (ou annulé) les laisse calculer"""
+        if isinstance(error, (GeneratorExit, asyncio.CancelledError)):
+            return FlightAbandoned("flux identique interrompu avant la fin")
+        return error
+    
+    def lookup_cached(self, query: str):
+        """Résultat servi par le cache (selon la politique de fraîcheur), ou None"""
+        return self._cached_result(query, time.perf_counter_ns())
+    
+    def stale_response(self, query: str):
+        """Dernière réponse connue, même hors politique de fraîcheur (repli quand le budget est épuisé)"""
+        if not self.freshness.is_cacheable():
+            return None
+        return self.cache.peek(self.get_cache_key(query))
+    
+    def _cached_result(self, query: str, start_ns: int):
+        """Résultat construit depuis le cache, ou None"""
+        cached = self._lookup_cache(query)
+        if cached is None:
+            return None
+        
+        return AgentResult(cached[0], self.name, True, self._record_latency("hit", start_ns), stale=cached[1] == STALE)
+    
+    def _record_result(self, query: str, response: str, start_ns: int, confidence: float = None,
+                       already_cached: bool = False, coalesced: bool = False) -> AgentResult:
+        """Mesure, met à jour les stats et met en cache une réponse calculée (sauf si `already_cached`)"""
+        # Mesurer le temps
+        response_time = self._record_latency("miss", start_ns)
         
         # Mettre en cache
-        self.cache_response(query, response)
+        if not already_cached:
+            self.cache_response(query, response)
         
-        return {
-            "response": response,
-            "agent": self.name,
-            "cached": False,
-            "response_time": response_time
-        }
+        result = AgentResult(response, self.name, False, response_time)
+        if coalesced:
+            result.coalesced = True
+        if confidence is not None:
+            result.agent_confidence = confidence
+        return result
+    
+    def _record_latency(self, series: str, start_ns: int) -> float:
+        """Enregistre la latence d'une requête (succès ou échec du cache), retourne des ms"""
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        self.latency[series].record(elapsed_ns)
+        response_time = elapsed_ns / 1e6
+        
+        # Les réponses du cache comptent aussi : cache_hits / requests est un vrai taux
+        with self._stats_lock:
+            self.performance_stats["requests"] += 1
+            self.performance_stats["avg_response_time"] += (
+                (response_time - self.performance_stats["avg_response_time"]) /
+                self.performance_stats["requests"]
+            )
+        return response_time
+    
+    def get_latency_summary(self) -> dict:
+        """Percentiles de latence (ms) par série : hit, miss"""
+        summary = {series: histogram.summary() for series, histogram in self.latency.items()}
+        summary["first_chunk"] = self.first_chunk_latency.summary()
+        return summary
     
     def get_status(self) -> dict:
         """Retourne le statut de l'agent"""
@@ -98,5 +431,9 @@ class BaseAgent(ABC):
             "speciality": self.speciality,
             "uptime": str(datetime.now() - self.created_at),
             "performance": self.performance_stats,
-            "cache_size": len(self.cache)
+            "cache_size": len(self.cache),
+            "freshness": self.freshness.mode,
+            "cache": self.cache.get_stats(),
+            "inflight": self.inflight.get_stats(),
+            "latency": self.get_latency_summary()
         } 
\ No newline at end of file
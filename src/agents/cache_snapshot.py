@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+📸 Cache Snapshot - Instantanés des caches d'agents (redémarrage à chaud) et préchauffage des requêtes fréquentes
+
+Fichier : magic, date de l'instantané et nombre d'entrées, puis les entrées compressées par zlib
+[horodatage, longueurs] + clé (empreinte brute), réponse et texte indexé.
+"""
+
+import os
+import time
+import zlib
+import atexit
+import struct
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .config import CONFIG_FILE, PROJECT_ROOT, load_section
+from .response_cache import ResponseCache, FRESH
+
+
+MAGIC = b"NINACS02"  # 02 : clés binaires (empreintes de BaseAgent.get_cache_key)
+
+# magic, date de l'instantané, nombre d'entrées
+HEADER = struct.Struct("<8sdI")
+# horodatage de l'entrée, longueurs de la clé, de la réponse et du texte indexé (0 : aucun)
+ENTRY = struct.Struct("<dIII")
+
+DEFAULT_SETTINGS = {
+    "enabled": False,           # Caches des agents restaurés au démarrage, sauvés périodiquement et à l'arrêt
+    "path": "cache/snapshots",  # Dossier des instantanés, un fichier par agent
+    "interval": 300,            # Secondes entre deux sauvegardes (0 : à l'arrêt seulement)
+    "prewarm_file": None,       # Requêtes à préchauffer (texte, une par ligne, ou journal de requêtes)
+    "prewarm_top": 200,         # Requêtes les plus fréquentes calculées avant de se déclarer prêt
+}
+
+
+def load_snapshot_settings(config_path: Path = CONFIG_FILE) -> Dict:
+    """Paramètres des instantanés : section "snapshots" de la configuration"""
+    return load_section("snapshots", DEFAULT_SETTINGS, config_path)
+
+
+def save_snapshot(cache: ResponseCache, freshness, path: Path) -> int:
+    """Écrit les entrées encore fraîches du cache (ordre LRU conservé), retourne leur nombre"""
+    now = time.time()
+    chunks = []
+    count = 0
+    for key, value, stored_at, text in cache.entries():
+        if freshness.state(now - stored_at) != FRESH:
+            continue
+        value_bytes = value.encode("utf-8")
+        text_bytes = text.encode("utf-8") if text else b""
+        chunks.append(ENTRY.pack(stored_at, len(key), len(value_bytes), len(text_bytes)))
+        chunks.extend((key, value_bytes, text_bytes))
+        count += 1
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Fichier temporaire propre au processus puis remplacement atomique : jamais d'instantané à moitié écrit
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, now, count))
+        f.write(zlib.compress(b"".join(chunks), 1))
+    os.replace(temporary, path)
+    return count
+
+
+def restore_snapshot(cache: ResponseCache, freshness, path: Path) -> int:
+    """Recharge les entrées encore fraîches d'un instantané, retourne leur nombre (0 sans fichier)"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return 0
+    magic, _, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"instantané de cache invalide : {path}")
+    payload = zlib.decompress(data[HEADER.size:])
+
+    now = time.time()
+    restored = 0
+    offset = 0
+    for _ in range(count):
+        stored_at, key_length, value_length, text_length = ENTRY.unpack_from(payload, offset)
+        offset += ENTRY.size
+        key = payload[offset:offset + key_length]
+        offset += key_length
+        value = payload[offset:offset + value_length].decode("utf-8")
+        offset += value_length
+        text = payload[offset:offset + text_length].decode("utf-8") if text_length else None
+        offset += text_length
+
+        # Entrées devenues périmées depuis la sauvegarde (SystemAgent) : jamais restaurées
+        if freshness.state(now - stored_at) == FRESH:
+            cache.set(key, value, stored_at=stored_at, text=text)
+            restored += 1
+    return restored
+
+
+class CacheSnapshotter:
+    """Instantanés des caches en mémoire des agents : restauration à l'instanciation, sauvegarde périodique
+    et à l'arrêt (un cache partagé est déjà persistant et n'est pas concerné)"""
+
+    def __init__(self, directory: Path, interval: float = 300):
+        self.directory = Path(directory)
+        self.interval = interval
+        self._thread = None
+        self._stop = threading.Event()
+        self._pid = None
+        self._agents = None
+        self._lock = threading.Lock()
+        self.stats = {"restored": 0, "saved": 0, "snapshots": 0, "errors": 0}
+
+    @classmethod
+    def from_settings(cls, settings: Dict = None) -> Optional["CacheSnapshotter"]:
+        """Instantanés selon la configuration (None s'ils sont désactivés)"""
+        settings = settings if settings is not None else load_snapshot_settings()
+        if not settings["enabled"]:
+            return None
+        return cls(PROJECT_ROOT / settings["path"], interval=settings["interval"])
+
+    def path_for(self, agent) -> Path:
+        """Fichier d'instantané de l'agent"""
+        return self.directory / f"{agent.name}.ncs"
+
+    def _snapshottable(self, agent) -> bool:
+        """Cache en mémoire d'un agent dont les réponses peuvent être gardées"""
+        return isinstance(agent.cache, ResponseCache) and agent.freshness.is_cacheable()
+
+    def attach(self, agent):
+        """Restaure le cache de l'agent dès qu'il est instancié (sans charger un agent paresseux)"""
+        if hasattr(agent, "add_load_hook"):
+            agent.add_load_hook(self.restore)
+        else:
+            self.restore(agent)
+
+    def restore(self, agent) -> int:
+        """Recharge l'instantané de l'agent dans son cache"""
+        if not self._snapshottable(agent):
+            return 0
+        try:
+            restored = restore_snapshot(agent.cache, agent.freshness, self.path_for(agent))
+        except (OSError, ValueError, struct.error, zlib.error) as e:
+            self.stats["errors"] += 1
+            print(f"⚠️ Instantané de {agent.name} ignoré : {e}")
+            return 0
+        self.stats["restored"] += restored
+        return restored
+
+    def save(self, agents: List[object]) -> int:
+        """Sauvegarde les caches des agents instanciés, retourne le nombre d'entrées écrites"""
+        saved = 0
+        with self._lock:
+            for agent in agents:
+                if not getattr(agent, "loaded", True) or not self._snapshottable(agent):
+                    continue
+                try:
+                    saved += save_snapshot(agent.cache, agent.freshness, self.path_for(agent))
+                except OSError as e:
+                    self.stats["errors"] += 1
+                    print(f"⚠️ Instantané de {agent.name} non écrit : {e}")
+            self.stats["saved"] += saved
+            self.stats["snapshots"] += 1
+        return saved
+
+    def start(self, agents: Callable[[], List[object]]):
+        """Sauvegarde périodique (thread propre au processus) et à l'arrêt normal du processus"""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._stop = threading.Event()
+        self._agents = agents
+        atexit.register(self.close)
+        if self.interval > 0:
+            self._thread = threading.Thread(target=self._run, args=(self._stop,), name="nina-snapshots", daemon=True)
+            self._thread.start()
+
+    def _run(self, stop: threading.Event):
+        """Boucle du thread de sauvegarde"""
+        while not stop.wait(self.interval):
+            self.save(self._agents())
+
+    def close(self, save: bool = True):
+        """Arrête la sauvegarde périodique et écrit un dernier instantané (save=False : sans l'écrire)"""
+        if self._pid != os.getpid():
+            return
+        self._pid = None
+        self._stop.set()
+        if save:
+            self.save(self._agents())
+
+    def get_stats(self) -> Dict:
+        """Entrées restaurées et sauvegardées, dossier des instantanés"""
+        stats = dict(self.stats)
+        stats["path"] = str(self.directory)
+        return stats
+
+
+def read_prewarm_queries(path: Path, top: int) -> List[str]:
+    """Requêtes les plus fréquentes d'une liste (une par ligne, ou "nombre<TAB>requête") ou d'un journal"""
+    path = Path(path)
+    counts = Counter()
+    if path.is_dir() or path.suffix == ".njr":
+        from .journal import iter_journal, read_journal
+        records = iter_journal(path) if path.is_dir() else read_journal(path)
+        counts.update(entry["query"] for entry in records)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                count, _, query = line.partition("\t")
+                if query and count.isdigit():
+                    counts[query] += int(count)
+                else:
+                    counts[line] += 1
+    return [query for query, _ in counts.most_common(top)]
+
+
+def configured_prewarm_queries(settings: Dict = None) -> List[str]:
+    """Requêtes à préchauffer selon la configuration (aucune sans `prewarm_file`)"""
+    settings = settings if settings is not None else load_snapshot_settings()
+    if not settings["prewarm_file"]:
+        return []
+    return read_prewarm_queries(PROJECT_ROOT / settings["prewarm_file"], settings["prewarm_top"])
+
+
+def prewarm(manager, queries: List[str]) -> Dict:
+    """Calcule les réponses des requêtes données comme un lot de requêtes réelles (routage, statistiques,
+    journal et fusion des doublons de l'AgentManager ; déjà en cache : comptées à part)"""
+    start = time.perf_counter()
+    stats = {"queries": len(queries), "computed": 0, "cached": 0, "errors": 0, "unrouted": 0}
+    for result in manager.process_queries(queries):
+        if result.get("error") is not None:
+            stats["errors"] += 1
+        elif result.get("cached"):
+            stats["cached"] += 1
+        elif result.get("agent") == "AgentManager":
+            stats["unrouted"] += 1
+        else:
+            stats["computed"] += 1
+    stats["elapsed_ms"] = (time.perf_counter() - start) * 1000
+    return stats
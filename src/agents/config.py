@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+⚙️ Config - Lecture des sections du fichier de configuration de Nina
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Dict
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+# NINA_CONFIG : autre fichier de configuration (tests, benchmarks)
+CONFIG_FILE = Path(os.environ.get("NINA_CONFIG") or PROJECT_ROOT / "config" / "nina_pro_config.json")
+
+_parsed = {}  # chemin -> (date de modification, configuration)
+_parsed_lock = threading.Lock()
+
+
+def _read_config(config_path: Path) -> Dict:
+    """Configuration analysée une fois par version du fichier ({} s'il est absent ou invalide)"""
+    try:
+        mtime = os.stat(config_path).st_mtime_ns
+    except OSError:
+        return {}
+    with _parsed_lock:
+        cached = _parsed.get(config_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        config = {}
+    if not isinstance(config, dict):
+        config = {}
+    with _parsed_lock:
+        _parsed[config_path] = (mtime, config)
+    return config
+
+
+def load_section(name: str, defaults: Dict, config_path: Path = CONFIG_FILE) -> Dict:
+    """Valeurs par défaut remplacées par celles de la section `name` (les clés inconnues sont ignorées)"""
+    settings = dict(defaults)
+    section = _read_config(Path(config_path)).get(name)
+    if isinstance(section, dict):
+        for key in settings:
+            if key in section:
+                settings[key] = section[key]
+    return settings
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+⏳ Deadline - Budget de latence d'une requête, propagé aux agents (contextvars) et annulable
+"""
+
+import time
+import threading
+import contextlib
+import contextvars
+from typing import Optional
+
+_current = contextvars.ContextVar("nina_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Budget de la requête épuisé (ou requête abandonnée par l'AgentManager)"""
+
+
+class Deadline:
+    """Échéance absolue d'une requête ; cancel() prévient les agents que leur travail est abandonné"""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def coerce(cls, value) -> Optional["Deadline"]:
+        """Deadline à partir d'un budget en secondes (None : pas d'échéance) ; une Deadline reçue donne
+        une échéance propre à la requête, pour que son abandon n'atteigne pas celle de l'appelant"""
+        if value is None:
+            return None
+        if isinstance(value, cls):
+            return cls(value.remaining())
+        return cls(float(value))
+
+    def remaining(self) -> float:
+        """Secondes restantes (0 si l'échéance est passée ou la requête abandonnée)"""
+        if self._cancelled.is_set():
+            return 0.0
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def cancel(self):
+        """Abandonne la requête : les vérifications suivantes des agents échouent"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self):
+        """Lève DeadlineExceeded si le budget est épuisé"""
+        if self.expired():
+            raise DeadlineExceeded("abandonnée" if self.cancelled else f"budget de {self.budget * 1000:.0f}ms dépassé")
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining() * 1000:.1f}ms)"
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Échéance de la requête en cours (None hors d'une requête à budget)"""
+    return _current.get()
+
+
+def remaining_time(default: float) -> float:
+    """Temps restant pour la requête en cours, borné par `default` (délai habituel de l'opération)"""
+    deadline = _current.get()
+    return default if deadline is None else min(default, deadline.remaining())
+
+
+def check_deadline():
+    """Point d'annulation coopératif pour les agents (sans effet hors d'une requête à budget)"""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check()
+
+
+@contextlib.contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    """Rend l'échéance visible des agents appelés dans ce contexte"""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+🧮 Expression Engine - Évaluation arithmétique sûre et bornée (sans eval)
+"""
+
+import re
+import ast
+import math
+import operator
+import functools
+from typing import Callable, List, Optional, Tuple
+
+
+class ExpressionError(ValueError):
+    """Expression invalide ou non supportée"""
+
+
+class ExpressionBudgetError(ExpressionError):
+    """Expression qui dépasse le budget de calcul autorisé"""
+
+
+# Fonctions supportées : nom -> (nombre d'arguments, implémentation)
+# Les angles des fonctions trigonométriques sont en degrés
+def _sqrt(x):
+    if x < 0:
+        raise ExpressionError("racine carrée d'un nombre négatif")
+    return math.sqrt(x)
+
+
+FUNCTIONS = {
+    "sqrt": (1, _sqrt),
+    "pow": (2, None),  # Délégué au contrôle de budget de la puissance
+    "sin": (1, lambda x: math.sin(math.radians(x))),
+    "cos": (1, lambda x: math.cos(math.radians(x))),
+    "tan": (1, lambda x: math.tan(math.radians(x))),
+}
+
+CONSTANTS = {
+    "pi": math.pi,
+}
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: None,  # Délégué au contrôle de budget de la puissance
+}
+
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+# Suite la plus longue de caractères pouvant former une expression dans une phrase
+# (notation scientifique comprise : "1.5e3" est un seul nombre)
+_EXPRESSION_RUN = re.compile(r"(?:\d*\.?\d+e[+-]?\d+|sqrt|pow|sin|cos|tan|pi|[\d.\s+\-*/%^()×÷,])+")
+
+
+class ExpressionEngine:
+    """Moteur d'expressions arithmétiques : compile une fois, évalue sous budget"""
+
+    def __init__(self, max_length: int = 200, max_nodes: int = 256,
+                 max_exponent: int = 10000, max_bits: int = 4096, cache_size: int = 1024):
+        self.max_length = max_length
+        self.max_nodes = max_nodes
+        self.max_exponent = max_exponent
+        self.max_bits = max_bits
+        self._compile_cached = functools.lru_cache(maxsize=cache_size)(self._compile)
+
+    def normalize(self, expression: str) -> str:
+        """Forme canonique d'une expression (clé du cache de compilation)"""
+        expression = expression.lower().replace("×", "*").replace("÷", "/").replace("^", "**")
+        return "".join(expression.split())
+
+    def extract(self, text: str) -> Optional[str]:
+        """Extrait d'une phrase la plus longue sous-chaîne qui ressemble à un calcul ; une suite collée à
+        une lettre ("5km", "2x3") n'est pas un calcul complet et n'est jamais retenue"""
+        text = text.lower()
+        runs = []
+        for match in _EXPRESSION_RUN.finditer(text):
+            run = match.group()
+            start = match.start() + len(run) - len(run.lstrip())
+            end = match.end() - len(run) + len(run.rstrip())
+            if (start > 0 and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum()):
+                continue
+            run = run.strip(" ,")
+            if any(char.isdigit() for char in run):
+                runs.append(run)
+        return max(runs, key=len) if runs else None
+
+    def compile(self, expression: str) -> Callable[[], float]:
+        """Compile (ou récupère du cache) la forme exécutable d'une expression"""
+        return self._compile_cached(self.normalize(expression))
+
+    def evaluate(self, expression: str):
+        """Évalue une expression en respectant les budgets"""
+        try:
+            return self.compile(expression)()
+        except ZeroDivisionError:
+            raise ExpressionError("division par zéro")
+        except OverflowError:
+            raise ExpressionBudgetError("résultat trop grand")
+
+    def top_level_call(self, expression: str) -> Optional[Tuple[str, List[float]]]:
+        """Si l'expression est un appel de fonction unique, retourne (fonction, arguments évalués)"""
+        tree = self._parse(self.normalize(expression))
+        node = tree.body
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            args = [self.evaluate(ast.unparse(arg)) for arg in node.args]
+            return node.func.id, args
+        return None
+
+    def _parse(self, expression: str) -> ast.Expression:
+        """Analyse syntaxique avec contrôle de taille"""
+        if not expression:
+            raise ExpressionError("expression vide")
+        if len(expression) > self.max_length:
+            raise ExpressionBudgetError(f"expression trop longue (> {self.max_length} caractères)")
+        try:
+            tree = ast.parse(expression, mode="eval")
+        except (SyntaxError, ValueError):
+            raise ExpressionError(f"expression invalide : {expression}")
+
+        nodes = sum(1 for _ in ast.walk(tree))
+        if nodes > self.max_nodes:
+            raise ExpressionBudgetError(f"expression trop complexe ({nodes} nœuds)")
+        return tree
+
+    def _compile(self, expression: str) -> Callable[[], float]:
+        """Transforme l'AST en fermetures Python (aucun eval)"""
+        return self._compile_node(self._parse(expression).body)
+
+    def _compile_node(self, node: ast.AST) -> Callable[[], float]:
+        """Compile un nœud de l'AST"""
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            value = self._check(node.value)
+            return lambda: value
+
+        if isinstance(node, ast.Name) and node.id in CONSTANTS:
+            value = CONSTANTS[node.id]
+            return lambda: value
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            op = UNARY_OPERATORS[type(node.op)]
+            operand = self._compile_node(node.operand)
+            return lambda: op(operand())
+
+        if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+            left = self._compile_node(node.left)
+            right = self._compile_node(node.right)
+            if isinstance(node.op, ast.Pow):
+                return lambda: self._power(left(), right())
+            op = BINARY_OPERATORS[type(node.op)]
+            if isinstance(node.op, ast.Mult):
+                return lambda: self._check(op(*self._check_product(left(), right())))
+            return lambda: self._check(op(left(), right()))
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            if node.func.id not in FUNCTIONS:
+                raise ExpressionError(f"fonction inconnue : {node.func.id}")
+            arity, function = FUNCTIONS[node.func.id]
+            if len(node.args) != arity:
+                raise ExpressionError(f"{node.func.id} attend {arity} argument(s)")
+            args = [self._compile_node(arg) for arg in node.args]
+            if node.func.id == "pow":
+                return lambda: self._power(args[0](), args[1]())
+            return lambda: self._check(function(*(arg() for arg in args)))
+
+        raise ExpressionError(f"élément non supporté : {ast.unparse(node)}")
+
+    def _power(self, base, exponent):
+        """Puissance avec estimation du coût avant calcul"""
+        if abs(exponent) > self.max_exponent:
+            raise ExpressionBudgetError(f"exposant trop grand ({exponent})")
+        if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+            if base.bit_length() * exponent > self.max_bits:
+                raise ExpressionBudgetError("résultat trop grand")
+        if base == 0 and exponent < 0:
+            raise ZeroDivisionError
+        return self._check(base ** exponent)
+
+    def _check_product(self, left, right):
+        """Refuse les produits d'entiers dont le résultat dépasserait le budget"""
+        if isinstance(left, int) and isinstance(right, int):
+            if left.bit_length() + right.bit_length() > self.max_bits:
+                raise ExpressionBudgetError("résultat trop grand")
+        return left, right
+
+    def _check(self, value):
+        """Valide un résultat intermédiaire"""
+        if isinstance(value, complex):
+            raise ExpressionError("résultat complexe non supporté")
+        if isinstance(value, int) and value.bit_length() > self.max_bits:
+            raise ExpressionBudgetError("résultat trop grand")
+        if isinstance(value, float) and not math.isfinite(value):
+            # Dépassement des flottants (1e308*10) : inf ou nan plutôt qu'une erreur
+            raise ExpressionBudgetError("résultat trop grand")
+        return value
+
+
+# Moteur partagé par MathAgent et NinaHybrid (cache de compilation commun)
+default_engine = ExpressionEngine()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+🎯 Intent Classifier - Classifieur bayésien naïf sur n-grammes hachés pour le routage des requêtes
+
+Entraînement (précision mesurée sur une part réservée du corpus : sur un corpus synthétique, elle reflète
+les gabarits de génération et non les requêtes réelles) :
+    cd src && python -m agents.intent_classifier requetes.jsonl ../data/intent.model --holdout 0.2
+
+Le corpus est un fichier JSONL ({"query": ..., "agent": ...}) ou TSV (requête<TAB>agent).
+"""
+
+import sys
+import json
+import math
+import zlib
+import random
+import struct
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .query_normalizer import tokenize
+
+# NumPy facultatif : score de tous les agents en une opération matricielle
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+MAGIC = b"NINAIC01"
+
+# magic, dimension des caractéristiques, nombre d'agents, longueur de l'en-tête JSON
+HEADER = struct.Struct("<8sIII")
+
+
+def _little_endian(values: array) -> array:
+    """Tableau au format du fichier (petit-boutiste)"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+@lru_cache(maxsize=4096)
+def extract_features(query: str, dim: int) -> Tuple[int, ...]:
+    """Indices hachés des mots, paires de mots et trigrammes de caractères de la requête canonique
+    (mémorisés : les requêtes fréquentes reviennent souvent)"""
+    tokens = tokenize(query)
+    features = [f"w:{token}" for token in tokens]
+    features.extend(f"b:{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    for token in tokens:
+        if len(token) > 3 and token.isalpha():
+            padded = f"<{token}>"
+            features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    # crc32 plutôt que hash() : indices identiques d'un processus à l'autre
+    return tuple(zlib.crc32(feature.encode()) % dim for feature in features)
+
+
+class IntentClassifier:
+    """Modèle chargé au démarrage : log-probabilités par (caractéristique, agent) et a priori par agent"""
+
+    def __init__(self, labels: List[str], dim: int, priors: array, weights: array, min_confidence: float = 0.6):
+        self.labels = list(labels)
+        self.dim = dim
+        self.min_confidence = min_confidence  # En dessous : routage par les heuristiques
+        self._priors = priors
+        self._weights = weights               # dim x agents, ligne par caractéristique
+        if NUMPY_AVAILABLE:
+            self._np_priors = np.frombuffer(priors, dtype=np.float32)
+            self._np_weights = np.frombuffer(weights, dtype=np.float32).reshape(dim, len(self.labels))
+
+    def scores(self, query: str) -> List[float]:
+        """Log-vraisemblance (non normalisée) de chaque agent"""
+        features = extract_features(query, self.dim)
+        if NUMPY_AVAILABLE:
+            return (self._np_priors + self._np_weights[list(features)].sum(axis=0)).tolist()
+
+        n_labels = len(self.labels)
+        scores = list(self._priors)
+        weights = self._weights
+        for feature in features:
+            base = feature * n_labels
+            for label in range(n_labels):
+                scores[label] += weights[base + label]
+        return scores
+
+    def scores_many(self, queries: List[str]):
+        """Scores d'un lot de requêtes (une ligne par requête) ; une seule accumulation avec NumPy"""
+        if not NUMPY_AVAILABLE:
+            return [self.scores(query) for query in queries]
+
+        rows, columns = [], []
+        for row, query in enumerate(queries):
+            features = extract_features(query, self.dim)
+            rows.extend([row] * len(features))
+            columns.extend(features)
+        scores = np.tile(self._np_priors.astype(np.float64), (len(queries), 1))
+        np.add.at(scores, np.asarray(rows, dtype=np.intp), self._np_weights[np.asarray(columns, dtype=np.intp)])
+        return scores.tolist()
+
+    def _best(self, scores: List[float]) -> Tuple[str, float]:
+        """Agent le plus probable et sa probabilité (softmax des log-vraisemblances)"""
+        best = max(range(len(scores)), key=scores.__getitem__)
+        top = scores[best]
+        total = sum(math.exp(score - top) for score in scores)
+        return self.labels[best], 1.0 / total
+
+    def predict(self, query: str) -> Tuple[str, float]:
+        """Retourne (agent, probabilité)"""
+        return self._best(self.scores(query))
+
+    def predict_many(self, queries: List[str]) -> List[Tuple[str, float]]:
+        """Version par lot de predict"""
+        return [self._best(scores) for scores in self.scores_many(queries)]
+
+    def save(self, path: Path):
+        """Écrit le modèle (en-tête, a priori puis poids en float32)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = json.dumps({"labels": self.labels, "min_confidence": self.min_confidence}).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.dim, len(self.labels), len(meta)))
+            f.write(meta)
+            _little_endian(self._priors).tofile(f)
+            _little_endian(self._weights).tofile(f)
+
+    @classmethod
+    def load(cls, path: Path) -> "IntentClassifier":
+        """Lit un modèle écrit par save"""
+        with open(path, "rb") as f:
+            magic, dim, n_labels, meta_length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"modèle d'intention invalide : {path}")
+            meta = json.loads(f.read(meta_length).decode("utf-8"))
+            priors = array("f")
+            priors.fromfile(f, n_labels)
+            weights = array("f")
+            weights.fromfile(f, dim * n_labels)
+        if sys.byteorder == "big":
+            priors.byteswap()
+            weights.byteswap()
+        return cls(meta["labels"], dim, priors, weights, meta.get("min_confidence", 0.6))
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+def train(examples: Iterable[Tuple[str, str]], dim: int = 1 << 14, alpha: float = 0.1,
+          min_confidence: float = 0.6) -> IntentClassifier:
+    """Entraîne un bayésien naïf multinomial (lissage de Laplace `alpha`) sur des paires (requête, agent)"""
+    counts: Dict[str, Dict[int, int]] = {}
+    documents: Dict[str, int] = {}
+    for query, label in examples:
+        documents[label] = documents.get(label, 0) + 1
+        label_counts = counts.setdefault(label, {})
+        for feature in extract_features(query, dim):
+            label_counts[feature] = label_counts.get(feature, 0) + 1
+    if not documents:
+        raise ValueError("corpus d'entraînement vide")
+
+    labels = sorted(documents)
+    n_labels = len(labels)
+    total_documents = sum(documents.values())
+    priors = array("f", (math.log(documents[label] / total_documents) for label in labels))
+    weights = array("f", bytes(4 * dim * n_labels))
+    for column, label in enumerate(labels):
+        label_counts = counts[label]
+        denominator = math.log(sum(label_counts.values()) + alpha * dim)
+        unseen = math.log(alpha) - denominator
+        for feature in range(dim):
+            weights[feature * n_labels + column] = unseen
+        for feature, count in label_counts.items():
+            weights[feature * n_labels + column] = math.log(count + alpha) - denominator
+    return IntentClassifier(labels, dim, priors, weights, min_confidence)
+
+
+def read_examples(path: Path) -> Iterator[Tuple[str, str]]:
+    """Lit un corpus de requêtes étiquetées (JSONL ou TSV)"""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            if path.suffix == ".jsonl":
+                entry = json.loads(line)
+                yield entry["query"], entry["agent"]
+            else:
+                query, label = line.rsplit("\t", 1)
+                yield query, label
+
+
+def accuracy(predictions: List[Optional[str]], examples: List[Tuple[str, str]]) -> float:
+    """Part des requêtes confiées au bon agent"""
+    correct = sum(1 for predicted, (_, label) in zip(predictions, examples) if predicted == label)
+    return correct / len(examples) if examples else 0.0
+
+
+def heuristic_predictions(queries: List[str]) -> List[Optional[str]]:
+    """Agents choisis par les heuristiques actuelles (index de routage et scores), sans le modèle"""
+    from .agent_manager import AgentManager
+    from .registry import AGENT_SPECS, FALLBACK_SPEC, LazyAgent
+
+    manager = AgentManager(agents=[LazyAgent(spec) for spec in AGENT_SPECS])
+    predictions = []
+    for query in queries:
+        agent = manager.find_best_agent(query)
+        # Aucun candidat : la requête irait à l'agent de repli
+        predictions.append(agent.name if agent is not None else FALLBACK_SPEC.class_name)
+    return predictions
+
+
+def main():
+    """Entraîne et évalue : python -m agents.intent_classifier corpus.jsonl sortie.model"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Entraîne le modèle de routage de l'AgentManager")
+    parser.add_argument("corpus", type=Path, help="Requêtes étiquetées par agent (JSONL ou TSV)")
+    parser.add_argument("output", type=Path, help="Modèle de sortie")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Part du corpus réservée à l'évaluation")
+    parser.add_argument("--dim", type=int, default=1 << 14, help="Nombre de caractéristiques hachées")
+    parser.add_argument("--alpha", type=float, default=0.1, help="Lissage de Laplace")
+    parser.add_argument("--min-confidence", type=float, default=0.6,
+                        help="Probabilité minimale pour suivre le modèle plutôt que les heuristiques")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du découpage entraînement/évaluation")
+    args = parser.parse_args()
+
+    examples = list(read_examples(args.corpus))
+    random.Random(args.seed).shuffle(examples)
+    held_out = int(len(examples) * args.holdout)
+    evaluation, training = examples[:held_out], examples[held_out:]
+
+    start = time.time()
+    classifier = train(training, dim=args.dim, alpha=args.alpha, min_confidence=args.min_confidence)
+    print(f"✅ {len(training)} requêtes, {len(classifier)} agents, entraîné en {time.time() - start:.1f}s")
+
+    if evaluation:
+        queries = [query for query, _ in evaluation]
+        predicted = [label for label, _ in classifier.predict_many(queries)]
+        heuristics = heuristic_predictions(queries)
+        # Routage réel : modèle au-dessus du seuil, heuristiques sinon
+        combined = [label if confidence >= classifier.min_confidence else heuristic
+                    for (label, confidence), heuristic in zip(classifier.predict_many(queries), heuristics)]
+        print(f"🎯 Précision sur {len(evaluation)} requêtes réservées :")
+        print(f"   modèle seul         {accuracy(predicted, evaluation) * 100:5.1f}%")
+        print(f"   heuristiques seules {accuracy(heuristics, evaluation) * 100:5.1f}%")
+        print(f"   modèle + repli      {accuracy(combined, evaluation) * 100:5.1f}%")
+
+        # Entraînement final sur tout le corpus
+        classifier = train(examples, dim=args.dim, alpha=args.alpha, min_confidence=args.min_confidence)
+
+    classifier.save(args.output)
+    size = args.output.stat().st_size / 1024
+    print(f"💾 Modèle écrit : {args.output} ({size:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
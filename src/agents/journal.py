@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+📼 Query Journal - Journal binaire des requêtes (routage, cache, latence) écrit hors du chemin des requêtes
+
+Lecture :
+    cd src && python -m agents.journal ../cache/journal --summary
+
+Fichier : magic puis blocs [longueur, drapeaux, nombre d'enregistrements] + lignes JSON (zlib facultatif).
+"""
+
+import os
+import json
+import time
+import zlib
+import atexit
+import struct
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .config import CONFIG_FILE, PROJECT_ROOT, load_section
+
+MAGIC = b"NINAJR01"
+
+# longueur du bloc, drapeaux, nombre d'enregistrements
+FRAME = struct.Struct("<IBI")
+COMPRESSED = 0x01
+
+DEFAULT_SETTINGS = {
+    "enabled": False,        # Journal désactivé par défaut (opt-in)
+    "path": "cache/journal", # Dossier des journaux, un fichier par processus
+    "max_mb": 16,            # Taille d'un fichier avant rotation
+    "backups": 5,            # Fichiers tournés conservés par processus
+    "compress": True,        # Blocs compressés par zlib
+}
+
+
+def load_journal_settings(config_path: Path = CONFIG_FILE) -> Dict:
+    """Paramètres du journal : section "journal" de la configuration"""
+    return load_section("journal", DEFAULT_SETTINGS, config_path)
+
+
+class QueryJournal:
+    """Journal en ajout seul : record() dépose l'enregistrement dans une file sans verrou, un thread l'écrit par blocs"""
+
+    def __init__(self, directory: Path, prefix: str = "queries", max_bytes: int = 16 * 1024 * 1024,
+                 backups: int = 5, compress: bool = True, max_pending: int = 10000, batch_size: int = 256,
+                 flush_interval: float = 0.5):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.compress = compress
+        self.batch_size = batch_size          # Enregistrements au plus par bloc
+        self.flush_interval = flush_interval  # Attente maximale avant l'écriture d'un bloc incomplet
+        self.max_pending = max_pending
+        self._pending = deque()               # append/popleft atomiques : pas de verrou sur le chemin des requêtes
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._writer = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()   # Fichier écrit par le thread d'écriture ou par flush()
+        self._file = None
+        self._size = 0
+        self.stats = {"records": 0, "blocks": 0, "bytes": 0, "dropped": 0, "rotations": 0}
+
+    @property
+    def path(self) -> Path:
+        """Fichier courant de ce processus (les workers préforkés n'écrivent jamais dans le même)"""
+        return self.directory / f"{self.prefix}-{os.getpid()}.njr"
+
+    def record(self, entry: Dict):
+        """Ajoute un enregistrement sans bloquer (abandonné et compté si la file est pleine)"""
+        if self._pid != os.getpid():
+            self._start()
+        entry.setdefault("ts", time.time())
+        pending = self._pending
+        if len(pending) >= self.max_pending:
+            self.stats["dropped"] += 1
+            return
+        pending.append(entry)
+        # Réveil anticipé quand un bloc complet attend (sinon écriture toutes les flush_interval)
+        if len(pending) == self.batch_size:
+            self._wake.set()
+
+    def _start(self):
+        """Lance le thread d'écriture (une fois par processus : après un fork, le thread du parent n'existe plus)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._pending = deque()
+            self._wake = threading.Event()
+            self._stop = threading.Event()
+            self._file = None
+            self._writer = threading.Thread(target=self._run, args=(self._pending, self._wake, self._stop),
+                                            name="nina-journal", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    def _run(self, pending: deque, wake: threading.Event, stop: threading.Event):
+        """Boucle du thread d'écriture : vide la file par blocs de batch_size enregistrements"""
+        while True:
+            wake.wait(self.flush_interval)
+            wake.clear()
+            stopping = stop.is_set()
+
+            with self._write_lock:
+                self._drain(pending)
+                if stopping:
+                    if self._file is not None:
+                        self._file.close()
+                        self._file = None
+                    return
+
+    def _drain(self, pending: deque):
+        """Écrit la file par blocs de batch_size enregistrements (verrou d'écriture pris)"""
+        while pending:
+            batch = []
+            while pending and len(batch) < self.batch_size:
+                batch.append(pending.popleft())
+            try:
+                self._write_block(batch)
+            except (OSError, ValueError, TypeError) as e:
+                self.stats["dropped"] += len(batch)
+                print(f"⚠️ Journal : {len(batch)} enregistrements perdus ({e})")
+
+    def flush(self):
+        """Écrit aussitôt les enregistrements en attente, sans arrêter le thread d'écriture"""
+        if self._pid != os.getpid():
+            return
+        with self._write_lock:
+            self._drain(self._pending)
+
+    def _write_block(self, batch: List[Dict]):
+        """Écrit un bloc (rotation d'abord si le fichier dépasserait sa taille maximale)"""
+        payload = b"\n".join(
+            json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+            for entry in batch
+        )
+        flags = 0
+        if self.compress:
+            compressed = zlib.compress(payload, 1)
+            if len(compressed) < len(payload):
+                payload, flags = compressed, COMPRESSED
+        frame = FRAME.pack(len(payload), flags, len(batch)) + payload
+
+        if self._file is None:
+            self._open()
+        elif self._size + len(frame) > self.max_bytes and self._size > len(MAGIC):
+            self._rotate()
+        self._file.write(frame)
+        self._file.flush()  # Visible par les lecteurs, sans fsync
+        self._size += len(frame)
+
+        self.stats["records"] += len(batch)
+        self.stats["blocks"] += 1
+        self.stats["bytes"] += len(frame)
+
+    def _open(self):
+        """Ouvre le fichier courant en ajout (en-tête écrit s'il est neuf)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        if self._size == 0:
+            self._file.write(MAGIC)
+            self._size = len(MAGIC)
+
+    def _rotate(self):
+        """Décale les fichiers tournés (.1 -> .2 ...) et repart d'un fichier vide"""
+        self._file.close()
+        path = self.path
+        if self.backups > 0:
+            for index in range(self.backups - 1, 0, -1):
+                older = path.with_name(f"{path.name}.{index}")
+                if older.exists():
+                    older.replace(path.with_name(f"{path.name}.{index + 1}"))
+            path.replace(path.with_name(f"{path.name}.1"))
+        else:
+            path.unlink()
+        self.stats["rotations"] += 1
+        self._open()
+
+    def close(self, timeout: float = 2.0):
+        """Écrit les enregistrements en attente et arrête le thread d'écriture de ce processus"""
+        with self._lock:
+            writer = self._writer if self._pid == os.getpid() else None
+            wake, stop = self._wake, self._stop
+            self._writer = None
+            self._pid = None
+        if writer is None or not writer.is_alive():
+            return
+        stop.set()
+        wake.set()
+        writer.join(timeout)
+
+    def get_stats(self) -> Dict:
+        """Compteurs d'écriture et taille de la file d'attente"""
+        stats = dict(self.stats)
+        stats["pending"] = len(self._pending)
+        return stats
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal() -> Optional[QueryJournal]:
+    """Journal du processus selon la configuration (None s'il est désactivé), partagé par tous les appelants"""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            settings = load_journal_settings()
+            if not settings["enabled"]:
+                _journal = False
+            else:
+                _journal = QueryJournal(PROJECT_ROOT / settings["path"],
+                                        max_bytes=int(settings["max_mb"] * 1024 * 1024),
+                                        backups=settings["backups"], compress=settings["compress"])
+        return _journal or None
+
+
+def read_journal(path: Path) -> Iterator[Dict]:
+    """Enregistrements d'un fichier, bloc par bloc (un bloc tronqué en fin de fichier est ignoré)"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"journal invalide : {path}")
+        while True:
+            header = f.read(FRAME.size)
+            if len(header) < FRAME.size:
+                return
+            length, flags, _ = FRAME.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return  # Écriture interrompue
+            if flags & COMPRESSED:
+                payload = zlib.decompress(payload)
+            for line in payload.split(b"\n"):
+                yield json.loads(line)
+
+
+def journal_files(directory: Path, prefix: str = "queries") -> List[Path]:
+    """Fichiers d'un dossier de journaux, du plus ancien au plus récent"""
+    files = [path for path in Path(directory).glob(f"{prefix}-*.njr*") if path.is_file()]
+    return sorted(files, key=lambda path: path.stat().st_mtime)
+
+
+def iter_journal(directory: Path, prefix: str = "queries") -> Iterator[Dict]:
+    """Enregistrements de tous les fichiers d'un dossier, sans les charger en entier"""
+    for path in journal_files(directory, prefix):
+        yield from read_journal(path)
+
+
+def main():
+    """Lit un dossier (ou fichier) de journal : python -m agents.journal ../cache/journal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Lit le journal des requêtes de Nina")
+    parser.add_argument("path", type=Path, help="Dossier des journaux ou fichier .njr")
+    parser.add_argument("--summary", action="store_true", help="Résumé par agent au lieu des enregistrements")
+    args = parser.parse_args()
+
+    records = read_journal(args.path) if args.path.is_file() else iter_journal(args.path)
+    if not args.summary:
+        for entry in records:
+            print(json.dumps(entry, ensure_ascii=False))
+        return
+
+    agents = {}
+    for entry in records:
+        agent = agents.setdefault((entry.get("src"), entry.get("agent")), {"requests": 0, "cached": 0, "ms": []})
+        agent["requests"] += 1
+        agent["cached"] += bool(entry.get("cached"))
+        agent["ms"].append(entry.get("ms", 0.0))
+
+    for (source, name), agent in sorted(agents.items(), key=lambda item: -item[1]["requests"]):
+        latencies = sorted(agent["ms"])
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{source}/{name}: {agent['requests']} requêtes | cache {agent['cached'] / agent['requests'] * 100:.1f}% | "
+              f"p50 {p50:.2f}ms | p99 {p99:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,60 +3,85 @@
 🧠 Knowledge Agent - Agent spécialisé en connaissances générales
 """
 
-import requests
-import json
+from pathlib import Path
 from .base_agent import BaseAgent
+from .query_normalizer import canonicalize
+
+# Pack BM25 compilé hors ligne (python -m agents.knowledge_index), chargé s'il existe
+KNOWLEDGE_PACK = Path(__file__).parent.parent.parent / "data" / "knowledge.pack"
 
 class KnowledgeAgent(BaseAgent):
     """Agent spécialisé en connaissances générales et questions complexes"""
     
-    def __init__(self):
+    # Base de connaissances rapides
+    knowledge_base = {
+        "pourquoi le ciel est bleu": "Le ciel est bleu à cause de la diffusion de Rayleigh. Les molécules d'air diffusent plus la lumière bleue que les autres couleurs.",
+        "qu'est-ce que l'ia": "L'Intelligence Artificielle (IA) est une technologie qui permet aux machines de simuler l'intelligence humaine.",
+        "comment fonctionne internet": "Internet fonctionne grâce à un réseau mondial d'ordinateurs connectés qui échangent des données via des protocoles comme TCP/IP.",
+        "qu'est-ce que python": "Python est un langage de programmation interprété, orienté objet, avec une syntaxe claire et lisible.",
+        "qu'est-ce que linux": "Linux est un système d'exploitation open-source basé sur Unix, très utilisé pour les serveurs et le développement.",
+        "comment marche un ordinateur": "Un ordinateur traite l'information via le CPU, stocke les données en mémoire (RAM/disque), et utilise des périphériques pour l'entrée/sortie.",
+    }
+    
+    # Catégories de questions
+    categories = {
+        "science": ["pourquoi", "comment", "qu'est-ce que", "expliquer"],
+        "technologie": ["ordinateur", "internet", "logiciel", "programmation", "ia", "intelligence artificielle"],
+        "général": ["qui", "quoi", "où", "quand", "combien"]
+    }
+    
+    # Mots-clés de questions puis domaines de connaissance (déclarés sans instancier l'agent)
+    routing_keywords = ("pourquoi", "comment", "qu'est-ce", "expliquer", "définir", "qui est", "que signifie") + tuple(
+        keyword for keywords in categories.values() for keyword in keywords
+    )
+    
+    # Bonus pour questions complexes
+    routing_bonus_keywords = ('pourquoi', 'comment', "qu'est-ce")
+    routing_bonus = 0.8
+    
+    # Confiance minimale d'une réponse trouvée dans le pack
+    min_index_confidence = 0.5
+    
+    def __init__(self, index_path: Path = None):
         super().__init__("KnowledgeAgent", "Connaissances générales")
         
-        # Base de connaissances rapides
-        self.knowledge_base = {
-            "pourquoi le ciel est bleu": "Le ciel est bleu à cause de la diffusion de Rayleigh. Les molécules d'air diffusent plus la lumière bleue que les autres couleurs.",
-            "qu'est-ce que l'ia": "L'Intelligence Artificielle (IA) est une technologie qui permet aux machines de simuler l'intelligence humaine.",
-            "comment fonctionne internet": "Internet fonctionne grâce à un réseau mondial d'ordinateurs connectés qui échangent des données via des protocoles comme TCP/IP.",
-            "qu'est-ce que python": "Python est un langage de programmation interprété, orienté objet, avec une syntaxe claire et lisible.",
-            "qu'est-ce que linux": "Linux est un système d'exploitation open-source basé sur Unix, très utilisé pour les serveurs et le développement.",
-            "comment marche un ordinateur": "Un ordinateur traite l'information via le CPU, stocke les données en mémoire (RAM/disque), et utilise des périphériques pour l'entrée/sortie.",
-        }
-        
-        # Catégories de questions
-        self.categories = {
-            "science": ["pourquoi", "comment", "qu'est-ce que", "expliquer"],
-            "technologie": ["ordinateur", "internet", "logiciel", "programmation", "ia", "intelligence artificielle"],
-            "général": ["qui", "quoi", "où", "quand", "combien"]
-        }
-    
-    def can_handle(self, query: str) -> bool:
-        """Détermine si cette requête nécessite des connaissances générales"""
-        query_clean = query.lower().strip()
-        
-        # Vérifier la base de connaissances
-        if query_clean in self.knowledge_base:
-            return True
+        # Index BM25 en mmap : ouverture en temps constant quelle que soit la taille du corpus
+        self.index = None
+        index_path = Path(index_path) if index_path else KNOWLEDGE_PACK
+        if index_path.exists():
+            from .knowledge_index import KnowledgeIndex
+            try:
+                self.index = KnowledgeIndex(index_path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Pack de connaissances ignoré : {e}")
         
-        # Vérifier les mots-clés de questions
-        question_words = ["pourquoi", "comment", "qu'est-ce", "expliquer", "définir", "qui est", "que signifie"]
-        if any(word in query_clean for word in question_words):
-            return True
+        # Recherche dans un grand pack : calcul Python qui garde le GIL, à confier au pool de processus
+        self.cpu_bound = self.index is not None
         
-        # Vérifier les domaines de connaissance
-        for category, keywords in self.categories.items():
-            if any(keyword in query_clean for keyword in keywords):
-                return True
-        
-        return False
+        # Base indexée par forme canonique ("Pourquoi le ciel est-il bleu ?" trouve sa réponse)
+        self._canonical_knowledge = {canonicalize(question): answer for question, answer in self.knowledge_base.items()}
+    
+    @classmethod
+    def routing_exact_queries(cls):
+        """Questions de la base de connaissances reconnues telles quelles"""
+        return cls.knowledge_base
     
     def process(self, query: str) -> str:
         """Traite les requêtes de connaissances"""
         query_clean = query.lower().strip()
         
         # Réponses rapides de la base de connaissances
-        if query_clean in self.knowledge_base:
-            return f"📚 {self.knowledge_base[query_clean]}"
+        answer = self._canonical_knowledge.get(canonicalize(query))
+        if answer is not None:
+            return f"📚 {answer}"
+        
+        # Meilleure réponse du pack BM25, si la correspondance est suffisante
+        if self.index is not None:
+            hits = self.index.search(query, k=1)
+            if hits and hits[0][1] >= self.min_index_confidence:
+                _, confidence, _, answer = hits[0]
+                self.report_confidence(confidence)
+                return f"📚 {answer}"
         
         # Analyse du type de question
         if "pourquoi" in query_clean:
@@ -115,7 +140,19 @@ class KnowledgeAgent(BaseAgent):
         """Fournit des conseils généraux"""
         return f"🎯 Question intéressante : '{query}'. Je peux vous aider avec des connaissances générales, sciences, et technologie !"
     
+    async def aprocess(self, query: str) -> str:
+        """Version asynchrone : traitement en mémoire, inutile de passer par un thread
+        (sauf avec un pack, dont la lecture peut déclencher des accès disque)"""
+        if self.index is not None:
+            return await super().aprocess(query)
+        return self.process(query)
+    
     def search_external_knowledge(self, query: str) -> str:
         """Recherche des connaissances externes (pour future intégration API)"""
         # Placeholder pour intégration future avec APIs de recherche
+        return f"🔍 Recherche externe pour : {query} (à implémenter avec APIs)"
+    
+    async def asearch_external_knowledge(self, query: str) -> str:
+        """Recherche externe asynchrone (à brancher sur un client HTTP asynchrone)"""
+        # Placeholder : une vraie intégration attendra ici la réponse de l'API sans bloquer la boucle
         return f"🔍 Recherche externe pour : {query} (à implémenter avec APIs)" 
\ No newline at end of file
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+📖 Knowledge Index - Index inversé BM25 compilé hors ligne et lu par mmap
+
+Construction :
+    cd src && python -m agents.knowledge_index corpus.jsonl ../data/knowledge.pack
+
+Le corpus est un fichier JSONL ({"question": ..., "answer": ...}) ou TSV (question<TAB>réponse).
+"""
+
+import os
+import sys
+import json
+import math
+import mmap
+import heapq
+import shutil
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .query_normalizer import tokenize
+
+MAGIC = b"NINAKB01"
+
+# magic, version, documents, termes, longueur moyenne, puis offsets des sections
+HEADER = struct.Struct("<8sIIId5Q")
+# offset du terme, longueur, fréquence documentaire, offset des postings, impact maximal
+TERM_ENTRY = struct.Struct("<QHIQf")
+# offset du document, longueur de la question, longueur de la réponse
+DOC_ENTRY = struct.Struct("<QII")
+
+
+def index_terms(text: str) -> List[str]:
+    """Termes indexés : jetons canoniques alphanumériques (opérateurs exclus)"""
+    return [token for token in tokenize(text) if token[0].isalnum()]
+
+
+def _little_endian(values: array) -> array:
+    """Tableau au format du fichier (petit-boutiste)"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def read_corpus(path: Path) -> Iterator[Tuple[str, str]]:
+    """Lit un corpus de questions/réponses (JSONL ou TSV)"""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            if path.suffix == ".jsonl":
+                entry = json.loads(line)
+                yield entry["question"], entry["answer"]
+            else:
+                question, answer = line.split("\t", 1)
+                yield question, answer
+
+
+def build_pack(entries: Iterable[Tuple[str, str]], path: Path, k1: float = 1.2, b: float = 0.75) -> int:
+    """Compile les paires (question, réponse) en un pack BM25 ; retourne le nombre de documents"""
+    path = Path(path)
+    postings = {}  # terme -> (documents, fréquences)
+    doc_lengths = array("I")
+    doc_table = bytearray()
+
+    with tempfile.TemporaryFile() as doc_blob:
+        # Passe 1 : documents écrits au fil de l'eau, fréquences par terme
+        offset = 0
+        for doc_id, (question, answer) in enumerate(entries):
+            question_bytes, answer_bytes = question.encode("utf-8"), answer.encode("utf-8")
+            doc_table += DOC_ENTRY.pack(offset, len(question_bytes), len(answer_bytes))
+            doc_blob.write(question_bytes)
+            doc_blob.write(answer_bytes)
+            offset += len(question_bytes) + len(answer_bytes)
+
+            terms = index_terms(f"{question} {answer}")
+            doc_lengths.append(len(terms))
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = (array("I"), array("H"))
+                entry[0].append(doc_id)
+                entry[1].append(min(tf, 0xFFFF))
+
+        n_docs = len(doc_lengths)
+        avgdl = sum(doc_lengths) / n_docs if n_docs else 0.0
+
+        # Passe 2 : impacts BM25 précalculés, postings triés par impact décroissant
+        term_table = bytearray()
+        term_blob = bytearray()
+        postings_blob = bytearray()
+        for term in sorted(postings, key=lambda t: t.encode("utf-8")):
+            docs, tfs = postings[term]
+            df = len(docs)
+            idf = _idf(n_docs, df)
+            impacts = []
+            for doc_id, tf in zip(docs, tfs):
+                norm = k1 * (1 - b + b * doc_lengths[doc_id] / avgdl)
+                impacts.append((idf * tf * (k1 + 1) / (tf + norm), doc_id))
+            impacts.sort(key=lambda item: (-item[0], item[1]))
+
+            term_bytes = term.encode("utf-8")
+            term_table += TERM_ENTRY.pack(len(term_blob), len(term_bytes), df, len(postings_blob), impacts[0][0])
+            term_blob += term_bytes
+            postings_blob += _little_endian(array("I", [doc_id for _, doc_id in impacts])).tobytes()
+            postings_blob += _little_endian(array("f", [impact for impact, _ in impacts])).tobytes()
+        postings.clear()
+
+        # Assemblage : en-tête, termes, postings, table des documents, documents
+        off_term_table = HEADER.size
+        off_term_blob = off_term_table + len(term_table)
+        off_postings = off_term_blob + len(term_blob)
+        off_doc_table = off_postings + len(postings_blob)
+        off_doc_blob = off_doc_table + len(doc_table)
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, 1, n_docs, len(term_table) // TERM_ENTRY.size, avgdl,
+                                off_term_table, off_term_blob, off_postings, off_doc_table, off_doc_blob))
+            f.write(term_table)
+            f.write(term_blob)
+            f.write(postings_blob)
+            f.write(doc_table)
+            doc_blob.seek(0)
+            shutil.copyfileobj(doc_blob, f)
+        os.replace(tmp_path, path)
+
+    return n_docs
+
+
+def _idf(n_docs: int, df: int) -> float:
+    """IDF BM25 (toujours positive)"""
+    return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+
+class KnowledgeIndex:
+    """Lecteur d'un pack BM25 : ouverture en temps constant (mmap), recherche top-k"""
+
+    def __init__(self, path: Path, max_postings: int = 2048, weak_term_ratio: float = 0.3):
+        self.path = Path(path)
+        self.max_postings = max_postings  # Postings lus par terme (les plus forts impacts d'abord)
+        self.weak_term_ratio = weak_term_ratio
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.n_docs, self.n_terms, self.avgdl, self._off_term_table, self._off_term_blob,
+         self._off_postings, self._off_doc_table, self._off_doc_blob) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != 1:
+            self._mm.close()
+            raise ValueError(f"pack de connaissances invalide : {self.path}")
+
+    def _term_entry(self, index: int) -> Tuple[int, int, int, int, float]:
+        return TERM_ENTRY.unpack_from(self._mm, self._off_term_table + index * TERM_ENTRY.size)
+
+    def _term_bytes(self, entry) -> bytes:
+        start = self._off_term_blob + entry[0]
+        return self._mm[start:start + entry[1]]
+
+    def _find_term(self, term: str) -> Optional[Tuple[int, int, int, int, float]]:
+        """Recherche dichotomique du terme dans la table triée"""
+        target = term.encode("utf-8")
+        low, high = 0, self.n_terms
+        while low < high:
+            middle = (low + high) // 2
+            entry = self._term_entry(middle)
+            current = self._term_bytes(entry)
+            if current == target:
+                return entry
+            if current < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _postings(self, entry, limit: int) -> Tuple[array, array]:
+        """Documents et impacts d'un terme (les `limit` plus forts)"""
+        df = entry[2]
+        count = min(df, limit)
+        start = self._off_postings + entry[3]
+        docs, impacts = array("I"), array("f")
+        docs.frombytes(self._mm[start:start + 4 * count])
+        impacts.frombytes(self._mm[start + 4 * df:start + 4 * df + 4 * count])
+        if sys.byteorder == "big":
+            docs.byteswap()
+            impacts.byteswap()
+        return docs, impacts
+
+    def document(self, doc_id: int) -> Tuple[str, str]:
+        """Question et réponse d'un document"""
+        offset, question_length, answer_length = DOC_ENTRY.unpack_from(
+            self._mm, self._off_doc_table + doc_id * DOC_ENTRY.size
+        )
+        start = self._off_doc_blob + offset
+        question = self._mm[start:start + question_length].decode("utf-8")
+        answer = self._mm[start + question_length:start + question_length + answer_length].decode("utf-8")
+        return question, answer
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[float, float, str, str]]:
+        """Top-k (score, confiance, question, réponse) ; la confiance est le score rapporté au maximum atteignable,
+        pondéré par la part des termes de la requête présents dans l'index"""
+        terms = set(index_terms(query))
+        entries = [entry for entry in map(self._find_term, terms) if entry is not None]
+        if not entries:
+            return []
+        best_possible = sum(entry[4] for entry in entries) * len(terms) / len(entries)
+        strongest = max(entry[4] for entry in entries)
+
+        scores = {}
+        for entry in entries:
+            # Termes très fréquents (impact faible) : seuls leurs meilleurs postings sont lus
+            limit = self.max_postings if entry[4] >= self.weak_term_ratio * strongest else self.max_postings // 8
+            docs, impacts = self._postings(entry, limit)
+            get = scores.get
+            for doc_id, impact in zip(docs, impacts):
+                scores[doc_id] = get(doc_id, 0.0) + impact
+
+        if not scores:
+            return []
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(score, min(1.0, score / best_possible), *self.document(doc_id)) for doc_id, score in top]
+
+    def close(self):
+        """Libère le mappage mémoire"""
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+
+def main():
+    """Compile un corpus en pack : python -m agents.knowledge_index corpus.jsonl sortie.pack"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Construit le pack BM25 de KnowledgeAgent")
+    parser.add_argument("corpus", type=Path, help="Questions/réponses (JSONL ou TSV)")
+    parser.add_argument("output", type=Path, help="Pack de sortie")
+    args = parser.parse_args()
+
+    start = time.time()
+    count = build_pack(read_corpus(args.corpus), args.output)
+    size = args.output.stat().st_size / 1024 / 1024
+    print(f"✅ {count} documents indexés en {time.time() - start:.1f}s ({size:.1f} MB) : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
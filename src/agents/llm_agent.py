@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+🦙 LLM Agent - Agent généraliste adossé à un modèle local Ollama
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .base_agent import BaseAgent
+from .config import CONFIG_FILE, load_section
+from .response_cache import FreshnessPolicy
+from .deadline import remaining_time, check_deadline
+
+DEFAULT_SETTINGS = {
+    "enabled": True,
+    "host": "http://localhost:11434",
+    "model": "llama3.2:3b",
+    "keep_alive": "30m",
+    "pool_size": 4,
+    "connect_timeout": 2.0,
+    "timeout": 15,
+    "max_tokens": 2000,
+    "temperature": 0.7,
+}
+
+SYSTEM_PROMPT = (
+    "Tu es Nina, une assistante IA française, utile et concise. "
+    "Réponds en français. Si tu ne sais pas, dis-le honnêtement."
+)
+
+
+def load_llm_settings(config_path: Path = CONFIG_FILE) -> Dict:
+    """Paramètres du modèle : section "ollama" et délais de "ai_settings" de la configuration"""
+    limits = load_section("ai_settings", {key: DEFAULT_SETTINGS[key] for key in ("timeout", "max_tokens", "temperature")},
+                          config_path)
+    # "ollama" l'emporte sur "ai_settings" pour une même clé
+    return load_section("ollama", dict(DEFAULT_SETTINGS, **limits), config_path)
+
+
+class LLMAgent(BaseAgent):
+    """Agent de repli : répond aux requêtes qu'aucun agent spécialisé ne prend en charge"""
+
+    # Réponses non déterministes : réutilisables un temps, pas indéfiniment
+    freshness = FreshnessPolicy.time_to_live(ttl=3600.0)
+
+    # Génération coûteuse : une reformulation proche réutilise la réponse déjà produite
+    near_duplicate_threshold = 0.8
+
+    # Délai avant de retenter un serveur injoignable
+    retry_after = 30.0
+
+    def __init__(self, host: str = DEFAULT_SETTINGS["host"], model: str = DEFAULT_SETTINGS["model"],
+                 timeout: float = DEFAULT_SETTINGS["timeout"], connect_timeout: float = DEFAULT_SETTINGS["connect_timeout"],
+                 max_tokens: int = DEFAULT_SETTINGS["max_tokens"], temperature: float = DEFAULT_SETTINGS["temperature"],
+                 pool_size: int = DEFAULT_SETTINGS["pool_size"], keep_alive: str = DEFAULT_SETTINGS["keep_alive"]):
+        super().__init__("LLMAgent", f"Modèle local {model}")
+        self.host = host.rstrip("/")
+        self.model = model
+        self.timeout = (connect_timeout, timeout)
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+
+        self.warm_up_time = None
+        self._available = None  # None : pas encore vérifié
+        self._unavailable_since = 0.0
+        self._warm_up_thread = None
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config_path: Path = CONFIG_FILE) -> Optional["LLMAgent"]:
+        """Crée l'agent depuis la configuration (None si désactivé)"""
+        settings = load_llm_settings(config_path)
+        if not settings.pop("enabled"):
+            return None
+        return cls(**settings)
+
+    def _get_session(self):
+        """Session HTTP keep-alive propre au processus (pool de connexions borné)"""
+        # requests n'est importé qu'au premier appel au modèle (démarrage plus rapide)
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        with self._session_lock:
+            # Après un fork, ne pas partager les sockets du parent
+            if self._session is None or self._session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size,
+                                      pool_block=True, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+                self._session_pid = os.getpid()
+            return self._session
+
+    def is_available(self) -> bool:
+        """Indique si le serveur Ollama peut être sollicité"""
+        if self._available is False and time.monotonic() - self._unavailable_since >= self.retry_after:
+            self._available = None
+        return self._available is not False
+
+    def _mark_unavailable(self, error: Exception):
+        """Écarte l'agent du routage pendant retry_after secondes"""
+        if self._available is not False:
+            print(f"⚠️ Ollama indisponible ({self.host}) : {error}")
+        self._available = False
+        self._unavailable_since = time.monotonic()
+
+    def list_models(self) -> List[str]:
+        """Modèles installés sur le serveur Ollama (/api/tags)"""
+        response = self._get_session().get(f"{self.host}/api/tags", timeout=self.timeout)
+        response.raise_for_status()
+        return [model["name"] for model in response.json().get("models", [])]
+
+    def warm_up(self) -> bool:
+        """Charge le modèle en mémoire (requête vide) pour que la première question ne paie pas le chargement"""
+        import requests
+        
+        start_ns = time.perf_counter_ns()
+        try:
+            # Modèle absent : écarté tout de suite plutôt qu'à chaque question
+            models = self.list_models()
+            if self.model not in models and f"{self.model}:latest" not in models:
+                self._mark_unavailable(RuntimeError(f"modèle {self.model} non installé (ollama pull {self.model})"))
+                return False
+            response = self._get_session().post(
+                f"{self.host}/api/generate",
+                json={"model": self.model, "prompt": "", "keep_alive": self.keep_alive, "stream": False},
+                timeout=(self.timeout[0], max(self.timeout[1], 120)),
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self._mark_unavailable(e)
+            return False
+
+        self.warm_up_time = (time.perf_counter_ns() - start_ns) / 1e6
+        self._available = True
+        return True
+
+    def start_warm_up(self) -> threading.Thread:
+        """Lance le préchargement du modèle en arrière-plan"""
+        if self._warm_up_thread is None or not self._warm_up_thread.is_alive():
+            self._warm_up_thread = threading.Thread(target=self.warm_up, name="nina-llm-warm-up", daemon=True)
+            self._warm_up_thread.start()
+        return self._warm_up_thread
+
+    def _payload(self, query: str, stream: bool) -> Dict:
+        """Corps d'une requête /api/generate"""
+        return {
+            "model": self.model,
+            "prompt": query,
+            "system": SYSTEM_PROMPT,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": {"temperature": self.temperature, "num_predict": self.max_tokens},
+        }
+
+    def _post(self, query: str, stream: bool):
+        """Envoie la requête au modèle (les erreurs remontent : une panne n'est jamais mise en cache)"""
+        import requests
+        
+        try:
+            # Délai de lecture borné par le budget restant de la requête
+            response = self._get_session().post(
+                f"{self.host}/api/generate", json=self._payload(query, stream),
+                timeout=(self.timeout[0], max(0.01, remaining_time(self.timeout[1]))), stream=stream
+            )
+            response.raise_for_status()
+        except requests.ConnectionError as e:
+            self._mark_unavailable(e)
+            raise
+        self._available = True
+        return response
+
+    def process(self, query: str) -> str:
+        """Génère une réponse complète"""
+        return self._post(query, stream=False).json().get("response", "").strip()
+
+    def process_stream(self, query: str):
+        """Génère la réponse morceau par morceau (lignes JSON d'Ollama)"""
+        with self._post(query, stream=True) as response:
+            for line in response.iter_lines():
+                check_deadline()  # Génération abandonnée : fermer le flux sans attendre la fin
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise RuntimeError(data["error"])
+                if data.get("response"):
+                    yield data["response"]
+                if data.get("done"):
+                    return
+
+    def get_status(self) -> dict:
+        """Statut de l'agent, avec l'état du modèle"""
+        status = super().get_status()
+        status["model"] = self.model
+        status["available"] = self._available
+        status["warm_up_time"] = self.warm_up_time
+        return status
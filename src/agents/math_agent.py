@@ -3,57 +3,54 @@
 🔢 Math Agent - Agent spécialisé en mathématiques et calculs
 """
 
-import re
 import math
 from typing import Optional
 from .base_agent import BaseAgent
+from .expression import default_engine, ExpressionError, ExpressionBudgetError
 
 class MathAgent(BaseAgent):
     """Agent spécialisé en mathématiques et calculs"""
     
+    # Patterns mathématiques
+    routing_patterns = (
+        r'\d+\s*[\+\-\*\/]\s*\d+',          # Opérations simples
+        r'\d+\s*(?:\*\*|\^)\s*\d+',           # Puissance
+        r'\b(?:sqrt|pow|sin|cos|tan)\s*\(',   # Fonctions (arguments quelconques)
+    )
+    
+    # Mots-clés mathématiques
+    routing_keywords = (
+        'calcul', 'calculer', 'combien', 'résultat', 'somme', 
+        'produit', 'différence', 'quotient', 'racine', 'puissance',
+        'sinus', 'cosinus', 'tangente', 'logarithme'
+    )
+    
+    # Bonus pour requêtes mathématiques évidentes
+    routing_bonus_keywords = ('+', '-', '*', '/', '=', 'calcul')
+    routing_bonus = 1.0
+    
+    # Évaluations potentiellement longues (puissances, fonctions) : hors du GIL si un pool existe
+    cpu_bound = True
+    
+    # Réponses rapides pour calculs courants
+    quick_math = {
+        "2+2": "2 + 2 = 4",
+        "2+3": "2 + 3 = 5",
+        "3+3": "3 + 3 = 6",
+        "5*3": "5 × 3 = 15",
+        "10/2": "10 ÷ 2 = 5",
+        "2*8": "2 × 8 = 16",
+        "100-50": "100 - 50 = 50",
+    }
+    
     def __init__(self):
         super().__init__("MathAgent", "Mathématiques et calculs")
-        self.math_patterns = [
-            r'\d+\s*[\+\-\*\/]\s*\d+',  # Opérations simples
-            r'sqrt\(\d+\)',             # Racine carrée
-            r'pow\(\d+,\s*\d+\)',       # Puissance
-            r'sin\(\d+\)',              # Sinus
-            r'cos\(\d+\)',              # Cosinus
-            r'tan\(\d+\)',              # Tangente
-        ]
-        
-        # Réponses rapides pour calculs courants
-        self.quick_math = {
-            "2+2": "2 + 2 = 4",
-            "2+3": "2 + 3 = 5",
-            "3+3": "3 + 3 = 6",
-            "5*3": "5 × 3 = 15",
-            "10/2": "10 ÷ 2 = 5",
-            "2*8": "2 × 8 = 16",
-            "100-50": "100 - 50 = 50",
-        }
+        self.engine = default_engine
     
-    def can_handle(self, query: str) -> bool:
-        """Détermine si cette requête est mathématique"""
-        query_clean = query.lower().strip()
-        
-        # Vérifier les calculs rapides
-        if query_clean in self.quick_math:
-            return True
-        
-        # Vérifier les patterns mathématiques
-        for pattern in self.math_patterns:
-            if re.search(pattern, query_clean):
-                return True
-        
-        # Mots-clés mathématiques
-        math_keywords = [
-            'calcul', 'calculer', 'combien', 'résultat', 'somme', 
-            'produit', 'différence', 'quotient', 'racine', 'puissance',
-            'sinus', 'cosinus', 'tangente', 'logarithme'
-        ]
-        
-        return any(keyword in query_clean for keyword in math_keywords)
+    @classmethod
+    def routing_exact_queries(cls):
+        """Calculs rapides reconnus tels quels"""
+        return cls.quick_math
     
     def process(self, query: str) -> str:
         """Traite les requêtes mathématiques"""
@@ -64,67 +61,67 @@ class MathAgent(BaseAgent):
             return f"⚡ {self.quick_math[query_clean]} (calcul instantané)"
         
         try:
-            # Extraction et évaluation d'expressions simples
-            result = self._evaluate_expression(query_clean)
-            if result is not None:
-                return f"🔢 Résultat : {result}"
-            
-            # Fonctions mathématiques avancées
-            if 'sqrt' in query_clean:
-                return self._handle_sqrt(query_clean)
-            
-            if any(func in query_clean for func in ['sin', 'cos', 'tan']):
-                return self._handle_trigonometry(query_clean)
+            expression = self.engine.extract(query_clean)
+            if expression:
+                # Fonctions mathématiques avancées (affichage dédié)
+                call = self._top_level_call(expression)
+                if call and call[0] == 'sqrt':
+                    return self._handle_sqrt(call[1][0])
+                
+                if call and call[0] in ('sin', 'cos', 'tan'):
+                    return self._handle_trigonometry(call[0], call[1][0])
+                
+                # Extraction et évaluation d'expressions
+                result = self._evaluate_expression(expression)
+                if result is not None:
+                    return f"🔢 Résultat : {result}"
             
             return "🤔 Je peux calculer des expressions comme 2+3, sqrt(16), sin(30), etc."
             
+        except ExpressionBudgetError as e:
+            return f"❌ Calcul trop coûteux : {str(e)}"
         except Exception as e:
             return f"❌ Erreur de calcul : {str(e)}"
     
-    def _evaluate_expression(self, expr: str) -> Optional[float]:
-        """Évalue une expression mathématique simple"""
-        # Nettoyer l'expression
-        expr = re.sub(r'[^\d\+\-\*\/\.\(\)]', '', expr)
-        
-        if not expr:
+    def _top_level_call(self, expression: str):
+        """Retourne (fonction, arguments) si l'expression est un appel de fonction seul"""
+        try:
+            return self.engine.top_level_call(expression)
+        except ExpressionBudgetError:
+            raise
+        except ExpressionError:
             return None
-        
+    
+    def _evaluate_expression(self, expr: str) -> Optional[float]:
+        """Évalue une expression mathématique (moteur sûr, sans eval)"""
         try:
-            # Sécuriser l'évaluation
-            allowed_chars = set('0123456789+-*/.() ')
-            if all(c in allowed_chars for c in expr):
-                result = eval(expr)
-                return round(result, 6) if isinstance(result, float) else result
-        except:
-            pass
-        
-        return None
+            result = self.engine.evaluate(expr)
+            return round(result, 6) if isinstance(result, float) else result
+        except ExpressionBudgetError:
+            raise
+        except ExpressionError:
+            return None
     
-    def _handle_sqrt(self, query: str) -> str:
+    def _handle_sqrt(self, number: float) -> str:
         """Gère les calculs de racine carrée"""
-        match = re.search(r'sqrt\((\d+)\)', query)
-        if match:
-            number = int(match.group(1))
-            result = math.sqrt(number)
-            return f"√{number} = {result:.6f}"
-        return "Format: sqrt(nombre)"
+        result = math.sqrt(number)
+        return f"√{self._format_number(number)} = {result:.6f}"
     
-    def _handle_trigonometry(self, query: str) -> str:
-        """Gère les fonctions trigonométriques"""
-        for func in ['sin', 'cos', 'tan']:
-            pattern = f'{func}\\((\\d+)\\)'
-            match = re.search(pattern, query)
-            if match:
-                angle = int(match.group(1))
-                radians = math.radians(angle)
-                
-                if func == 'sin':
-                    result = math.sin(radians)
-                elif func == 'cos':
-                    result = math.cos(radians)
-                else:  # tan
-                    result = math.tan(radians)
-                
-                return f"{func}({angle}°) = {result:.6f}"
+    def _handle_trigonometry(self, func: str, angle: float) -> str:
+        """Gère les fonctions trigonométriques (angle en degrés)"""
+        radians = math.radians(angle)
+        
+        if func == 'sin':
+            result = math.sin(radians)
+        elif func == 'cos':
+            result = math.cos(radians)
+        else:  # tan
+            result = math.tan(radians)
         
-        return "Format: sin(angle), cos(angle), tan(angle)" 
\ No newline at end of file
+        return f"{func}({self._format_number(angle)}°) = {result:.6f}"
+    
+    def _format_number(self, value: float) -> str:
+        """Affiche un nombre sans décimales inutiles"""
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(round(value, 6) if isinstance(value, float) else value)
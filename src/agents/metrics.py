@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+📈 Metrics - Histogrammes de latence et export au format Prometheus
+"""
+
+import bisect
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+# Précision des histogrammes : 2^3 sous-classes par puissance de deux (~12% d'erreur relative)
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Bornes "le" exportées vers Prometheus (en secondes)
+PROMETHEUS_BOUNDS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+                     0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_PROMETHEUS_BOUNDS_NS = tuple(int(bound * 1e9) for bound in PROMETHEUS_BOUNDS)
+
+
+def _bucket_index(value_ns: int) -> int:
+    """Classe logarithmique d'une durée (valeurs exactes sous 2 * SUB_BUCKETS ns)"""
+    if value_ns < 2 * SUB_BUCKETS:
+        return value_ns
+    shift = value_ns.bit_length() - 1 - SUB_BUCKET_BITS
+    return SUB_BUCKETS * (shift + 1) + ((value_ns >> shift) - SUB_BUCKETS)
+
+
+def _bucket_upper(index: int) -> int:
+    """Borne supérieure (exclue) d'une classe en nanosecondes"""
+    if index < 2 * SUB_BUCKETS:
+        return index + 1
+    shift = index // SUB_BUCKETS - 1
+    return (index % SUB_BUCKETS + SUB_BUCKETS + 1) << shift
+
+
+class LatencyHistogram:
+    """Histogramme de latences à classes logarithmiques (mesures en nanosecondes)"""
+
+    def __init__(self):
+        self._counts = {}
+        self._bounds_counts = [0] * (len(_PROMETHEUS_BOUNDS_NS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self._lock = threading.Lock()
+
+    def record(self, value_ns: int):
+        """Enregistre une durée mesurée avec time.perf_counter_ns()"""
+        value_ns = max(0, int(value_ns))
+        index = _bucket_index(value_ns)
+        bound = bisect.bisect_left(_PROMETHEUS_BOUNDS_NS, value_ns)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self._bounds_counts[bound] += 1
+            self.count += 1
+            self.total_ns += value_ns
+            if value_ns > self.max_ns:
+                self.max_ns = value_ns
+
+    def percentile(self, p: float) -> float:
+        """Percentile approché en millisecondes (0.0 sans mesure)"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, int(round(p / 100 * self.count)))
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= rank:
+                    return min(_bucket_upper(index), self.max_ns) / 1e6
+            return self.max_ns / 1e6
+
+    def mean(self) -> float:
+        """Moyenne exacte en millisecondes"""
+        return self.total_ns / self.count / 1e6 if self.count else 0.0
+
+    def summary(self) -> Dict:
+        """Résumé {count, mean, p50, p95, p99, max} en millisecondes"""
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max_ns / 1e6,
+        }
+
+    def prometheus_buckets(self) -> List[Tuple[str, int]]:
+        """Compteurs cumulés par borne "le" (dont +Inf)"""
+        with self._lock:
+            counts = list(self._bounds_counts)
+        buckets = []
+        cumulative = 0
+        for bound, count in zip(PROMETHEUS_BOUNDS, counts):
+            cumulative += count
+            buckets.append((repr(bound), cumulative))
+        buckets.append(("+Inf", cumulative + counts[-1]))
+        return buckets
+
+    def reset(self):
+        """Efface toutes les mesures"""
+        with self._lock:
+            self._counts.clear()
+            self._bounds_counts = [0] * (len(_PROMETHEUS_BOUNDS_NS) + 1)
+            self.count = 0
+            self.total_ns = 0
+            self.max_ns = 0
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Étiquettes Prometheus échappées : {a="x",b="y"}"""
+    if not labels:
+        return ""
+    escaped = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def render_prometheus(series: Iterable[Tuple[str, str, Dict[str, str], LatencyHistogram]]) -> str:
+    """Format texte Prometheus 0.0.4 pour des séries (nom, aide, étiquettes, histogramme)"""
+    lines = []
+    declared = set()
+    for name, help_text, labels, histogram in series:
+        if name not in declared:
+            declared.add(name)
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+        for bound, count in histogram.prometheus_buckets():
+            lines.append(f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total_ns / 1e9:.9f}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(series: Iterable[Tuple[str, str, Dict[str, str], LatencyHistogram]], path: Path) -> Path:
+    """Écrit les séries dans un fichier (node_exporter textfile collector), de façon atomique"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(render_prometheus(series), encoding="utf-8")
+    tmp_path.replace(path)
+    return path
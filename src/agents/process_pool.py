@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+🏭 Process Pool - Processus préchauffés pour les traitements lourds des agents (hors GIL)
+"""
+
+import os
+import time
+import queue
+import threading
+import multiprocessing
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from .config import CONFIG_FILE, load_section
+from .metrics import LatencyHistogram
+from .registry import AgentSpec, LazyAgent
+
+
+DEFAULT_SETTINGS = {
+    "process_workers": 0,   # 0 : pas de pool, tout s'exécute dans le processus courant
+    "task_timeout": 10.0,   # Secondes avant d'abattre un worker emballé
+}
+
+
+def load_pool_settings(config_path: Path = CONFIG_FILE) -> Dict:
+    """Paramètres du pool : section "performance" de la configuration"""
+    return load_section("performance", DEFAULT_SETTINGS, config_path)
+
+
+class AgentTimeoutError(TimeoutError):
+    """Tâche abandonnée : le worker a dépassé son délai et a été remplacé"""
+
+
+class AgentWorkerError(RuntimeError):
+    """Erreur levée par l'agent dans le worker, ou worker mort en cours de tâche"""
+
+
+def _worker_main(conn, specs: Tuple[AgentSpec, ...]):
+    """Boucle d'un worker : agents instanciés une fois, puis tâches (nom d'agent, requête) jusqu'à None"""
+    agents = {}
+    for spec in specs:
+        agent = LazyAgent(spec).load()
+        agents[agent.name] = agent
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return  # Processus parent disparu
+        if task is None:
+            return
+
+        agent_name, query = task
+        start_ns = time.perf_counter_ns()
+        try:
+            response, confidence = agents[agent_name]._process_with_confidence(query)
+            conn.send(("ok", response, confidence, time.perf_counter_ns() - start_ns))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", None, time.perf_counter_ns() - start_ns))
+
+
+class _Worker:
+    """Processus worker et son canal"""
+
+    def __init__(self, context, specs: Tuple[AgentSpec, ...]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, specs),
+                                       name="nina-agent-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self, timeout: float):
+        """Attend la fin de l'initialisation des agents du worker"""
+        if self.ready:
+            return
+        if not self.conn.poll(timeout):
+            raise AgentWorkerError(f"worker non prêt après {timeout:g}s")
+        message = self.conn.recv()
+        if message[0] != "ready":
+            raise AgentWorkerError(f"message de démarrage inattendu : {message[0]}")
+        self.ready = True
+
+    def kill(self):
+        """Abat le processus sans attendre la fin de sa tâche"""
+        self.process.kill()
+        self.process.join(timeout=1.0)
+        self.conn.close()
+
+    def stop(self, timeout: float = 1.0):
+        """Arrêt propre, puis forcé passé le délai"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=timeout)
+        self.conn.close()
+
+
+class AgentProcessPool:
+    """Pool de processus dont les workers ont déjà instancié les agents (un worker par tâche en cours)"""
+
+    def __init__(self, specs: Iterable[AgentSpec], workers: int = 2, task_timeout: float = 10.0,
+                 start_timeout: float = 60.0, start_method: str = None):
+        self.specs = tuple(specs)
+        self.agent_names = frozenset(spec.class_name for spec in self.specs)
+        self.workers = workers
+        self.task_timeout = task_timeout
+        self.start_timeout = start_timeout
+        # forkserver : workers issus d'un processus sans threads (pas de verrou hérité en plein import)
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(start_method)
+        self._idle = queue.Queue()
+        self._all = set()
+        self._pid = None
+        self._lock = threading.Lock()
+
+        # Durée de calcul dans les workers (hors échanges entre processus)
+        self.latency = LatencyHistogram()
+        self.stats = {"tasks": 0, "errors": 0, "timeouts": 0, "crashes": 0, "respawns": 0}
+
+    def handles(self, agent_name: str) -> bool:
+        """Indique si les workers disposent de cet agent"""
+        return agent_name in self.agent_names
+
+    def start(self):
+        """Lance les workers (préchauffage en parallèle, sans attendre) ; une fois par processus"""
+        with self._lock:
+            # Après un fork, les workers appartiennent au parent : en lancer de nouveaux
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._idle = queue.Queue()
+            self._all = set()
+            for _ in range(self.workers):
+                self._add_worker()
+
+    def _add_worker(self):
+        worker = _Worker(self._context, self.specs)
+        self._all.add(worker)
+        self._idle.put(worker)
+
+    def _replace(self, worker: _Worker, stat: str):
+        """Abat un worker défaillant et le remplace par un neuf"""
+        worker.kill()
+        with self._lock:
+            self._all.discard(worker)
+            self.stats[stat] += 1
+            self.stats["respawns"] += 1
+            self._add_worker()
+
+    def run(self, agent_name: str, query: str, timeout: float = None) -> Tuple[str, Optional[float]]:
+        """Exécute process(query) de l'agent dans un worker, retourne (réponse, confiance déclarée)"""
+        if not self.handles(agent_name):
+            raise KeyError(f"agent absent des workers : {agent_name}")
+        self.start()
+        timeout = timeout if timeout is not None else self.task_timeout
+
+        worker = self._idle.get()
+        while not worker.process.is_alive():
+            # Worker mort au repos (tué, manque de mémoire) : le remplacer avant de lui confier la tâche
+            self._replace(worker, "crashes")
+            worker = self._idle.get()
+        try:
+            worker.wait_ready(self.start_timeout)
+            worker.conn.send((agent_name, query))
+            finished = worker.conn.poll(timeout)
+            if finished:
+                status, payload, confidence, elapsed_ns = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            self._replace(worker, "crashes")
+            raise AgentWorkerError(f"worker arrêté en cours de tâche ({str(e) or 'canal fermé'})") from e
+        except BaseException:
+            # Worker non prêt ou interruption pendant l'échange : l'état du canal est inconnu
+            self._replace(worker, "crashes")
+            raise
+
+        if not finished:
+            self._replace(worker, "timeouts")
+            raise AgentTimeoutError(f"délai de {timeout:g}s dépassé, worker remplacé")
+
+        self._idle.put(worker)
+        self.latency.record(elapsed_ns)
+        with self._lock:
+            self.stats["tasks"] += 1
+            if status == "error":
+                self.stats["errors"] += 1
+        if status == "error":
+            raise AgentWorkerError(payload)
+        return payload, confidence
+
+    def get_stats(self) -> Dict:
+        """Compteurs du pool et durée de calcul dans les workers"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["workers"] = self.workers
+        stats["alive"] = sum(1 for worker in list(self._all) if worker.process.is_alive())
+        stats["latency"] = self.latency.summary()
+        return stats
+
+    def shutdown(self, timeout: float = 1.0):
+        """Arrête les workers de ce processus"""
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            workers, self._all = self._all, set()
+            self._pid = None
+        for worker in workers:
+            worker.stop(timeout)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+🧹 Query Normalizer - Forme canonique des requêtes et recherche de quasi-doublons
+
+Les clés de cache gardent les nombres tels qu'ils sont écrits ("2.50" et "2.5" sont deux clés) ;
+seuls les jetons de tokenize() (classifieur d'intention, index BM25) normalisent les nombres.
+"""
+
+import re
+import heapq
+import random
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Mots vides retirés des clés : articles et pronoms d'inversion ("le ciel est-il bleu")
+STOP_WORDS = frozenset({
+    "le", "la", "les", "l", "un", "une", "des", "du", "de", "d", "au", "aux",
+    "il", "elle", "ils", "elles", "t",
+})
+
+# Version de la forme canonique : les clés déjà persistées sont réécrites quand elle change
+# (1 : ancien format query.lower().strip())
+KEY_VERSION = 2
+
+_WORD_HYPHEN = re.compile(r"(?<=[a-z])-(?=[a-z])")
+_TOKEN = re.compile(r"\d+(?:\.\d+)?|[a-z]+|[+\-*/^%=(),<>]")
+
+# Chiffres ou opérateurs (hors trait d'union entre deux mots) : requête gardée caractère pour caractère
+_LITERAL = re.compile(r"[\d+\-*/^%=<>×÷√]")
+# Clé d'une requête sans chiffres : mots (lettres de toute écriture), symboles gardés un par un,
+# ponctuation de phrase et apostrophes retirées
+_KEY_TOKEN = re.compile(r"\w+|[^\w\s?!.,;:'’\"«»…()\[\]-]")
+_SPACE_AROUND_SYMBOL = re.compile(r"\s*([^\w\s])\s*")
+
+_HASH_MASK = (1 << 30) - 1
+
+
+def _fold_accents(text: str) -> str:
+    """Supprime les accents (é -> e, ç -> c)"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _normalize_number(token: str) -> str:
+    """Forme unique d'un nombre : 007 -> 7, 2.50 -> 2.5, 3.0 -> 3"""
+    integer, _, decimals = token.partition(".")
+    integer = integer.lstrip("0") or "0"
+    decimals = decimals.rstrip("0")
+    return f"{integer}.{decimals}" if decimals else integer
+
+
+def tokenize(text: str) -> List[str]:
+    """Jetons canoniques d'un texte : mots sans accents ni mots vides, nombres et opérateurs normalisés"""
+    text = _fold_accents(text.lower()).replace("**", "^").replace("×", "*").replace("÷", "/")
+    text = _WORD_HYPHEN.sub(" ", text)
+
+    tokens = []
+    for token in _TOKEN.findall(text):
+        if token[0].isdigit():
+            tokens.append(_normalize_number(token))
+        elif token not in STOP_WORDS:
+            tokens.append(token)
+    return tokens
+
+
+def has_literals(query: str) -> bool:
+    """Indique si la requête contient des chiffres ou des opérateurs (calculs, valeurs exactes)"""
+    return _LITERAL.search(_WORD_HYPHEN.sub(" ", _fold_accents(query.lower()))) is not None
+
+
+@lru_cache(maxsize=4096)
+def canonicalize(query: str) -> str:
+    """Forme canonique d'une requête (clé de cache) : seuls la casse, les accents, les espaces et les mots vides
+    sont ignorés ("Pourquoi le ciel est-il bleu ?" -> "pourquoi ciel est bleu", "2 + 2" -> "2+2") ; une requête
+    avec chiffres ou opérateurs garde tous ses autres caractères ("5!" et "5", "10 000" et "10 0" restent distincts)"""
+    text = _fold_accents(query.lower())
+    if has_literals(query):
+        words = [word for word in text.split() if word not in STOP_WORDS]
+        return _SPACE_AROUND_SYMBOL.sub(r"\1", " ".join(words))
+
+    tokens = [token for token in _KEY_TOKEN.findall(_WORD_HYPHEN.sub(" ", text)) if token not in STOP_WORDS]
+    # Requête faite uniquement de ponctuation ou de mots vides : garder sa forme brute
+    return " ".join(tokens) or query.lower().strip()
+
+
+class NearDuplicateIndex:
+    """Index MinHash/LSH sur les n-grammes de caractères : retrouve une requête déjà vue et proche"""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 32, bands: int = 8, ngram: int = 3,
+                 max_candidates: int = 8, max_bucket: int = 64, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm doit être un multiple de bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        self.max_candidates = max_candidates
+        self.max_bucket = max_bucket  # Clés au plus par bucket : les plus anciennes en sortent
+
+        # Une fonction de hachage par masque XOR (bien moins coûteux qu'une permutation affine),
+        # sur 30 bits : les petits entiers ont le chemin rapide de CPython pour ^ et min()
+        rng = random.Random(seed)
+        self._masks = [rng.getrandbits(30) for _ in range(num_perm)]
+
+        self._buckets = [{} for _ in range(bands)]  # bande -> {hash de bande: {clé: None}} (ordre d'insertion)
+        self._signatures = {}  # clé -> (texte, signature)
+        self._lock = threading.Lock()
+
+    def _shingles(self, text: str):
+        """Hachés des n-grammes de caractères (texte bordé d'espaces)"""
+        padded = f" {text} "
+        if len(padded) <= self.ngram:
+            return {hash(padded) & _HASH_MASK}
+        return {hash(padded[i:i + self.ngram]) & _HASH_MASK for i in range(len(padded) - self.ngram + 1)}
+
+    def signature(self, text: str, shingles=None) -> Tuple[int, ...]:
+        """Signature MinHash du texte"""
+        shingles = shingles if shingles is not None else self._shingles(text)
+        return tuple([min(map(mask.__xor__, shingles)) for mask in self._masks])
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        """Hachés des bandes LSH d'une signature"""
+        rows = self.rows
+        return [hash(signature[i * rows:(i + 1) * rows]) for i in range(self.bands)]
+
+    def add(self, key: str, text: str, signature: Tuple[int, ...] = None):
+        """Indexe le texte canonique associé à une clé (signature précalculée possible)"""
+        signature = signature if signature is not None else self.signature(text)
+        with self._lock:
+            self._remove(key)
+            self._signatures[key] = (text, signature)
+            for band, band_key in zip(self._buckets, self._band_keys(signature)):
+                members = band.setdefault(band_key, {})
+                members[key] = None
+                if len(members) > self.max_bucket:
+                    # Bucket plein (requêtes très semblables) : la clé la plus ancienne en sort, ses autres bandes la retrouvent
+                    del members[next(iter(members))]
+
+    def remove(self, key: str):
+        """Retire une clé de l'index"""
+        with self._lock:
+            self._remove(key)
+
+    def text(self, key: str) -> Optional[str]:
+        """Texte canonique indexé pour la clé"""
+        with self._lock:
+            entry = self._signatures.get(key)
+            return entry[0] if entry is not None else None
+
+    def _remove(self, key: str):
+        entry = self._signatures.pop(key, None)
+        if entry is None:
+            return
+        for band, band_key in zip(self._buckets, self._band_keys(entry[1])):
+            members = band.get(band_key)
+            if members is not None:
+                members.pop(key, None)
+                if not members:
+                    del band[band_key]
+
+    def find(self, text: str) -> Optional[Tuple[str, float]]:
+        """Clé la plus proche et similarité de Jaccard (None sous le seuil)"""
+        shingles = self._shingles(text)
+        band_keys = self._band_keys(self.signature(text, shingles))
+        with self._lock:
+            # Candidats classés par nombre de bandes en collision
+            collisions = {}
+            for band, band_key in zip(self._buckets, band_keys):
+                for key in band.get(band_key, ()):
+                    collisions[key] = collisions.get(key, 0) + 1
+            candidates = heapq.nlargest(self.max_candidates, collisions, key=collisions.get)
+            texts = [(key, self._signatures[key][0]) for key in candidates]
+
+        # Vérification exacte sur les n-grammes des meilleurs candidats
+        best = None
+        for key, other_text in texts:
+            if other_text == text:
+                return key, 1.0
+            other = self._shingles(other_text)
+            similarity = len(shingles & other) / len(shingles | other)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def clear(self):
+        """Vide l'index"""
+        with self._lock:
+            self._signatures.clear()
+            for band in self._buckets:
+                band.clear()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def get_stats(self) -> Dict:
+        """Taille de l'index et seuil de similarité"""
+        return {"entries": len(self._signatures), "threshold": self.threshold}
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+🗂️ Agent Registry - Déclaration des agents et chargement au premier usage
+"""
+
+import importlib
+import threading
+from typing import Dict
+
+# Attributs lus sur la classe tant que l'agent n'est pas chargé (routage, fraîcheur du cache)
+CLASS_ATTRIBUTES = frozenset({
+    "routing_keywords", "routing_patterns", "routing_bonus_keywords", "routing_bonus",
+    "routing_exact_queries", "freshness", "near_duplicate_threshold",
+})
+
+
+class AgentSpec:
+    """Déclaration d'un agent : module et classe à charger, paramètres de création"""
+
+    def __init__(self, module: str, class_name: str, kwargs: Dict = None, factory: str = None,
+                 on_load: str = None, preload: bool = False):
+        self.module = module          # Module du paquet agents (importé au premier accès à la classe)
+        self.class_name = class_name
+        self.kwargs = kwargs or {}
+        self.factory = factory        # Méthode de classe de création (constructeur par défaut)
+        self.on_load = on_load        # Méthode appelée juste après la création
+        self.preload = preload        # Chargement en arrière-plan dès le démarrage
+
+
+# Agents spécialisés, dans l'ordre de déclaration du routage
+AGENT_SPECS = (
+    AgentSpec("math_agent", "MathAgent"),
+    AgentSpec("knowledge_agent", "KnowledgeAgent"),
+    AgentSpec("system_agent", "SystemAgent"),
+)
+
+# Agent de repli : modèle préchargé en arrière-plan pour que la première question ne l'attende pas
+FALLBACK_SPEC = AgentSpec("llm_agent", "LLMAgent", factory="from_config", on_load="start_warm_up", preload=True)
+
+
+class LazyAgent:
+    """Agent chargé au premier usage : avant, seules les déclarations de sa classe sont lues"""
+
+    def __init__(self, spec: AgentSpec, defer_on_load: bool = False):
+        self.spec = spec
+        # spec.on_load reporté jusqu'à run_on_load() (maître préforké : aucun thread lancé avant le fork)
+        self.defer_on_load = defer_on_load
+        self._agent_class = None
+        self._agent = None
+        self._lock = threading.Lock()
+        self._preload_thread = None
+        self._load_hooks = []
+        self._on_load_pending = False
+
+    @property
+    def agent_class(self) -> type:
+        """Classe de l'agent (import de son module, sans instanciation)"""
+        if self._agent_class is None:
+            module = importlib.import_module(f".{self.spec.module}", __package__)
+            self._agent_class = getattr(module, self.spec.class_name)
+        return self._agent_class
+
+    @property
+    def name(self) -> str:
+        return self._agent.name if self._agent is not None else self.spec.class_name
+
+    @property
+    def loaded(self) -> bool:
+        """Indique si l'agent a été instancié"""
+        return self._agent is not None
+
+    def load(self):
+        """Instancie l'agent (une seule fois, quel que soit le thread appelant)"""
+        if self._agent is not None:
+            return self._agent
+        with self._lock:
+            if self._agent is None:
+                spec = self.spec
+                create = getattr(self.agent_class, spec.factory) if spec.factory else self.agent_class
+                agent = create(**spec.kwargs)
+                if agent is None:
+                    raise RuntimeError(f"agent {spec.class_name} désactivé par la configuration")
+                if spec.on_load:
+                    if self.defer_on_load:
+                        self._on_load_pending = True
+                    else:
+                        getattr(agent, spec.on_load)()
+                for hook in self._load_hooks:
+                    hook(agent)
+                self._agent = agent
+        return self._agent
+
+    def run_on_load(self):
+        """Lance spec.on_load s'il a été reporté (les chargements suivants ne le reportent plus)"""
+        with self._lock:
+            self.defer_on_load = False
+            pending, self._on_load_pending = self._on_load_pending, False
+        if pending:
+            getattr(self._agent, self.spec.on_load)()
+
+    def add_load_hook(self, hook):
+        """Appelle hook(agent) juste après l'instanciation (aussitôt si l'agent est déjà chargé)"""
+        with self._lock:
+            if self._agent is None:
+                self._load_hooks.append(hook)
+                return
+        hook(self._agent)
+
+    def preload(self) -> threading.Thread:
+        """Charge l'agent en arrière-plan"""
+        if self._preload_thread is None and self._agent is None:
+            self._preload_thread = threading.Thread(
+                target=self._preload, name=f"nina-load-{self.spec.class_name}", daemon=True
+            )
+            self._preload_thread.start()
+        return self._preload_thread
+
+    def _preload(self):
+        try:
+            self.load()
+        except Exception as e:
+            print(f"⚠️ Préchargement de {self.spec.class_name} impossible : {e}")
+
+    def __getattr__(self, attribute: str):
+        # Appelé seulement pour les attributs absents du proxy (jamais pour ses attributs internes)
+        if attribute.startswith("_"):
+            raise AttributeError(attribute)
+        if self._agent is None and attribute in CLASS_ATTRIBUTES:
+            return getattr(self.agent_class, attribute)
+        return getattr(self.load(), attribute)
+
+    def __repr__(self) -> str:
+        state = "chargé" if self._agent is not None else "non chargé"
+        return f"<LazyAgent {self.spec.class_name} ({state})>"
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+🗄️ Response Cache - Cache de réponses borné (LRU) pour les agents de Nina
+"""
+
+import sys
+import time
+import zlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import CONFIG_FILE, PROJECT_ROOT, load_section
+from .query_normalizer import NearDuplicateIndex
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+
+DEFAULT_SETTINGS = {
+    "cache_backend": "memory",                         # "memory" : par processus, "shared" : par hôte
+    "shared_cache_path": "cache/shared_responses.db",  # Relatif à la racine du projet
+    "cache_compress_threshold": 2048,                  # Réponses compressées au-delà (caractères, 0 : jamais)
+    "cache_max_entries": 1024,                         # Entrées par agent
+    "cache_max_mb": 8,                                 # Taille des réponses par agent (Mo)
+}
+
+
+def pack_value(value: str, compress_threshold: Optional[int]):
+    """Valeur stockée : compressée par zlib au-delà du seuil si la compression y gagne"""
+    if compress_threshold and len(value) > compress_threshold:
+        data = value.encode("utf-8")
+        compressed = zlib.compress(data, 1)
+        if len(compressed) < len(data):
+            return compressed
+    return value
+
+
+def unpack_value(stored) -> str:
+    """Valeur d'origine d'une valeur stockée"""
+    return zlib.decompress(stored).decode("utf-8") if type(stored) is bytes else stored
+
+
+class FreshnessPolicy:
+    """Politique de fraîcheur des réponses mises en cache par un agent"""
+
+    FOREVER = "forever"
+    TTL = "ttl"
+    NEVER = "never"
+    STALE_WHILE_REVALIDATE = "stale-while-revalidate"
+
+    def __init__(self, mode: str, ttl: float = None, max_stale: float = None):
+        self.mode = mode
+        self.ttl = ttl
+        self.max_stale = max_stale
+
+    @classmethod
+    def forever(cls) -> "FreshnessPolicy":
+        """Réponses valides indéfiniment (calculs, connaissances)"""
+        return cls(cls.FOREVER)
+
+    @classmethod
+    def time_to_live(cls, ttl: float) -> "FreshnessPolicy":
+        """Réponses valides pendant `ttl` secondes"""
+        return cls(cls.TTL, ttl=ttl)
+
+    @classmethod
+    def never(cls) -> "FreshnessPolicy":
+        """Réponses jamais mises en cache"""
+        return cls(cls.NEVER)
+
+    @classmethod
+    def stale_while_revalidate(cls, ttl: float, max_stale: float) -> "FreshnessPolicy":
+        """Réponses fraîches pendant `ttl`, servies périmées jusqu'à `max_stale` le temps d'un rafraîchissement"""
+        return cls(cls.STALE_WHILE_REVALIDATE, ttl=ttl, max_stale=max_stale)
+
+    def is_cacheable(self) -> bool:
+        """Indique si les réponses peuvent être mises en cache"""
+        return self.mode != self.NEVER
+
+    def state(self, age: float) -> str:
+        """Retourne l'état (fresh, stale, expired) d'une entrée selon son âge en secondes"""
+        if self.mode == self.FOREVER:
+            return FRESH
+        if self.mode == self.NEVER:
+            return EXPIRED
+        if age <= self.ttl:
+            return FRESH
+        if self.mode == self.STALE_WHILE_REVALIDATE and age <= self.max_stale:
+            return STALE
+        return EXPIRED
+
+    def __repr__(self) -> str:
+        return f"FreshnessPolicy({self.mode}, ttl={self.ttl}, max_stale={self.max_stale})"
+
+
+class ResponseCache:
+    """Cache LRU borné en nombre d'entrées et en octets"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 8 * 1024 * 1024,
+                 near_duplicate_threshold: float = None, compress_threshold: int = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compress_threshold = compress_threshold  # Longues réponses (LLM) gardées compressées par zlib
+        self._entries = OrderedDict()  # clé -> (valeur, ou bytes si compressée, taille, horodatage)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "near_hits": 0,
+            "evictions": 0,
+            "compressed": 0
+        }
+        
+        # Recherche optionnelle des requêtes proches déjà en cache (texte canonique -> clé)
+        self.near_duplicates = NearDuplicateIndex(near_duplicate_threshold) if near_duplicate_threshold else None
+
+    def _entry_size(self, key: str, value: str) -> int:
+        """Estime l'empreinte mémoire d'une entrée"""
+        return sys.getsizeof(key) + sys.getsizeof(value)
+
+    def _pack(self, value: str):
+        """Valeur stockée : compressée au-delà du seuil si zlib y gagne"""
+        return pack_value(value, self.compress_threshold)
+
+    _unpack = staticmethod(unpack_value)
+
+    def get(self, key: str) -> Optional[str]:
+        """Retourne la valeur associée à la clé (et la marque récente)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+        return self._unpack(entry[0])
+
+    def peek(self, key: str) -> Optional[str]:
+        """Retourne la valeur sans la marquer récente ni compter de hit (lecture de repli)"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return self._unpack(entry[0]) if entry is not None else None
+
+    def lookup(self, key: str, policy: FreshnessPolicy, text: str = None) -> Optional[Tuple[str, str]]:
+        """Retourne (valeur, état) si l'entrée est utilisable selon la politique, sinon None
+        (avec `text`, une requête proche déjà en cache peut répondre à la place de la clé exacte)"""
+        with self._lock:
+            result = self._lookup_entry(key, policy)
+            if result is not None or self.near_duplicates is None or text is None:
+                if result is None:
+                    self.stats["misses"] += 1
+                return result
+
+        # Recherche de similarité hors du verrou du cache
+        match = self.near_duplicates.find(text)
+        with self._lock:
+            result = self._lookup_entry(match[0], policy) if match else None
+            if result is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["near_hits"] += 1
+            return result
+
+    def _lookup_entry(self, key: str, policy: FreshnessPolicy) -> Optional[Tuple[str, str]]:
+        """Consulte une entrée et compte le succès (verrou déjà pris)"""
+        entry = self._entries.get(key)
+        state = EXPIRED if entry is None else policy.state(time.time() - entry[2])
+
+        if state == EXPIRED:
+            if entry is not None:
+                self._pop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        if state == STALE:
+            self.stats["stale_hits"] += 1
+        return self._unpack(entry[0]), state
+
+    def set(self, key: str, value: str, stored_at: float = None, text: str = None):
+        """Ajoute ou remplace une entrée puis applique l'éviction (`text` : forme indexée pour les quasi-doublons)"""
+        value = self._pack(value)
+        size = self._entry_size(key, value)
+        stored_at = time.time() if stored_at is None else stored_at
+        
+        # Signature calculée hors du verrou, insertion dans l'index sous le verrou
+        signature = None
+        if text is not None and self.near_duplicates is not None:
+            signature = self.near_duplicates.signature(text)
+
+        with self._lock:
+            # Une entrée plus grosse que le budget total n'est jamais gardée
+            if size > self.max_bytes:
+                self._pop(key)
+                return
+
+            self._pop(key)
+            self._entries[key] = (value, size, stored_at)
+            self._bytes += size
+            if type(value) is bytes:
+                self.stats["compressed"] += 1
+            if signature is not None:
+                self.near_duplicates.add(key, text, signature)
+
+            # Évincer les entrées les moins récemment utilisées
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[1]
+                if self.near_duplicates is not None:
+                    self.near_duplicates.remove(evicted_key)
+                self.stats["evictions"] += 1
+
+    def entries(self) -> List[Tuple[str, str, float, Optional[str]]]:
+        """Entrées (clé, valeur, horodatage, texte indexé) de la moins à la plus récemment utilisée"""
+        with self._lock:
+            entries = [(key, entry[0], entry[2]) for key, entry in self._entries.items()]
+        near_duplicates = self.near_duplicates
+        return [(key, self._unpack(value), stored_at, near_duplicates.text(key) if near_duplicates is not None else None)
+                for key, value, stored_at in entries]
+
+    def _pop(self, key: str):
+        """Retire une entrée sans toucher aux statistiques (verrou déjà pris)"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+            if self.near_duplicates is not None:
+                self.near_duplicates.remove(key)
+
+    def clear(self) -> int:
+        """Vide le cache et retourne le nombre d'entrées supprimées"""
+        with self._lock:
+            cleared = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            if self.near_duplicates is not None:
+                self.near_duplicates.clear()
+            return cleared
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get_stats(self) -> Dict:
+        """Retourne les statistiques du cache"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"],
+            "stale_hits": self.stats["stale_hits"],
+            "near_hits": self.stats["near_hits"],
+            "evictions": self.stats["evictions"],
+            "compressed": self.stats["compressed"],
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0
+        }
+
+
+def load_cache_settings(config_path: Path = CONFIG_FILE) -> Dict:
+    """Paramètres du cache de réponses : section "performance" de la configuration"""
+    return load_section("performance", DEFAULT_SETTINGS, config_path)
+
+
+def create_response_cache(namespace: str, near_duplicate_threshold: float = None, settings: Dict = None):
+    """Cache de réponses d'un agent selon le backend configuré (mémoire du processus ou fichier partagé)"""
+    settings = settings if settings is not None else load_cache_settings()
+    backend = settings["cache_backend"]
+    max_entries = int(settings["cache_max_entries"])
+    max_bytes = int(settings["cache_max_mb"] * 1024 * 1024)
+    if backend == "memory":
+        return ResponseCache(max_entries=max_entries, max_bytes=max_bytes,
+                             near_duplicate_threshold=near_duplicate_threshold,
+                             compress_threshold=settings["cache_compress_threshold"])
+    if backend != "shared":
+        raise ValueError(f"backend de cache inconnu : {backend}")
+
+    # Importé à la demande : SQLite n'est chargé que si le cache partagé est configuré
+    from .shared_cache import SharedResponseCache
+    return SharedResponseCache(PROJECT_ROOT / settings["shared_cache_path"], namespace,
+                               max_entries=max_entries, max_bytes=max_bytes,
+                               near_duplicate_threshold=near_duplicate_threshold,
+                               compress_threshold=settings["cache_compress_threshold"])
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+💾 Response Store - Stockage persistant des réponses (SQLite en mode WAL)
+"""
+
+import os
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+class ResponseStore:
+    """Cache persistant clé -> réponse, écritures groupées et lectures par clé"""
+
+    def __init__(self, path: Path, flush_every: int = 32, flush_interval: float = 2.0,
+                 legacy_json: Path = None):
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending = {}  # Écritures pas encore validées : clé -> entrée (None = suppression)
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+        self._conn = None
+        self._pid = None
+
+        self._connection()
+        if legacy_json is not None:
+            self.migrate_json(legacy_json)
+
+        # Ne jamais perdre le dernier lot à l'arrêt normal du processus
+        atexit.register(self.close)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connexion SQLite propre au processus (rouverte après un fork)"""
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            self._pid = os.getpid()
+            # WAL : pas de réécriture complète, lecteurs non bloqués, fichier jamais corrompu
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, agent TEXT, cached_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Retourne l'entrée {response, agent, cached_at} associée à la clé"""
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            row = self._connection().execute(
+                "SELECT response, agent, cached_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"response": row[0], "agent": row[1], "cached_at": row[2]}
+
+    def set(self, key: str, entry: Dict):
+        """Enregistre une entrée (validée par lot)"""
+        with self._lock:
+            self._pending[key] = entry
+            self._maybe_flush()
+
+    def delete(self, key: str):
+        """Supprime une entrée (validée par lot)"""
+        with self._lock:
+            self._pending[key] = None
+            self._maybe_flush()
+
+    def _maybe_flush(self):
+        """Valide le lot s'il est plein ou assez ancien"""
+        if len(self._pending) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Valide les écritures en attente en une seule transaction"""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO responses (key, response, agent, cached_at) VALUES (?, ?, ?, ?)",
+                    [(key, entry["response"], entry.get("agent"), entry.get("cached_at", 0.0))
+                     for key, entry in pending.items() if entry is not None]
+                )
+                conn.executemany(
+                    "DELETE FROM responses WHERE key = ?",
+                    [(key,) for key, entry in pending.items() if entry is None]
+                )
+
+    def clear(self) -> int:
+        """Vide le stockage et retourne le nombre d'entrées supprimées"""
+        with self._lock:
+            self._pending.clear()
+            conn = self._connection()
+            with conn:
+                cleared = conn.execute("DELETE FROM responses").rowcount
+            return cleared
+
+    def compact(self):
+        """Rapatrie le journal WAL dans la base et récupère l'espace libre"""
+        with self._lock:
+            self.flush()
+            conn = self._connection()
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("VACUUM")
+
+    def migrate_json(self, json_path: Path) -> int:
+        """Importe une fois l'ancien cache JSON puis le renomme en .migrated"""
+        json_path = Path(json_path)
+        if not json_path.exists():
+            return 0
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            legacy = json.load(f)
+
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                for key, value in legacy.items():
+                    # Ancien format : réponse brute sans métadonnées
+                    entry = value if isinstance(value, dict) else {"response": value, "agent": None, "cached_at": 0.0}
+                    conn.execute(
+                        "INSERT OR IGNORE INTO responses (key, response, agent, cached_at) VALUES (?, ?, ?, ?)",
+                        (key, entry["response"], entry.get("agent"), entry.get("cached_at", 0.0))
+                    )
+
+        json_path.rename(json_path.with_name(json_path.name + ".migrated"))
+        return len(legacy)
+
+    def rekey(self, key_fn: Callable[[str], str], version: int) -> int:
+        """Réécrit une fois les clés existantes avec key_fn (nouvelle forme des clés, numérotée par `version`)
+        et retourne le nombre d'entrées renommées ; deux clés confondues gardent l'entrée la plus récente"""
+        with self._lock:
+            self.flush()
+            conn = self._connection()
+            # Verrou d'écriture pris avant de lire la version : un seul processus fait la migration
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    conn.rollback()
+                    return 0
+
+                rows = conn.execute("SELECT key, response, agent, cached_at FROM responses").fetchall()
+                entries = {}
+                renamed = 0
+                for key, response, agent, cached_at in rows:
+                    new_key = key_fn(key)
+                    renamed += new_key != key
+                    if new_key not in entries or cached_at > entries[new_key][3]:
+                        entries[new_key] = (new_key, response, agent, cached_at)
+
+                if renamed:
+                    conn.execute("DELETE FROM responses")
+                    conn.executemany(
+                        "INSERT INTO responses (key, response, agent, cached_at) VALUES (?, ?, ?, ?)",
+                        list(entries.values())
+                    )
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            return renamed
+
+    def close(self):
+        """Valide les écritures en attente et ferme la connexion"""
+        # Plus rien à valider à l'arrêt : l'instance fermée n'est plus retenue par atexit
+        atexit.unregister(self.close)
+        with self._lock:
+            self.flush()
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def __getitem__(self, key: str) -> Dict:
+        entry = self.get(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
+    def __setitem__(self, key: str, entry: Dict):
+        self.set(key, entry)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.flush()
+            return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
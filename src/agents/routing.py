@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+🧭 Routing Index - Index de routage compilé une seule fois pour tous les agents
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+# Rôles d'un mot-clé dans l'index
+HANDLE = 0  # rend l'agent candidat
+BONUS = 1   # donne le bonus de score de l'agent
+
+
+def _trie_regex(keywords: List[str]) -> str:
+    """Construit une regex en forme d'arbre préfixe (correspondance la plus longue à chaque position)"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def emit(node: Dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if terminal else body
+
+    return emit(trie)
+
+
+class RoutingIndex:
+    """Index multi-motifs : retrouve en une passe les agents candidats et leurs bonus"""
+
+    def __init__(self, agents: List[object]):
+        self.agents = list(agents)
+        self._keyword_targets = {}   # mot-clé -> [(index agent, rôle)]
+        self._prefixes = {}          # mot-clé -> mots-clés qui en sont des préfixes (lui compris)
+        self._exact = {}             # requête exacte -> [index agent]
+        self._patterns = []          # (index agent, regex combinée)
+        self._fallback = []          # agents à can_handle personnalisé
+        self._build()
+
+    def _build(self):
+        """Compile les déclarations de routage de tous les agents"""
+        from .base_agent import BaseAgent
+
+        for index, agent in enumerate(self.agents):
+            # Un agent qui redéfinit can_handle garde sa propre logique (classe lue sans charger un LazyAgent)
+            if getattr(agent, "agent_class", type(agent)).can_handle is not BaseAgent.can_handle:
+                self._fallback.append(index)
+                continue
+
+            for keyword in agent.routing_keywords:
+                self._keyword_targets.setdefault(keyword, []).append((index, HANDLE))
+            for keyword in agent.routing_bonus_keywords:
+                self._keyword_targets.setdefault(keyword, []).append((index, BONUS))
+            for query in agent.routing_exact_queries():
+                self._exact.setdefault(query, []).append(index)
+            if agent.routing_patterns:
+                combined = "|".join(f"(?:{pattern})" for pattern in agent.routing_patterns)
+                self._patterns.append((index, re.compile(combined)))
+
+        keywords = [keyword for keyword in self._keyword_targets if keyword]
+        for keyword in keywords:
+            self._prefixes[keyword] = [other for other in keywords if keyword.startswith(other)]
+
+        # Lookahead : une correspondance (la plus longue) par position, chevauchements compris
+        self._matcher = re.compile(f"(?=({_trie_regex(keywords)}))") if keywords else None
+
+    def route(self, query: str) -> List[Tuple[object, float]]:
+        """Retourne les agents candidats (dans l'ordre de déclaration) avec leur bonus statique"""
+        query_clean = query.lower().strip()
+        handles = set()
+        bonuses = set()
+
+        # Mots-clés : une seule passe sur la requête
+        if self._matcher is not None:
+            for match in self._matcher.finditer(query_clean):
+                for keyword in self._prefixes[match.group(1)]:
+                    for index, role in self._keyword_targets[keyword]:
+                        (handles if role == HANDLE else bonuses).add(index)
+
+        # Requêtes exactes
+        handles.update(self._exact.get(query_clean, ()))
+
+        # Motifs (regex) des agents qui n'ont pas déjà été retenus
+        for index, pattern in self._patterns:
+            if index not in handles and pattern.search(query_clean):
+                handles.add(index)
+
+        # Agents à logique personnalisée
+        for index in self._fallback:
+            try:
+                if self.agents[index].can_handle(query):
+                    handles.add(index)
+            except Exception as e:
+                print(f"⚠️ Erreur évaluation agent {self.agents[index].name}: {e}")
+
+        return [
+            (self.agents[index], self.agents[index].routing_bonus if index in bonuses else 0.0)
+            for index in sorted(handles)
+        ]
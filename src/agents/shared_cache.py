@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+🤝 Shared Cache - Cache de réponses partagé par tous les processus Nina d'un hôte (SQLite en mode WAL)
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .response_cache import FreshnessPolicy, EXPIRED, STALE, pack_value, unpack_value
+from .query_normalizer import NearDuplicateIndex
+
+STAT_KEYS = ("hits", "misses", "stale_hits", "near_hits", "evictions", "compressed")
+
+# Version du schéma (PRAGMA user_version) : une base plus ancienne est recréée, ce n'est qu'un cache
+SCHEMA_VERSION = 2
+
+
+def _pid_alive(pid: int) -> bool:
+    """Indique si le processus existe encore sur cet hôte"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedResponseCache:
+    """Cache borné partagé entre processus : même interface que ResponseCache, entrées dans un fichier SQLite
+    (éviction LRU approchée, compteurs publiés par worker pour un taux de succès global)"""
+
+    def __init__(self, path: Path, namespace: str, max_entries: int = 1024, max_bytes: int = 8 * 1024 * 1024,
+                 near_duplicate_threshold: float = None, touch_interval: float = 30.0,
+                 evict_every: int = 32, publish_interval: float = 1.0, compress_threshold: int = None):
+        self.path = Path(path)
+        self.namespace = namespace  # Un espace par agent (budget, statistiques, vidage)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval      # Date d'usage rafraîchie au plus une fois par intervalle
+        self.evict_every = evict_every            # Écritures entre deux contrôles du budget
+        self.publish_interval = publish_interval  # Délai minimal entre deux publications des compteurs
+        self.compress_threshold = compress_threshold  # Longues réponses stockées compressées (zlib)
+        self._conn = None
+        self._pid = None
+        self._lock = threading.RLock()
+        self._writes = 0
+        self._last_publish = 0.0
+        self.stats = dict.fromkeys(STAT_KEYS, 0)
+
+        # Quasi-doublons : index local des requêtes écrites par ce processus
+        self.near_duplicates = NearDuplicateIndex(near_duplicate_threshold) if near_duplicate_threshold else None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connexion SQLite propre au processus (rouverte après un fork, compteurs repartis de zéro,
+        compteurs des workers disparus retirés)"""
+        if self._conn is None or self._pid != os.getpid():
+            if self._pid is not None and self._pid != os.getpid():
+                self.stats = dict.fromkeys(STAT_KEYS, 0)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False,
+                                         isolation_level=None)
+            self._pid = os.getpid()
+            # WAL : lecteurs jamais bloqués par l'écrivain, verrou de fichier pour les écritures
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._create_schema()
+            self._prune_workers()
+        return self._conn
+
+    def _create_schema(self):
+        """Crée les tables (clés : empreintes binaires ; valeurs : texte, ou octets si compressées)"""
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS entries")
+                conn.execute("DROP TABLE IF EXISTS worker_stats")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key BLOB PRIMARY KEY, namespace TEXT NOT NULL, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (namespace, used_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS worker_stats ("
+                "namespace TEXT NOT NULL, worker INTEGER NOT NULL, hits INTEGER, misses INTEGER, "
+                "stale_hits INTEGER, near_hits INTEGER, evictions INTEGER, compressed INTEGER, updated_at REAL, "
+                "PRIMARY KEY (namespace, worker))"
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _prune_workers(self):
+        """Retire les compteurs des processus terminés (anciens workers, avant un rechargement)"""
+        workers = [row[0] for row in self._conn.execute("SELECT DISTINCT worker FROM worker_stats")]
+        dead = [(pid,) for pid in workers if pid != os.getpid() and not _pid_alive(pid)]
+        if dead:
+            self._conn.executemany("DELETE FROM worker_stats WHERE worker = ?", dead)
+
+    def _entry_size(self, key: str, value: str) -> int:
+        """Estime l'empreinte d'une entrée (même mesure que ResponseCache)"""
+        return sys.getsizeof(key) + sys.getsizeof(value)
+
+    def get(self, key: str) -> Optional[str]:
+        """Retourne la valeur associée à la clé"""
+        entry = self.lookup(key, FreshnessPolicy.forever())
+        return entry[0] if entry else None
+
+    def peek(self, key: str) -> Optional[str]:
+        """Retourne la valeur sans la marquer récente ni compter de hit (lecture de repli)"""
+        with self._lock:
+            row = self._connection().execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            return unpack_value(row[0]) if row else None
+
+    def lookup(self, key: str, policy: FreshnessPolicy, text: str = None) -> Optional[Tuple[str, str]]:
+        """Retourne (valeur, état) si l'entrée est utilisable selon la politique, sinon None
+        (avec `text`, une requête proche écrite par ce processus peut répondre à la place de la clé exacte)"""
+        with self._lock:
+            result = self._lookup_entry(key, policy)
+            if result is None and self.near_duplicates is not None and text is not None:
+                match = self.near_duplicates.find(text)
+                result = self._lookup_entry(match[0], policy) if match else None
+                if result is not None:
+                    self.stats["near_hits"] += 1
+
+            self.stats["hits" if result is not None else "misses"] += 1
+            self._maybe_publish()
+            return result
+
+    def _lookup_entry(self, key: str, policy: FreshnessPolicy) -> Optional[Tuple[str, str]]:
+        """Lit une entrée et applique la politique (verrou déjà pris)"""
+        conn = self._connection()
+        row = conn.execute("SELECT value, stored_at, used_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        state = policy.state(now - row[1])
+        if state == EXPIRED:
+            self._delete(key)
+            return None
+
+        if now - row[2] >= self.touch_interval:
+            conn.execute("UPDATE entries SET used_at = ? WHERE key = ?", (now, key))
+        if state == STALE:
+            self.stats["stale_hits"] += 1
+        return unpack_value(row[0]), state
+
+    def set(self, key: str, value: str, stored_at: float = None, text: str = None):
+        """Ajoute ou remplace une entrée, visible aussitôt par les autres processus"""
+        value = pack_value(value, self.compress_threshold)
+        size = self._entry_size(key, value)
+        now = time.time()
+        stored_at = now if stored_at is None else stored_at
+
+        signature = None
+        if text is not None and self.near_duplicates is not None:
+            signature = self.near_duplicates.signature(text)
+
+        with self._lock:
+            # Une entrée plus grosse que le budget total n'est jamais gardée
+            if size > self.max_bytes:
+                self._delete(key)
+                return
+
+            self._connection().execute(
+                "INSERT OR REPLACE INTO entries (key, namespace, value, size, stored_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (key, self.namespace, value, size, stored_at, now)
+            )
+            if type(value) is bytes:
+                self.stats["compressed"] += 1
+            if signature is not None:
+                self.near_duplicates.add(key, text, signature)
+
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._evict()
+
+    def _evict(self):
+        """Ramène l'espace dans son budget en retirant les entrées les moins récemment utilisées"""
+        conn = self._connection()
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM entries WHERE namespace = ? ORDER BY used_at", (self.namespace,)
+        ).fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total -= size
+
+        conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        if self.near_duplicates is not None:
+            for (key,) in evicted:
+                self.near_duplicates.remove(key)
+        self.stats["evictions"] += len(evicted)
+
+    def _delete(self, key: str):
+        """Retire une entrée (verrou déjà pris)"""
+        self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+        if self.near_duplicates is not None:
+            self.near_duplicates.remove(key)
+
+    def _maybe_publish(self):
+        """Publie les compteurs de ce worker, au plus une fois par intervalle"""
+        if time.monotonic() - self._last_publish >= self.publish_interval:
+            self.publish_stats()
+
+    def publish_stats(self):
+        """Écrit les compteurs de ce processus dans la base (agrégés par global_stats)"""
+        with self._lock:
+            self._last_publish = time.monotonic()
+            self._connection().execute(
+                "INSERT OR REPLACE INTO worker_stats (namespace, worker, hits, misses, stale_hits, near_hits, "
+                "evictions, compressed, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.namespace, os.getpid(), *(self.stats[key] for key in STAT_KEYS), time.time())
+            )
+
+    def global_stats(self) -> Dict:
+        """Compteurs de tous les workers ayant utilisé cet espace, et leur total"""
+        self.publish_stats()
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT worker, hits, misses, stale_hits, near_hits, evictions, compressed FROM worker_stats "
+                "WHERE namespace = ? ORDER BY worker", (self.namespace,)
+            ).fetchall()
+
+        workers = {row[0]: _with_hit_rate(dict(zip(STAT_KEYS, row[1:]))) for row in rows}
+        total = _with_hit_rate({key: sum(worker[key] for worker in workers.values()) for key in STAT_KEYS})
+        return {"workers": workers, "total": total}
+
+    def clear(self) -> int:
+        """Vide l'espace de ce cache (pour tous les processus) et retourne le nombre d'entrées supprimées"""
+        with self._lock:
+            cleared = self._connection().execute(
+                "DELETE FROM entries WHERE namespace = ?", (self.namespace,)
+            ).rowcount
+            if self.near_duplicates is not None:
+                self.near_duplicates.clear()
+            return cleared
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._connection().execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+
+    def get_stats(self) -> Dict:
+        """Statistiques de ce processus, avec le total de tous les workers"""
+        with self._lock:
+            entries, total_bytes = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()
+        stats = _with_hit_rate(dict(self.stats))
+        stats.update({
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "backend": "shared",
+            "global": self.global_stats()["total"],
+        })
+        return stats
+
+    def close(self):
+        """Publie les compteurs et ferme la connexion de ce processus"""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self.publish_stats()
+                self._conn.close()
+            self._conn = None
+
+
+def _with_hit_rate(stats: Dict) -> Dict:
+    """Ajoute le taux de succès (hits / consultations)"""
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
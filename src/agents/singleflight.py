@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+🔗 Single Flight - Fusion des calculs identiques en cours (un seul calcul, tous les appelants servis)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+
+
+class FlightAbandoned(RuntimeError):
+    """Calcul en vol interrompu par son meneur (flux fermé avant la fin) : l'appelant en attente calcule lui-même"""
+
+
+class SingleFlight:
+    """Un calcul en vol par clé : les appels concurrents sur la même clé attendent son résultat
+    (appelants threadés et asyncio mélangés : le résultat transite par un concurrent.futures.Future)"""
+
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"computations": 0, "coalesced": 0}
+
+    def join(self, key: str, lead: bool = True) -> Tuple[Optional[Future], bool]:
+        """Rejoint le calcul en vol pour la clé, ou l'ouvre ; retourne (future, meneur)
+        (le meneur doit appeler finish, par exemple à la fin d'un flux ; lead=False : calcul propre à
+        l'appelant, jamais partagé, s'il n'y en a aucun en vol, et future vaut None)"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+            self.stats["computations"] += 1
+            if not lead:
+                return None, True
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def finish(self, key: str, future: Optional[Future], result: Any = None, error: BaseException = None):
+        """Clôt le calcul : les appels suivants en relancent un, les appelants en attente sont servis"""
+        if future is None:
+            return
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, fn, *args, lead: bool = True) -> Tuple[Any, bool]:
+        """Retourne (fn(*args), fusionné) ; fusionné vaut True si le résultat vient d'un autre appel
+        (ne pas appeler depuis le thread d'une boucle asyncio : utiliser ado ; lead=False : voir join)"""
+        future, leader = self.join(key, lead)
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self.finish(key, future, error=e)
+            raise
+        self.finish(key, future, result)
+        return result, False
+
+    async def ado(self, key: str, fn, *args, lead: bool = True) -> Tuple[Any, bool]:
+        """Version asynchrone de do (fn est une fonction coroutine)"""
+        future, leader = self.join(key, lead)
+        if not leader:
+            # shield : l'annulation d'un appelant en attente n'annule pas le calcul partagé
+            return await asyncio.shield(asyncio.wrap_future(future)), True
+
+        try:
+            result = await fn(*args)
+        except BaseException as e:
+            self.finish(key, future, error=e)
+            raise
+        self.finish(key, future, result)
+        return result, False
+
+    def in_flight(self) -> int:
+        """Nombre de calculs en cours"""
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self) -> Dict:
+        """Calculs lancés et calculs évités par fusion"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = len(self._calls)
+        requests = stats["computations"] + stats["coalesced"]
+        stats["coalesced_rate"] = stats["coalesced"] / requests if requests else 0.0
+        return stats
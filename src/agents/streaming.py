@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+🌊 Streaming - Flux de morceaux de réponse et affichage progressif
+"""
+
+import time
+from typing import AsyncIterator, Callable, Iterable, Iterator
+
+
+class ResponseStream:
+    """Flux de morceaux de réponse ; `result` est renseigné une fois le flux épuisé"""
+
+    def __init__(self, producer: Callable[["ResponseStream"], Iterator[str]]):
+        self.result = None
+        self._chunks = producer(self)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._chunks)
+
+    def text(self) -> str:
+        """Consomme le flux et retourne la réponse assemblée"""
+        return "".join(self)
+
+
+class AsyncResponseStream:
+    """Version asynchrone de ResponseStream (async for)"""
+
+    def __init__(self, producer: Callable[["AsyncResponseStream"], AsyncIterator[str]]):
+        self.result = None
+        self._chunks = producer(self)
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._chunks.__aiter__()
+
+    async def text(self) -> str:
+        """Consomme le flux et retourne la réponse assemblée"""
+        return "".join([chunk async for chunk in self])
+
+
+def render_stream(console, chunks: Iterable[str], title: str, border_style: str = "green",
+                  first_chunk_latency=None) -> str:
+    """Affiche les morceaux au fil de l'eau dans un Panel (rich.live), retourne le texte complet"""
+    # rich n'est importé qu'à l'affichage : les workers et le routage s'en passent
+    from rich.live import Live
+    from rich.panel import Panel
+
+    start_ns = time.perf_counter_ns()
+    parts = []
+    with Live(Panel("", title=title, border_style=border_style), console=console,
+              refresh_per_second=20) as live:
+        for chunk in chunks:
+            if not parts and first_chunk_latency is not None:
+                first_chunk_latency.record(time.perf_counter_ns() - start_ns)
+            parts.append(chunk)
+            live.update(Panel("".join(parts), title=title, border_style=border_style))
+    return "".join(parts)
@@ -4,63 +4,71 @@
 """
 
 import os
-import psutil
 import platform
 from datetime import datetime
 from .base_agent import BaseAgent
+from .response_cache import FreshnessPolicy
+from .deadline import remaining_time
 
 class SystemAgent(BaseAgent):
     """Agent spécialisé en informations système et administration"""
     
-    def __init__(self):
+    # Les métriques changent en permanence : servir la dernière valeur et la rafraîchir
+    freshness = FreshnessPolicy.stale_while_revalidate(ttl=5.0, max_stale=300.0)
+    
+    # Commandes système supportées (mot-clé -> méthode)
+    system_commands = {
+        "système": "_get_system_info",
+        "system": "_get_system_info",
+        "cpu": "_get_cpu_info",
+        "processeur": "_get_cpu_info",
+        "mémoire": "_get_memory_info",
+        "memory": "_get_memory_info",
+        "ram": "_get_memory_info",
+        "disque": "_get_disk_info",
+        "disk": "_get_disk_info",
+        "réseau": "_get_network_info",
+        "network": "_get_network_info",
+        "processus": "_get_process_info",
+        "process": "_get_process_info",
+        "uptime": "_get_uptime",
+        "température": "_get_temperature",
+        "temperature": "_get_temperature",
+    }
+    
+    # Commandes puis mots-clés système (déclarés sans instancier l'agent)
+    routing_keywords = tuple(system_commands) + (
+        "info", "information", "status", "état", "performance",
+        "utilisation", "usage", "monitoring", "surveillance",
+        "os", "linux", "ubuntu", "windows"
+    )
+    
+    # Bonus pour requêtes système évidentes
+    routing_bonus_keywords = ('cpu', 'ram', 'disk', 'système', 'info')
+    routing_bonus = 1.0
+    
+    def __init__(self, sample_interval: float = None, sampler=None):
         super().__init__("SystemAgent", "Système et administration")
         
-        # Commandes système supportées
-        self.system_commands = {
-            "système": self._get_system_info,
-            "system": self._get_system_info,
-            "cpu": self._get_cpu_info,
-            "processeur": self._get_cpu_info,
-            "mémoire": self._get_memory_info,
-            "memory": self._get_memory_info,
-            "ram": self._get_memory_info,
-            "disque": self._get_disk_info,
-            "disk": self._get_disk_info,
-            "réseau": self._get_network_info,
-            "network": self._get_network_info,
-            "processus": self._get_process_info,
-            "process": self._get_process_info,
-            "uptime": self._get_uptime,
-            "température": self._get_temperature,
-            "temperature": self._get_temperature,
-        }
-    
-    def can_handle(self, query: str) -> bool:
-        """Détermine si cette requête concerne le système"""
-        query_clean = query.lower().strip()
-        
-        # Vérifier les commandes système
-        if any(cmd in query_clean for cmd in self.system_commands.keys()):
-            return True
-        
-        # Mots-clés système
-        system_keywords = [
-            "info", "information", "status", "état", "performance",
-            "utilisation", "usage", "monitoring", "surveillance",
-            "os", "linux", "ubuntu", "windows"
-        ]
-        
-        return any(keyword in query_clean for keyword in system_keywords)
+        # Métriques lues dans l'instantané de l'échantillonneur (psutil importé ici, démarré au premier usage)
+        if sampler is None:
+            from .system_sampler import get_shared_sampler
+            sampler = get_shared_sampler(sample_interval)
+        self.sampler = sampler
+    
+    def _snapshot(self) -> dict:
+        """Dernier instantané du sampler (attente de la première mesure bornée par le budget de la requête)"""
+        return self.sampler.get_snapshot(timeout=remaining_time(5.0))
     
     def process(self, query: str) -> str:
         """Traite les requêtes système"""
         query_clean = query.lower().strip()
         
         # Exécuter la commande système appropriée
-        for cmd, func in self.system_commands.items():
+        for cmd, method in self.system_commands.items():
             if cmd in query_clean:
                 try:
-                    return func()
+                    return getattr(self, method)()
                 except Exception as e:
                     return f"❌ Erreur système : {str(e)}"
         
@@ -86,21 +94,21 @@ class SystemAgent(BaseAgent):
     
     def _get_cpu_info(self) -> str:
         """Informations CPU"""
-        cpu_count = psutil.cpu_count()
-        cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_freq = psutil.cpu_freq()
+        snapshot = self._snapshot()
+        cpu_freq = snapshot["cpu_freq"]
         
         freq_info = f"⚡ Fréquence : {cpu_freq.current:.0f} MHz" if cpu_freq else ""
         
         return f"""🔧 **INFORMATIONS CPU**
-💎 Cœurs : {cpu_count}
-📊 Utilisation : {cpu_percent}%
+💎 Cœurs : {snapshot["cpu_count"]}
+📊 Utilisation : {snapshot["cpu_percent"]}%
 {freq_info}"""
     
     def _get_memory_info(self) -> str:
         """Informations mémoire"""
-        memory = psutil.virtual_memory()
-        swap = psutil.swap_memory()
+        snapshot = self._snapshot()
+        memory = snapshot["memory"]
+        swap = snapshot["swap"]
         
         return f"""🧠 **INFORMATIONS MÉMOIRE**
 💾 RAM Totale : {self._bytes_to_gb(memory.total)} GB
@@ -110,7 +118,7 @@ class SystemAgent(BaseAgent):
     
     def _get_disk_info(self) -> str:
         """Informations disque"""
-        disk_usage = psutil.disk_usage('/')
+        disk_usage = self._snapshot()["disk"]
         
         return f"""💽 **INFORMATIONS DISQUE**
 📦 Espace Total : {self._bytes_to_gb(disk_usage.total)} GB
@@ -119,41 +127,32 @@ class SystemAgent(BaseAgent):
     
     def _get_network_info(self) -> str:
         """Informations réseau"""
-        try:
-            net_io = psutil.net_io_counters()
-            return f"""🌐 **INFORMATIONS RÉSEAU**
+        net_io = self._snapshot()["network"]
+        if net_io is None:
+            return "🌐 Informations réseau non disponibles"
+        
+        return f"""🌐 **INFORMATIONS RÉSEAU**
 📡 Bytes envoyés : {self._bytes_to_mb(net_io.bytes_sent)} MB
 📥 Bytes reçus : {self._bytes_to_mb(net_io.bytes_recv)} MB
 📤 Paquets envoyés : {net_io.packets_sent:,}
 📨 Paquets reçus : {net_io.packets_recv:,}"""
-        except:
-            return "🌐 Informations réseau non disponibles"
     
     def _get_process_info(self) -> str:
         """Informations processus"""
-        process_count = len(psutil.pids())
-        top_processes = []
-        
-        try:
-            # Top 3 processus par CPU
-            processes = [(p.info['pid'], p.info['name'], p.info['cpu_percent']) 
-                        for p in psutil.process_iter(['pid', 'name', 'cpu_percent'])]
-            top_processes = sorted(processes, key=lambda x: x[2] if x[2] else 0, reverse=True)[:3]
-        except:
-            pass
+        snapshot = self._snapshot()
         
         result = f"""⚡ **INFORMATIONS PROCESSUS**
-📊 Nombre total : {process_count}
+📊 Nombre total : {snapshot["process_count"]}
 🔥 Top processus (CPU) :"""
         
-        for pid, name, cpu in top_processes:
+        for pid, name, cpu in self.sampler.get_top_processes(3):
             result += f"\n   • {name} (PID {pid}) : {cpu}%"
         
         return result
     
     def _get_uptime(self) -> str:
         """Temps de fonctionnement"""
-        boot_time = datetime.fromtimestamp(psutil.boot_time())
+        boot_time = datetime.fromtimestamp(self._snapshot()["boot_time"])
         uptime = datetime.now() - boot_time
         
         return f"""⏰ **TEMPS DE FONCTIONNEMENT**
@@ -162,28 +161,27 @@ class SystemAgent(BaseAgent):
     
     def _get_temperature(self) -> str:
         """Température système (si disponible)"""
-        try:
-            temps = psutil.sensors_temperatures()
-            if temps:
-                result = "🌡️ **TEMPÉRATURES**\n"
-                for name, entries in temps.items():
-                    for entry in entries:
-                        result += f"🔥 {entry.label or name} : {entry.current}°C\n"
-                return result.strip()
-            else:
-                return "🌡️ Capteurs de température non disponibles"
-        except:
+        temps = self._snapshot()["temperatures"]
+        if temps is None:
             return "🌡️ Informations de température non accessibles"
+        if not temps:
+            return "🌡️ Capteurs de température non disponibles"
+        
+        result = "🌡️ **TEMPÉRATURES**\n"
+        for name, entries in temps.items():
+            for entry in entries:
+                result += f"🔥 {entry.label or name} : {entry.current}°C\n"
+        return result.strip()
     
     def _get_system_overview(self) -> str:
         """Vue d'ensemble du système"""
-        cpu = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        snapshot = self._snapshot()
+        memory = snapshot["memory"]
+        disk = snapshot["disk"]
         
         return f"""📊 **APERÇU SYSTÈME**
 💻 OS : {platform.system()} {platform.release()}
-🔧 CPU : {cpu}% utilisé
+🔧 CPU : {snapshot["cpu_percent"]}% utilisé
 🧠 RAM : {memory.percent}% utilisée ({self._bytes_to_gb(memory.available)} GB libre)
 💽 Disque : {(disk.used / disk.total * 100):.1f}% utilisé"""
     
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+📡 System Sampler - Collecte des métriques système en arrière-plan
+"""
+
+import os
+import time
+import atexit
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+from .config import CONFIG_FILE, load_section
+
+DEFAULT_SETTINGS = {
+    "interval": 2.0,           # Secondes entre deux mesures (CPU, mémoire, disque, réseau, températures)
+    "process_interval": 10.0,  # Âge maximal du classement des processus, relevé à la demande
+}
+
+
+def load_sampler_settings(config_path: Path = CONFIG_FILE) -> Dict:
+    """Paramètres de l'échantillonneur : section "system_sampler" de la configuration"""
+    return load_section("system_sampler", DEFAULT_SETTINGS, config_path)
+
+
+class SystemSampler:
+    """Échantillonne périodiquement CPU, mémoire, disque, réseau et températures ; les processus les plus
+    gourmands sont relevés à la demande (parcours de tous les processus, au plus une fois par `process_interval`)"""
+
+    def __init__(self, interval: float = 2.0, disk_path: str = '/', process_interval: float = 10.0):
+        self.interval = interval
+        self.disk_path = disk_path
+        self.process_interval = process_interval
+        self._snapshot = None
+        self._top_processes = None  # (horodatage, classement)
+        self._process_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Démarre le thread d'échantillonnage (une fois par processus)"""
+        with self._lock:
+            # Après un fork, le thread du parent n'existe plus dans l'enfant
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name="nina-system-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Arrête proprement le thread d'échantillonnage"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            thread.join(timeout)
+        self._thread = None
+
+    def is_running(self) -> bool:
+        """Indique si l'échantillonnage tourne dans ce processus"""
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def get_snapshot(self, timeout: float = 5.0) -> Dict:
+        """Retourne le dernier instantané (démarre l'échantillonnage au premier appel)"""
+        if not self.is_running():
+            self.start()
+        if self._snapshot is None:
+            self._ready.wait(timeout)
+        if self._snapshot is None:
+            raise RuntimeError("aucune mesure système disponible")
+        return self._snapshot
+
+    def _run(self):
+        """Boucle d'échantillonnage"""
+        # Première mesure CPU sur une courte fenêtre, les suivantes couvrent l'intervalle écoulé
+        first = True
+        while not self._stop.is_set():
+            try:
+                cpu_window = min(self.interval, 0.5) if first else None
+                self._snapshot = self._collect(cpu_window)
+                self._ready.set()
+                first = False
+            except Exception as e:
+                print(f"⚠️ Erreur échantillonnage système : {e}")
+            self._stop.wait(self.interval)
+
+    def _collect(self, cpu_window: Optional[float]) -> Dict:
+        """Collecte une mesure complète (remplacée atomiquement)"""
+        snapshot = {
+            "timestamp": time.time(),
+            "cpu_percent": psutil.cpu_percent(interval=cpu_window),
+            "cpu_count": psutil.cpu_count(),
+            "cpu_freq": self._safe(psutil.cpu_freq),
+            "memory": psutil.virtual_memory(),
+            "swap": psutil.swap_memory(),
+            "disk": self._safe(lambda: psutil.disk_usage(self.disk_path)),
+            "network": self._safe(psutil.net_io_counters),
+            "temperatures": self._safe(psutil.sensors_temperatures) if hasattr(psutil, "sensors_temperatures") else None,
+            "boot_time": psutil.boot_time(),
+            "process_count": len(psutil.pids()),
+        }
+        return snapshot
+
+    def get_top_processes(self, count: int = 3) -> List[Tuple[int, str, float]]:
+        """Processus les plus gourmands en CPU (pid, nom, %), relevés au plus une fois par `process_interval`"""
+        with self._process_lock:
+            now = time.monotonic()
+            if self._top_processes is None or now - self._top_processes[0] >= self.process_interval:
+                # Premier relevé : le % CPU d'un processus se mesure entre deux lectures, d'où une courte fenêtre
+                if self._top_processes is None:
+                    self._scan_processes()
+                    time.sleep(min(self.process_interval, 0.2))
+                self._top_processes = (time.monotonic(), self._scan_processes())
+            return self._top_processes[1][:count]
+
+    def _scan_processes(self) -> List[Tuple[int, str, float]]:
+        """Parcourt les processus, classés par % CPU depuis le relevé précédent"""
+        try:
+            processes = [(p.info['pid'], p.info['name'], p.info['cpu_percent'] or 0.0)
+                         for p in psutil.process_iter(['pid', 'name', 'cpu_percent'])]
+        except Exception:
+            return []
+        return sorted(processes, key=lambda x: x[2], reverse=True)
+
+    def _safe(self, reader):
+        """Lit une métrique optionnelle (None si indisponible)"""
+        try:
+            return reader()
+        except Exception:
+            return None
+
+
+class StaticSampler(SystemSampler):
+    """Échantillonneur figé (benchmarks, tests de charge) : aucune lecture psutil"""
+
+    def __init__(self, snapshot: Dict = None):
+        super().__init__()
+        self._snapshot = snapshot if snapshot is not None else static_snapshot()
+
+    def start(self):
+        pass
+
+    def stop(self, timeout: float = 2.0):
+        pass
+
+    def is_running(self) -> bool:
+        return True
+
+    def get_top_processes(self, count: int = 3) -> List[Tuple[int, str, float]]:
+        return self._snapshot["top_processes"][:count]
+
+
+def static_snapshot() -> Dict:
+    """Instantané déterministe d'une machine fictive (mêmes champs que psutil)"""
+    gb = 1024 ** 3
+    return {
+        "timestamp": 0.0,
+        "cpu_percent": 12.5,
+        "cpu_count": 8,
+        "cpu_freq": SimpleNamespace(current=2400.0),
+        "memory": SimpleNamespace(total=16 * gb, available=10 * gb, percent=37.5),
+        "swap": SimpleNamespace(total=2 * gb, percent=0.0),
+        "disk": SimpleNamespace(total=256 * gb, free=128 * gb, used=128 * gb),
+        "network": SimpleNamespace(bytes_sent=10 * 1024 ** 2, bytes_recv=50 * 1024 ** 2,
+                                   packets_sent=12000, packets_recv=48000),
+        "temperatures": {"coretemp": [SimpleNamespace(label="Package id 0", current=45.0)]},
+        "boot_time": 1700000000.0,
+        "process_count": 250,
+        "top_processes": [(1, "systemd", 0.5), (1000, "python", 0.3), (1200, "ollama", 0.1)],
+    }
+
+
+_shared_samplers = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_sampler(interval: float = None) -> SystemSampler:
+    """Retourne l'échantillonneur partagé du processus pour cet intervalle (configuré par défaut)"""
+    settings = load_sampler_settings()
+    if interval is None:
+        interval = settings["interval"]
+    with _shared_lock:
+        if interval not in _shared_samplers:
+            _shared_samplers[interval] = SystemSampler(interval, process_interval=settings["process_interval"])
+        return _shared_samplers[interval]
+
+
+@atexit.register
+def _stop_shared_samplers():
+    """Arrête les échantillonneurs à la sortie du processus"""
+    for sampler in list(_shared_samplers.values()):
+        sampler.stop(timeout=1.0)
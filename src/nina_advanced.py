@@ -13,9 +13,14 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from agents.response_store import ResponseStore
+from agents.streaming import render_stream
+from agents.query_normalizer import KEY_VERSION, canonicalize
+
 # Import des agents (avec gestion d'erreurs)
 try:
     from agents.agent_manager import AgentManager
+    from agents.response_cache import FRESH, load_cache_settings
     AGENTS_AVAILABLE = True
 except ImportError:
     AGENTS_AVAILABLE = False
@@ -25,7 +30,8 @@ except ImportError:
 PROJECT_ROOT = Path(__file__).parent.parent
 CACHE_DIR = PROJECT_ROOT / "cache"
 CONFIG_DIR = PROJECT_ROOT / "config"
-CACHE_FILE = CACHE_DIR / "nina_advanced_cache.json"
+CACHE_FILE = CACHE_DIR / "nina_advanced_cache.json"  # Ancien format (migré au démarrage)
+CACHE_DB = CACHE_DIR / "nina_advanced_cache.db"
 
 # Créer dossiers
 CACHE_DIR.mkdir(exist_ok=True)
@@ -36,10 +42,12 @@ console = Console()
 class NinaAdvanced:
     """Nina Advanced - IA avec agents spécialisés"""
     
-    def __init__(self):
+    def __init__(self, agent_manager=None, cache_db: Path = None, defer_warm_up: bool = False):
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.cache = {}
-        self.agent_manager = None
+        self.agent_manager = agent_manager
+        self.cache_db = cache_db or CACHE_DB
+        self.defer_warm_up = defer_warm_up  # Préchauffage de l'agent LLM lancé plus tard (serveur préforké)
         
         # Réponses de base (fallback)
         self.basic_responses = {
@@ -50,16 +58,24 @@ class NinaAdvanced:
             "agents": "Mes agents : 🔢 Math, 🧠 Connaissances, ⚙️ Système",
         }
         
+        # Réponses de base retrouvées sous leur forme canonique ("Bonjour !" -> "bonjour")
+        self._basic_index = {canonicalize(key): response for key, response in self.basic_responses.items()}
+        
         # Initialiser les agents
         self._initialize_agents()
         self._load_cache()
     
     def _initialize_agents(self):
         """Initialise le système d'agents"""
+        if self.agent_manager is not None:
+            return
+        
         if AGENTS_AVAILABLE:
             try:
-                self.agent_manager = AgentManager()
+                self.agent_manager = AgentManager(defer_warm_up=self.defer_warm_up)
                 console.print("✅ [green]Système d'agents initialisé avec succès[/green]")
+                # Réponses des requêtes les plus fréquentes calculées avant la première question
+                self.agent_manager.prewarm()
             except Exception as e:
                 console.print(f"❌ [red]Erreur initialisation agents: {e}[/red]")
                 self.agent_manager = None
@@ -67,43 +83,93 @@ class NinaAdvanced:
             console.print("⚠️ [yellow]Mode de base sans agents spécialisés[/yellow]")
     
     def _load_cache(self):
-        """Charge le cache depuis le fichier"""
+        """Ouvre le cache persistant (lectures par clé, sans tout charger)"""
         try:
-            if CACHE_FILE.exists():
-                with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
+            legacy_json = CACHE_FILE if self.cache_db == CACHE_DB else None
+            # Cache partagé entre workers : chaque écriture validée aussitôt, visible par les autres
+            shared = AGENTS_AVAILABLE and load_cache_settings()["cache_backend"] == "shared"
+            self.cache = ResponseStore(self.cache_db, legacy_json=legacy_json, flush_every=1 if shared else 32)
+            # Entrées de l'ancien cache (clé query.lower().strip()) retrouvées sous leur forme canonique
+            self.cache.rekey(canonicalize, KEY_VERSION)
         except Exception as e:
             console.print(f"⚠️ [yellow]Erreur chargement cache: {e}[/yellow]")
             self.cache = {}
     
-    def _save_cache(self):
-        """Sauvegarde le cache"""
+    def _save_cache(self, shutdown: bool = False):
+        """Valide les écritures de cache et du journal en attente, sauve les caches des agents
+        (shutdown : arrêt de Nina, le thread d'écriture du journal s'arrête aussi)"""
         try:
-            with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
+            if isinstance(self.cache, ResponseStore):
+                self.cache.flush()
+            journal = self.agent_manager.journal if self.agent_manager else None
+            if journal is not None:
+                if shutdown:
+                    journal.close()
+                else:
+                    journal.flush()
+            if self.agent_manager and self.agent_manager.snapshots is not None:
+                self.agent_manager.snapshots.save(self.agent_manager.loaded_agents())
         except Exception as e:
             console.print(f"⚠️ [yellow]Erreur sauvegarde cache: {e}[/yellow]")
     
+    def close(self):
+        """Valide et ferme le cache persistant (instance remplacée, par exemple au rechargement du serveur)"""
+        if isinstance(self.cache, ResponseStore):
+            self.cache.close()
+    
+    def _journal(self, query: str, result: dict):
+        """Journalise une requête servie sans agent (cache local, réponse de base)"""
+        if self.agent_manager:
+            self.agent_manager.journal_result(query, result, source="nina")
+    
+    def _get_cached(self, cache_key: str):
+        """Retourne la réponse en cache si elle est encore fraîche pour son agent"""
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        # Une entrée périmée retombe sur les agents (qui gèrent stale-while-revalidate)
+        if self.agent_manager:
+            freshness = self.agent_manager.get_freshness(entry.get("agent"))
+            if freshness.state(time.time() - entry.get("cached_at", 0)) != FRESH:
+                return None
+        
+        return entry["response"]
+    
     def get_response(self, query: str) -> str:
         """Obtient une réponse intelligente"""
+        return "".join(self.get_response_stream(query))
+    
+    def get_response_stream(self, query: str):
+        """Obtient une réponse intelligente, produite par morceaux"""
         start_time = time.time()
         
-        # Vérifier le cache local d'abord
-        cache_key = query.lower().strip()
-        if cache_key in self.cache:
+        # Vérifier le cache local d'abord (clé canonique : casse, accents, ponctuation)
+        cache_key = canonicalize(query)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
             response_time = (time.time() - start_time) * 1000
-            return f"{self.cache[cache_key]} ⚡ (cache: {response_time:.1f}ms)"
+            self._journal(query, {"agent": "cache", "cached": True, "total_time": response_time})
+            yield f"{cached} ⚡ (cache: {response_time:.1f}ms)"
+            return
         
         # Réponses de base rapides
-        if cache_key in self.basic_responses:
-            response = self.basic_responses[cache_key]
+        if cache_key in self._basic_index:
+            response = self._basic_index[cache_key]
             response_time = (time.time() - start_time) * 1000
-            return f"{response} ⚡ ({response_time:.1f}ms)"
+            self._journal(query, {"agent": "basic", "cached": True, "total_time": response_time})
+            yield f"{response} ⚡ ({response_time:.1f}ms)"
+            return
         
         # Utiliser les agents si disponibles
         if self.agent_manager:
             try:
-                result = self.agent_manager.process_query(query)
+                trace = {} if self.agent_manager.journal is not None else None
+                stream = self.agent_manager.process_query_stream(query, trace=trace)
+                yield from stream
+                result = stream.result
+                if trace is not None:
+                    self.agent_manager.journal_result(query, result, trace, source="nina")
                 
                 # Ajouter les métriques
                 confidence_emoji = "🎯" if result.get("confidence", 0) > 0.7 else "🤔"
@@ -111,20 +177,24 @@ class NinaAdvanced:
                 response_time = result.get("response_time", 0)
                 cached_status = "📋" if result.get("cached", False) else "🔄"
                 
-                full_response = f"{result['response']}\n\n{confidence_emoji} Agent: {agent_name} | {cached_status} {response_time:.1f}ms"
-                
-                # Mettre en cache les bonnes réponses
-                if result.get("confidence", 0) > 0.6:
-                    self.cache[cache_key] = result['response']
-                    self._save_cache()
+                # Mettre en cache les bonnes réponses (si la politique de l'agent le permet,
+                # et jamais une réponse périmée qui paraîtrait fraîche)
+                freshness = self.agent_manager.get_freshness(agent_name)
+                if result.get("confidence", 0) > 0.6 and freshness.is_cacheable() and not result.get("stale"):
+                    self.cache[cache_key] = {
+                        "response": result['response'],
+                        "agent": agent_name,
+                        "cached_at": time.time()
+                    }
                 
-                return full_response
+                yield f"\n\n{confidence_emoji} Agent: {agent_name} | {cached_status} {response_time:.1f}ms"
                 
             except Exception as e:
-                return f"❌ Erreur agents: {str(e)}"
+                yield f"❌ Erreur agents: {str(e)}"
+            return
         
         # Fallback sans agents
-        return f"🤔 Question intéressante ! (Mode de base - agents non disponibles)"
+        yield f"🤔 Question intéressante ! (Mode de base - agents non disponibles)"
     
     def display_header(self):
         """Affiche l'en-tête Nina Advanced"""
@@ -162,23 +232,28 @@ class NinaAdvanced:
             table.add_column("Spécialité", style="magenta")
             table.add_column("Requêtes", style="green")
             table.add_column("Cache", style="yellow")
-            table.add_column("Temps moy.", style="blue")
+            table.add_column("p50 / p95 / p99", style="blue")
+            table.add_column("Cache p50", style="yellow")
             
             for agent_info in status["agents"]:
                 if "error" in agent_info:
                     table.add_row(
                         agent_info.get("name", "Unknown"),
                         "❌ Erreur",
-                        "-", "-", "-"
+                        "-", "-", "-", "-"
                     )
                 else:
                     perf = agent_info.get("performance", {})
+                    # Percentiles des réponses calculées, médiane des réponses du cache
+                    computed = agent_info["latency"]["miss"]
+                    cached = agent_info["latency"]["hit"]
                     table.add_row(
                         agent_info.get("name", "Unknown"),
                         agent_info.get("speciality", "Unknown"),
                         str(perf.get("requests", 0)),
                         str(agent_info.get("cache_size", 0)),
-                        f"{perf.get('avg_response_time', 0):.1f}ms"
+                        f"{computed['p50']:.2f} / {computed['p95']:.2f} / {computed['p99']:.2f}ms",
+                        f"{cached['p50']:.3f}ms"
                     )
             
             console.print(table)
@@ -194,6 +269,10 @@ class NinaAdvanced:
         console.clear()
         self.display_header()
         
+        # Workers du pool de processus préchauffés pendant la saisie de la première question
+        if self.agent_manager:
+            self.agent_manager.warm_up_process_pool()
+        
         console.print("\n[bold green]🚀 Nina Advanced prête ! Agents IA spécialisés activés[/bold green]")
         console.print("[dim]💡 Essayez: 2+3, pourquoi le ciel est bleu, cpu info, agents status[/dim]\n")
         
@@ -202,6 +281,7 @@ class NinaAdvanced:
                 query = console.input("\n[bold cyan]🎤 Vous:[/bold cyan] ")
                 
                 if query.lower() in ['quit', 'exit', 'bye']:
+                    self._save_cache(shutdown=True)
                     console.print("\n[bold magenta]👋 À bientôt ! Nina Advanced s'arrête...[/bold magenta]")
                     break
                 
@@ -223,16 +303,13 @@ class NinaAdvanced:
                     console.print("✅ [green]Cache principal vidé[/green]")
                     continue
                 
-                # Traitement intelligent
-                response = self.get_response(query)
-                
-                # Affichage avec style
-                panel = Panel(
-                    response,
+                # Traitement intelligent, affiché au fil de l'eau
+                render_stream(
+                    console,
+                    self.get_response_stream(query),
                     title="[bold green]🧠 Nina Advanced[/bold green]",
                     border_style="green"
                 )
-                console.print(panel)
                 
             except KeyboardInterrupt:
                 console.print("\n[bold red]👋 Interruption détectée![/bold red]")
@@ -4,9 +4,7 @@
 Combine Nina Fast + Claude API + Cache intelligent
 """
 
-import json
 import time
-import requests
 import hashlib
 from datetime import datetime
 from pathlib import Path
@@ -14,6 +12,10 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
+from agents.expression import default_engine, ExpressionError, ExpressionBudgetError
+from agents.metrics import LatencyHistogram
+from agents.streaming import render_stream
+
 # Configuration
 PROJECT_ROOT = Path(__file__).parent.parent
 CACHE_DIR = PROJECT_ROOT / "cache"
@@ -46,6 +48,8 @@ class NinaHybrid:
             "openai": "OpenAI GPT peut aussi être intégré pour plus d'intelligence !",
             "config": "Utilisez 'setup' pour configurer les APIs externes !"
         }
+        # Délai avant le premier morceau affiché
+        self.first_chunk_latency = LatencyHistogram()
         
     def is_simple_query(self, query):
         """Détermine si la requête peut être traitée localement"""
@@ -77,11 +81,13 @@ class NinaHybrid:
         # Calculs
         if any(op in query for op in ['+', '-', '*', '/']):
             try:
-                expr = ''.join(c for c in query if c.isdigit() or c in '+-*/.() ')
-                if expr.strip():
-                    result = eval(expr)
+                expr = default_engine.extract(query)
+                if expr:
+                    result = default_engine.evaluate(expr)
                     return f"{query} = {result}"
-            except:
+            except ExpressionBudgetError:
+                return "Calcul trop coûteux, je refuse de le lancer."
+            except ExpressionError:
                 return "Calcul non reconnu. Essaie : 5+3, 10*2, etc."
         
         # Heure
@@ -102,6 +108,10 @@ class NinaHybrid:
     
     def get_response(self, query):
         """Obtient la meilleure réponse"""
+        return "".join(self.get_response_stream(query))
+    
+    def get_response_stream(self, query):
+        """Obtient la meilleure réponse, produite par morceaux"""
         start_time = time.time()
         
         # Traitement local rapide
@@ -110,7 +120,8 @@ class NinaHybrid:
             if response:
                 elapsed = (time.time() - start_time) * 1000
                 console.print(f"[dim]⚡ Local ({elapsed:.1f}ms)[/dim]")
-                return response
+                yield response
+                return
         
         # Pour questions complexes - simulation API
         elapsed = (time.time() - start_time) * 1000
@@ -118,13 +129,18 @@ class NinaHybrid:
         
         # Réponses intelligentes simulées
         if "pourquoi" in query.lower():
-            return f"C'est une excellente question sur '{query}'. Les APIs externes comme Claude pourraient donner une réponse très détaillée ici !"
+            response = f"C'est une excellente question sur '{query}'. Les APIs externes comme Claude pourraient donner une réponse très détaillée ici !"
         elif "comment" in query.lower():
-            return f"Pour '{query}', une IA avancée analyserait le contexte et donnerait des étapes précises. Configuration API recommandée !"
+            response = f"Pour '{query}', une IA avancée analyserait le contexte et donnerait des étapes précises. Configuration API recommandée !"
         elif len(query.split()) > 5:
-            return f"Question complexe détectée : '{query}'. Avec Claude API configuré, j'aurais une réponse très intelligente !"
+            response = f"Question complexe détectée : '{query}'. Avec Claude API configuré, j'aurais une réponse très intelligente !"
         else:
-            return f"Question intéressante : '{query}'. Nina Hybrid peut être encore plus intelligente avec des APIs IA externes !"
+            response = f"Question intéressante : '{query}'. Nina Hybrid peut être encore plus intelligente avec des APIs IA externes !"
+        
+        # Mot par mot, comme le flux d'une API externe
+        words = response.split(" ")
+        for index, word in enumerate(words):
+            yield word if index == len(words) - 1 else word + " "
     
     def show_status(self):
         """Affiche le statut"""
@@ -137,6 +153,8 @@ class NinaHybrid:
         table.add_row("Claude API", "⚙️ Prêt à configurer")
         table.add_row("OpenAI API", "⚙️ Prêt à configurer")
         table.add_row("Mode Hybride", "✅ Fonctionnel")
+        first_chunk = self.first_chunk_latency.summary()
+        table.add_row("Premier morceau", f"p50 {first_chunk['p50']:.1f}ms | p95 {first_chunk['p95']:.1f}ms")
         
         console.print(table)
     
@@ -178,16 +196,14 @@ class NinaHybrid:
                     self.display_header()
                     continue
                 
-                # Traitement intelligent
-                response = self.get_response(query)
-                
-                # Affichage
-                panel = Panel(
-                    response,
+                # Traitement intelligent, affiché au fil de l'eau
+                render_stream(
+                    console,
+                    self.get_response_stream(query),
                     title="[bold green]🧠 Nina Hybrid[/bold green]",
-                    border_style="green"
+                    border_style="green",
+                    first_chunk_latency=self.first_chunk_latency
                 )
-                console.print(panel)
                 
             except KeyboardInterrupt:
                 console.print("\n[bold red]👋 Interruption détectée![/bold red]")
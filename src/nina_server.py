@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+🌐 Nina Server - Service HTTP/JSON local avec workers préforkés
+Expose NinaAdvanced et l'AgentManager sur localhost
+"""
+
+import os
+import gc
+import json
+import time
+import signal
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from nina_advanced import NinaAdvanced
+
+# Instance chargée dans le parent avant le fork (partagée en copy-on-write)
+nina = None
+started_at = time.time()
+
+
+class NinaRequestHandler(BaseHTTPRequestHandler):
+    """Gestionnaire HTTP/1.1 (keep-alive) des requêtes JSON"""
+
+    protocol_version = "HTTP/1.1"
+    timeout = 5  # Fermeture des connexions keep-alive inactives
+    server_version = "NinaServer/1.0"
+
+    def do_GET(self):
+        """Routes de supervision"""
+        if self.path == "/health":
+            self._send_json(200, {
+                "status": "ok",
+                "pid": os.getpid(),
+                "uptime": round(time.time() - started_at, 1)
+            })
+        elif self.path == "/status":
+            status = nina.agent_manager.get_agent_status() if nina.agent_manager else {}
+            status["pid"] = os.getpid()
+            self._send_json(200, status)
+        elif self.path == "/metrics":
+            # Métriques du worker qui répond (une cible Prometheus par worker ou agrégation en amont)
+            metrics = nina.agent_manager.export_prometheus() if nina.agent_manager else ""
+            self._send_text(200, metrics, "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._send_json(404, {"error": f"route inconnue : {self.path}"})
+
+    def do_POST(self):
+        """Routes de traitement des requêtes"""
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            query = payload["query"]
+            # Budget facultatif en ms : au-delà, réponse périmée ou délai dépassé plutôt qu'une attente
+            # (deux requêtes identiques avec budget ne partagent pas leur calcul)
+            deadline = payload.get("deadline_ms")
+            deadline = float(deadline) / 1000 if deadline is not None else None
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self._send_json(400, {"error": "corps JSON attendu : {\"query\": \"...\"}"})
+            return
+
+        if self.path == "/query":
+            if not nina.agent_manager:
+                self._send_json(503, {"error": "agents non disponibles"})
+                return
+            result = nina.agent_manager.process_query(query, deadline=deadline, hedge=bool(payload.get("hedge")))
+            self._send_json(200, result.to_dict())
+        elif self.path == "/response":
+            self._send_json(200, {"response": nina.get_response(query)})
+        else:
+            self._send_json(404, {"error": f"route inconnue : {self.path}"})
+
+    def _send_json(self, status: int, data: dict):
+        """Envoie une réponse JSON avec Content-Length (nécessaire au keep-alive)"""
+        self._send_text(status, json.dumps(data, ensure_ascii=False, default=str), "application/json; charset=utf-8")
+    
+    def _send_text(self, status: int, text: str, content_type: str):
+        """Envoie un corps texte avec Content-Length (nécessaire au keep-alive)"""
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Journal d'accès discret"""
+        pass
+
+
+class NinaHTTPServer(ThreadingHTTPServer):
+    """Serveur HTTP d'un worker (un thread par connexion)"""
+
+    # Arrêt gracieux : attendre la fin des requêtes en cours
+    daemon_threads = False
+    block_on_close = True
+
+
+class PreforkServer:
+    """Processus maître : charge Nina une fois, forke les workers et les supervise"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: int = 2):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.server = None
+        self.children = set()
+        self._reload = False
+        self._running = True
+
+    def load(self):
+        """(Re)charge agents et caches dans le parent"""
+        global nina
+        # Ancienne instance fermée (cache persistant, handler atexit) puis rendue au GC avec les objets gelés
+        if nina is not None:
+            nina.close()
+            nina = None
+        gc.unfreeze()
+        # Aucun thread de préchauffage dans le maître : chaque worker lance le sien après le fork
+        nina = NinaAdvanced(defer_warm_up=True)
+        # Agents chargés au premier usage : les instancier ici pour que les workers les héritent
+        if nina.agent_manager:
+            nina.agent_manager.load_all()
+            # Le maître ne sert aucune requête : seuls les workers sauvent leurs caches
+            if nina.agent_manager.snapshots is not None:
+                nina.agent_manager.snapshots.close(save=False)
+        # Geler les objets existants : le GC ne les touchera plus, les pages restent partagées
+        gc.collect()
+        gc.freeze()
+
+    def serve(self):
+        """Boucle du processus maître"""
+        self.load()
+        self.server = NinaHTTPServer((self.host, self.port), NinaRequestHandler)
+        self.port = self.server.server_address[1]  # Port choisi par le système si 0 a été demandé
+        print(f"🌐 Nina Server sur http://{self.host}:{self.port} ({self.workers} workers)")
+
+        # Sans fork (Windows) ou sans worker demandé : un seul processus
+        if self.workers <= 0 or not hasattr(os, "fork"):
+            if nina.agent_manager:
+                nina.agent_manager.warm_up_agents()
+                nina.agent_manager.start_snapshots()
+            try:
+                self.server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                self.server.server_close()
+            return
+
+        signal.signal(signal.SIGHUP, self._on_reload)
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+
+        self._spawn(self.workers)
+        while self._running:
+            if self._reload:
+                self._reload = False
+                self._graceful_reload()
+            self._reap()
+            time.sleep(0.2)
+
+        self._stop_children(self.children)
+        self.server.server_close()
+
+    def _spawn(self, count: int):
+        """Forke `count` workers qui servent la socket d'écoute partagée"""
+        for _ in range(count):
+            pid = os.fork()
+            if pid == 0:
+                self._worker_main()
+            self.children.add(pid)
+
+    def _worker_main(self):
+        """Point d'entrée d'un worker (ne retourne jamais)"""
+        def stop(signum, frame):
+            # shutdown() attend la fin de serve_forever : à lancer hors du thread principal
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+        # Pool de processus et préchauffage du LLM propres au worker (jamais lancés dans le maître)
+        if nina.agent_manager:
+            nina.agent_manager.warm_up_process_pool()
+            nina.agent_manager.warm_up_agents()
+            nina.agent_manager.start_snapshots()
+
+        exit_code = 0
+        try:
+            self.server.serve_forever()
+            self.server.server_close()
+            nina._save_cache(shutdown=True)
+        except Exception as e:
+            print(f"❌ Worker {os.getpid()} : {e}")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _graceful_reload(self):
+        """Recharge Nina, démarre de nouveaux workers puis arrête les anciens"""
+        print("🔄 Rechargement gracieux des workers...")
+        old_children = set(self.children)
+        self.load()
+        self.children -= old_children
+        self._spawn(self.workers)
+        self._stop_children(old_children)
+
+    def _reap(self):
+        """Récupère les workers terminés et remplace ceux morts de façon inattendue"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid in self.children:
+                self.children.discard(pid)
+                if self._running:
+                    print(f"⚠️ Worker {pid} arrêté (statut {status}), redémarrage")
+                    self._spawn(1)
+
+    def _stop_children(self, children, timeout: float = 10.0):
+        """Arrêt gracieux (SIGTERM) puis forcé (SIGKILL) des workers donnés"""
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.time() + timeout
+        pending = set(children)
+        while pending and time.time() < deadline:
+            for pid in list(pending):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    pending.discard(pid)
+            time.sleep(0.05)
+
+        for pid in pending:
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+
+    def _on_reload(self, signum, frame):
+        self._reload = True
+
+    def _on_stop(self, signum, frame):
+        self._running = False
+
+
+def main():
+    """Point d'entrée du serveur"""
+    parser = argparse.ArgumentParser(description="Nina Server - API HTTP/JSON locale")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute (localhost par défaut)")
+    parser.add_argument("--port", type=int, default=8765, help="Port d'écoute (0 : port libre)")
+    parser.add_argument("--workers", type=int, default=2, help="Nombre de workers préforkés (0 = un seul processus)")
+    args = parser.parse_args()
+
+    PreforkServer(args.host, args.port, args.workers).serve()
+
+
+if __name__ == "__main__":
+    main()
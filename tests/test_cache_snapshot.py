@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+📸 Tests des instantanés de cache - Sauvegarde puis restauration, entrées périmées écartées, préchauffage
+"""
+
+import time
+
+import pytest
+
+from agents.agent_manager import AgentManager
+from agents.base_agent import BaseAgent
+from agents.cache_snapshot import HEADER, CacheSnapshotter, prewarm, read_prewarm_queries, restore_snapshot, \
+    save_snapshot
+from agents.response_cache import FreshnessPolicy, ResponseCache
+
+TTL = FreshnessPolicy.time_to_live(ttl=60.0)
+
+
+class EchoAgent(BaseAgent):
+    """Agent des requêtes "écho", compte ses calculs"""
+
+    routing_keywords = ("écho",)
+
+    def __init__(self):
+        super().__init__("EchoAgent", "Tests", cache=ResponseCache(near_duplicate_threshold=0.8))
+        self.calls = 0
+
+    def process(self, query: str) -> str:
+        self.calls += 1
+        return query.upper()
+
+
+class ListJournal:
+    """Journal en mémoire"""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, entry):
+        self.records.append(entry)
+
+
+def test_save_and_restore_round_trip(tmp_path):
+    cache = ResponseCache(near_duplicate_threshold=0.8)
+    now = time.time()
+    cache.set(b"k" * 16, "fraîche", stored_at=now - 10, text="question fraiche")
+    cache.set(b"v" * 16, "périmée", stored_at=now - 120, text="question perimee")
+    cache.set(b"s" * 16, "sans texte", stored_at=now - 5)
+    cache.set(b"u" * 16, "réponse accentuée ✓ " * 50, stored_at=now - 1)
+
+    path = tmp_path / "EchoAgent.ncs"
+    assert save_snapshot(cache, TTL, path) == 3
+
+    restored = ResponseCache(near_duplicate_threshold=0.8)
+    assert restore_snapshot(restored, TTL, path) == 3
+    assert [entry[:2] for entry in restored.entries()] == [
+        (b"k" * 16, "fraîche"), (b"s" * 16, "sans texte"), (b"u" * 16, "réponse accentuée ✓ " * 50),
+    ]
+    assert restored.entries()[0][2] == pytest.approx(now - 10)
+    assert restored.entries()[0][3] == "question fraiche"
+    assert restored.entries()[1][3] is None
+    assert restored.peek(b"v" * 16) is None
+
+
+def test_entries_gone_stale_since_the_save_are_dropped(tmp_path):
+    cache = ResponseCache()
+    cache.set(b"k" * 16, "réponse", stored_at=time.time() - 50)
+    path = tmp_path / "agent.ncs"
+    assert save_snapshot(cache, TTL, path) == 1
+
+    restored = ResponseCache()
+    assert restore_snapshot(restored, FreshnessPolicy.time_to_live(ttl=30.0), path) == 0
+    assert len(restored) == 0
+
+
+def test_bad_magic_and_missing_file(tmp_path):
+    path = tmp_path / "agent.ncs"
+    assert restore_snapshot(ResponseCache(), TTL, path) == 0
+
+    path.write_bytes(HEADER.pack(b"NINACS01", time.time(), 0))
+    with pytest.raises(ValueError):
+        restore_snapshot(ResponseCache(), TTL, path)
+
+    # Via le snapshotter : instantané ignoré et compté, jamais d'exception au démarrage
+    agent = EchoAgent()
+    snapshots = CacheSnapshotter(tmp_path)
+    path.rename(snapshots.path_for(agent))
+    assert snapshots.restore(agent) == 0
+    assert snapshots.stats["errors"] == 1
+
+
+def test_truncated_snapshot_is_rejected(tmp_path):
+    agent = EchoAgent()
+    agent.execute("écho un")
+    snapshots = CacheSnapshotter(tmp_path)
+    assert snapshots.save([agent]) == 1
+
+    path = snapshots.path_for(agent)
+    path.write_bytes(path.read_bytes()[:HEADER.size + 4])
+    fresh = EchoAgent()
+    assert snapshots.restore(fresh) == 0
+    assert snapshots.stats["errors"] == 1
+    assert len(fresh.cache) == 0
+
+
+def test_snapshotter_restores_agent_cache(tmp_path):
+    agent = EchoAgent()
+    agent.execute("écho un")
+    agent.execute("écho deux")
+    snapshots = CacheSnapshotter(tmp_path)
+    assert snapshots.save([agent]) == 2
+
+    restarted = EchoAgent()
+    snapshots.attach(restarted)
+    assert restarted.execute("écho un")["cached"] is True
+    assert restarted.calls == 0
+
+
+def test_prewarm_goes_through_the_manager(tmp_path):
+    agent = EchoAgent()
+    journal = ListJournal()
+    manager = AgentManager(agents=[agent], journal=journal)
+
+    stats = prewarm(manager, ["écho un", "écho deux", "sans agent"])
+    assert stats["computed"] == 2
+    assert stats["unrouted"] == 1
+    assert stats["errors"] == 0
+    assert manager.performance_stats["total_requests"] == 3
+    assert manager.performance_stats["agent_usage"] == {"EchoAgent": 2}
+    assert [record["query"] for record in journal.records] == ["écho un", "écho deux", "sans agent"]
+
+    assert prewarm(manager, ["écho un"])["cached"] == 1
+    assert agent.calls == 2
+
+
+def test_read_prewarm_queries(tmp_path):
+    path = tmp_path / "requetes.txt"
+    path.write_text("# fréquentes\n3\técho un\nécho deux\nécho deux\n\n1\técho trois\n", encoding="utf-8")
+    assert read_prewarm_queries(path, top=2) == ["écho un", "écho deux"]
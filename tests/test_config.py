@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+⚙️ Tests de la configuration - Sections fusionnées aux valeurs par défaut, fichier analysé une fois par version
+"""
+
+import json
+import os
+
+from agents import config
+from agents.config import load_section
+from agents.llm_agent import load_llm_settings
+from agents.process_pool import load_pool_settings
+from agents.response_cache import load_cache_settings
+
+DEFAULTS = {"interval": 2.0, "enabled": False}
+
+
+def write(path, data, mtime_ns=None):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_section_overrides_known_keys_only(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, {"sampler": {"interval": 5.0, "inconnue": 1}})
+    assert load_section("sampler", DEFAULTS, path) == {"interval": 5.0, "enabled": False}
+    assert load_section("absente", DEFAULTS, path) == DEFAULTS
+
+
+def test_missing_or_invalid_file_gives_defaults(tmp_path):
+    assert load_section("sampler", DEFAULTS, tmp_path / "absent.json") == DEFAULTS
+
+    path = tmp_path / "config.json"
+    path.write_text("{pas du json", encoding="utf-8")
+    assert load_section("sampler", DEFAULTS, path) == DEFAULTS
+    write(path, {"sampler": [1, 2]})
+    assert load_section("sampler", DEFAULTS, path) == DEFAULTS
+
+
+def test_file_is_parsed_once_per_version(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    write(path, {"performance": {"process_workers": 2, "cache_max_entries": 10}}, mtime_ns=1_000_000_000)
+
+    parses = []
+    real_load = json.load
+    monkeypatch.setattr(config.json, "load", lambda f: parses.append(f.name) or real_load(f))
+    assert load_pool_settings(path)["process_workers"] == 2
+    assert load_cache_settings(path)["cache_max_entries"] == 10
+    assert len(parses) == 1
+
+    # Fichier modifié (rechargement) : nouvelle analyse
+    write(path, {"performance": {"process_workers": 3}}, mtime_ns=2_000_000_000)
+    assert load_pool_settings(path)["process_workers"] == 3
+    assert len(parses) == 2
+
+
+def test_returned_settings_are_copies(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, {"sampler": {"interval": 5.0}})
+    load_section("sampler", DEFAULTS, path)["interval"] = 0
+    assert load_section("sampler", DEFAULTS, path)["interval"] == 5.0
+    assert DEFAULTS["interval"] == 2.0
+
+
+def test_llm_settings_merge_ai_settings_and_ollama(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, {"ai_settings": {"timeout": 30, "model": "ignoré"},
+                 "ollama": {"model": "mistral", "timeout": 5, "inconnue": True}})
+    settings = load_llm_settings(path)
+    assert settings["model"] == "mistral"
+    assert settings["timeout"] == 5
+    assert "inconnue" not in settings
+
+    write(path, {"ai_settings": {"timeout": 30}}, mtime_ns=3_000_000_000)
+    assert load_llm_settings(path)["timeout"] == 30
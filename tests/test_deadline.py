@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+⏳ Tests des requêtes à budget - Délai dépassé, réponse périmée, candidat suivant et relance au p95
+(versions synchrone et asynchrone de l'AgentManager)
+"""
+
+import time
+import asyncio
+
+import pytest
+
+from agents.agent_manager import AgentManager
+from agents.base_agent import BaseAgent
+from agents.deadline import check_deadline
+from agents.response_cache import FreshnessPolicy, ResponseCache
+
+
+class StubAgent(BaseAgent):
+    """Agent candidat pour "question", lent ou en panne à la demande, qui respecte l'échéance"""
+
+    freshness = FreshnessPolicy.time_to_live(ttl=60.0)
+    routing_keywords = ("question",)
+    routing_bonus_keywords = ("question",)
+
+    def __init__(self, name: str, bonus: float, delay: float = 0.0, fail: bool = False):
+        super().__init__(name, "Tests", cache=ResponseCache())
+        self.routing_bonus = bonus
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def process(self, query: str) -> str:
+        self.calls += 1
+        end = time.monotonic() + self.delay
+        while time.monotonic() < end:
+            check_deadline()
+            time.sleep(0.005)
+        if self.fail:
+            raise RuntimeError("panne")
+        return f"réponse de {self.name}"
+
+
+@pytest.fixture(params=["sync", "async"])
+def run(request):
+    """process_query ou aprocess_query, avec le même budget"""
+    def run_query(manager, query, deadline, hedge=False):
+        if request.param == "sync":
+            return manager.process_query(query, deadline=deadline, hedge=hedge)
+        return asyncio.run(manager.aprocess_query(query, deadline=deadline, hedge=hedge))
+    return run_query
+
+
+def test_deadline_exceeded(run):
+    slow = StubAgent("SlowAgent", bonus=2.0, delay=2.0)
+    manager = AgentManager(agents=[slow])
+
+    start = time.perf_counter()
+    result = run(manager, "une question", 0.1)
+    assert time.perf_counter() - start < 0.5
+    assert result["deadline_exceeded"] is True
+    assert result["error"]
+    assert manager.performance_stats["timeouts"] == 1
+
+
+def test_stale_entry_served_on_timeout(run):
+    slow = StubAgent("SlowAgent", bonus=2.0, delay=2.0)
+    slow.cache.set(slow.get_cache_key("une question"), "ancienne réponse", stored_at=time.time() - 120)
+    manager = AgentManager(agents=[slow])
+
+    result = run(manager, "une question", 0.1)
+    assert result["response"] == "ancienne réponse"
+    assert result["stale"] is True
+    assert result["deadline_exceeded"] is True
+    assert manager.performance_stats["stale_fallbacks"] == 1
+
+
+def test_failover_to_next_ranked_agent(run):
+    broken = StubAgent("BrokenAgent", bonus=2.0, fail=True)
+    second = StubAgent("SecondAgent", bonus=1.0)
+    third = StubAgent("ThirdAgent", bonus=0.0)
+    manager = AgentManager(agents=[third, broken, second])
+
+    result = run(manager, "une question", 1.0)
+    assert result["response"] == "réponse de SecondAgent"
+    assert result["fallback_from"] == "BrokenAgent"
+    assert result["error"] is None
+    assert third.calls == 0
+
+
+def test_all_candidates_failing_returns_the_error(run):
+    broken = StubAgent("BrokenAgent", bonus=2.0, fail=True)
+    manager = AgentManager(agents=[broken])
+
+    result = run(manager, "une question", 1.0)
+    assert result["error"] == "panne"
+    assert not result.get("deadline_exceeded")
+    assert manager.performance_stats["timeouts"] == 0
+
+
+def test_hedge_wins(run):
+    slow = StubAgent("SlowAgent", bonus=2.0, delay=1.0)
+    fast = StubAgent("FastAgent", bonus=1.0, delay=0.02)
+    manager = AgentManager(agents=[slow, fast])
+    manager.hedge_min_samples = 1
+    slow.latency["miss"].record(20_000_000)  # p95 de 20ms : relance bien avant la fin de SlowAgent
+
+    start = time.perf_counter()
+    result = run(manager, "une question", 2.0, hedge=True)
+    assert time.perf_counter() - start < 0.5
+    assert result["response"] == "réponse de FastAgent"
+    assert result["fallback_from"] == "SlowAgent"
+    assert manager.performance_stats["hedged"] == 1
+    assert manager.performance_stats["hedge_wins"] == 1
+
+
+def test_no_hedge_without_enough_samples(run):
+    slow = StubAgent("SlowAgent", bonus=2.0, delay=0.1)
+    fast = StubAgent("FastAgent", bonus=1.0)
+    manager = AgentManager(agents=[slow, fast])
+
+    result = run(manager, "une question", 2.0, hedge=True)
+    assert result["response"] == "réponse de SlowAgent"
+    assert manager.performance_stats["hedged"] == 0
+    assert fast.calls == 0
+
+
+def test_cached_answer_skips_the_race(run):
+    agent = StubAgent("SlowAgent", bonus=2.0, delay=2.0)
+    agent.cache_response("une question", "déjà calculée")
+    manager = AgentManager(agents=[agent])
+
+    result = run(manager, "une question", 0.1)
+    assert result["response"] == "déjà calculée"
+    assert result["cached"] is True
+    assert agent.calls == 0
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+🧮 Tests du moteur d'expressions - Opérateurs autorisés, noms et attributs refusés, budgets, extraction
+"""
+
+import math
+
+import pytest
+
+from agents.expression import ExpressionBudgetError, ExpressionEngine, ExpressionError
+
+
+@pytest.fixture
+def engine():
+    return ExpressionEngine()
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("2+3", 5),
+    ("7 - 10", -3),
+    ("6*7", 42),
+    ("6×7", 42),
+    ("7/2", 3.5),
+    ("7÷2", 3.5),
+    ("7//2", 3),
+    ("7%4", 3),
+    ("2**10", 1024),
+    ("2^10", 1024),
+    ("-(2+3)", -5),
+    ("+4", 4),
+    ("(1+2)*(3+4)", 21),
+    ("1.5e3+1", 1501.0),
+    ("sqrt(16)", 4.0),
+    ("pow(2, 8)", 256),
+    ("2*pi", 2 * math.pi),
+    ("sin(30)", pytest.approx(0.5)),
+    ("cos(60)", pytest.approx(0.5)),
+])
+def test_whitelisted_operators(engine, expression, expected):
+    assert engine.evaluate(expression) == expected
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os')",
+    "x + 1",
+    "abs(-1)",
+    "open('f')",
+    "(1).real",
+    "pi.__class__",
+    "sqrt.__globals__",
+    "[1, 2][0]",
+    "'a' * 3",
+    "1 < 2",
+    "1 and 2",
+    "lambda: 1",
+    "2 if 1 else 3",
+    "pow(2, exp=3)",
+    "sqrt(1, 2)",
+    "1 << 8",
+    "1 & 3",
+    "True + 1",
+    "2 +",
+    "",
+])
+def test_rejected_expressions(engine, expression):
+    with pytest.raises(ExpressionError):
+        engine.evaluate(expression)
+
+
+@pytest.mark.parametrize("expression", [
+    "9**9**9",
+    "2**100000",
+    "pow(10, 5000)",
+    "10**1000 * 10**1000 * 10**1000 * 10**1000 * 10**1000",
+    "1e308*10",
+    "1e400",
+    "1" * 201,
+    "+".join(["1"] * 200),
+])
+def test_budget_rejections(engine, expression):
+    with pytest.raises(ExpressionBudgetError):
+        engine.evaluate(expression)
+
+
+def test_errors(engine):
+    with pytest.raises(ExpressionError, match="division par zéro"):
+        engine.evaluate("1/0")
+    with pytest.raises(ExpressionError, match="division par zéro"):
+        engine.evaluate("0**-1")
+    with pytest.raises(ExpressionError, match="négatif"):
+        engine.evaluate("sqrt(-4)")
+    with pytest.raises(ExpressionError, match="complexe"):
+        engine.evaluate("(-8)**0.5")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("combien font 2+3 ?", "2+3"),
+    ("calcule 1.5e3+1", "1.5e3+1"),
+    ("quel est le résultat de 10 / 4", "10 / 4"),
+    ("calcule sqrt(16) * 2", "sqrt(16) * 2"),
+    ("pow(2, 10)", "pow(2, 10)"),
+    ("2 + 3 pommes", "2 + 3"),
+    ("5km + 3km", None),
+    ("2x3", None),
+    ("calcule 3e", None),
+    ("bonjour", None),
+])
+def test_extract(engine, text, expected):
+    assert engine.extract(text) == expected
+
+
+def test_compilation_is_cached(engine):
+    engine.evaluate("2 + 3")
+    engine.evaluate("2+3")
+    info = engine._compile_cached.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
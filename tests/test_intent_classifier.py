@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+🎯 Tests du modèle de routage - Corpus requête<TAB>agent, entraînement, sauvegarde et rechargement
+"""
+
+import random
+from pathlib import Path
+
+from agents.intent_classifier import IntentClassifier, accuracy, read_examples, train
+from agents.registry import AGENT_SPECS, FALLBACK_SPEC
+from make_intent_corpus import OUTPUT_FILE, generate
+
+AGENT_NAMES = {spec.class_name for spec in AGENT_SPECS} | {FALLBACK_SPEC.class_name}
+
+
+def test_committed_corpus_matches_generator():
+    examples = list(read_examples(OUTPUT_FILE))
+    assert examples == generate()
+    assert {label for _, label in examples} == AGENT_NAMES
+
+
+def test_train_save_load_predict(tmp_path: Path):
+    examples = list(read_examples(OUTPUT_FILE))
+    random.Random(0).shuffle(examples)
+    evaluation, training = examples[:200], examples[200:]
+
+    classifier = train(training, dim=1 << 12)
+    path = tmp_path / "intent.model"
+    classifier.save(path)
+    loaded = IntentClassifier.load(path)
+
+    queries = [query for query, _ in evaluation]
+    assert loaded.labels == classifier.labels
+    assert loaded.predict_many(queries) == classifier.predict_many(queries)
+    assert accuracy([label for label, _ in loaded.predict_many(queries)], evaluation) >= 0.95
+
+    assert loaded.predict("combien de RAM")[0] == "SystemAgent"
+    assert loaded.predict("combien font 17 + 4")[0] == "MathAgent"
+    assert loaded.predict("écris un poème sur la mer")[0] == "LLMAgent"
+    label, confidence = loaded.predict("pourquoi les étoiles brillent")
+    assert label == "KnowledgeAgent" and 0.0 <= confidence <= 1.0
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+📼 Tests du journal des requêtes - Blocs écrits et relus (compressés ou non), rotation, fichier tronqué
+"""
+
+import pytest
+
+from agents.journal import COMPRESSED, FRAME, MAGIC, QueryJournal, iter_journal, journal_files, read_journal
+
+
+def entries(count: int, start: int = 0):
+    return [{"query": f"combien font {i} + {i}", "agent": "MathAgent", "ms": i / 10, "ts": float(i)}
+            for i in range(start, start + count)]
+
+
+def frames(path):
+    """Drapeaux et nombre d'enregistrements de chaque bloc d'un fichier"""
+    data = path.read_bytes()[len(MAGIC):]
+    result = []
+    while data:
+        length, flags, count = FRAME.unpack_from(data)
+        result.append((flags, count))
+        data = data[FRAME.size + length:]
+    return result
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_blocks_round_trip(tmp_path, compress):
+    journal = QueryJournal(tmp_path, compress=compress, batch_size=4)
+    written = entries(10)
+    for entry in written:
+        journal.record(dict(entry))
+    journal.close()
+
+    assert list(read_journal(journal.path)) == written
+    blocks = frames(journal.path)
+    assert sum(count for _, count in blocks) == 10
+    assert all(count <= 4 for _, count in blocks)
+    assert all(bool(flags & COMPRESSED) == compress for flags, _ in blocks)
+    assert journal.stats["records"] == 10
+
+
+def test_flush_keeps_the_writer_running(tmp_path):
+    journal = QueryJournal(tmp_path, flush_interval=60.0)
+    journal.record(dict(entries(1)[0]))
+    journal.flush()
+    assert list(read_journal(journal.path)) == entries(1)
+    assert journal._writer.is_alive()
+
+    journal.record(dict(entries(1, start=1)[0]))
+    journal.close()
+    assert list(read_journal(journal.path)) == entries(2)
+
+
+def test_rotation_keeps_backups(tmp_path):
+    journal = QueryJournal(tmp_path, compress=False, batch_size=1, max_bytes=400, backups=2)
+    written = entries(20)
+    for entry in written:
+        journal.record(dict(entry))
+        journal.flush()
+    journal.close()
+
+    files = journal_files(tmp_path)
+    names = {path.name for path in files}
+    assert names == {journal.path.name, f"{journal.path.name}.1", f"{journal.path.name}.2"}
+    assert journal.stats["rotations"] > 2
+    assert all(path.stat().st_size <= 400 for path in files)
+
+    # Les plus anciens fichiers tournés sont supprimés : on retrouve la fin du journal, dans l'ordre
+    records = [record for path in [journal.path.with_name(f"{journal.path.name}.2"),
+                                   journal.path.with_name(f"{journal.path.name}.1"), journal.path]
+               for record in read_journal(path)]
+    assert records == written[-len(records):]
+    assert sorted(r["ts"] for r in iter_journal(tmp_path)) == [r["ts"] for r in records]
+
+
+def test_truncated_last_frame_is_skipped(tmp_path):
+    journal = QueryJournal(tmp_path, batch_size=3)
+    for entry in entries(9):
+        journal.record(dict(entry))
+        if entry["ts"] % 3 == 2:
+            journal.flush()
+    journal.close()
+    assert len(frames(journal.path)) == 3
+
+    data = journal.path.read_bytes()
+    journal.path.write_bytes(data[:-5])  # Écriture interrompue au milieu du dernier bloc
+    assert list(read_journal(journal.path)) == entries(6)
+
+    journal.path.write_bytes(data[:len(MAGIC) + 2])  # En-tête de bloc incomplet
+    assert list(read_journal(journal.path)) == []
+
+
+def test_bad_magic_is_rejected(tmp_path):
+    path = tmp_path / "queries-1.njr"
+    path.write_bytes(b"PASUNJRN" + b"\x00" * 16)
+    with pytest.raises(ValueError):
+        list(read_journal(path))
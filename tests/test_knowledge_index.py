@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+📖 Tests du pack BM25 - Construction puis recherche, pack vide, requête sans correspondance, corpus d'exemple
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from agents.knowledge_agent import KnowledgeAgent
+from agents.knowledge_index import HEADER, KnowledgeIndex, build_pack, read_corpus
+
+SAMPLE_CORPUS = Path(__file__).parent.parent / "data" / "knowledge_fr.tsv"
+
+ENTRIES = [
+    ("Qu'est-ce que le DNS ?", "Le DNS traduit les noms de domaine en adresses IP."),
+    ("Qu'est-ce que SQLite ?", "SQLite est une base de données SQL embarquée dans un seul fichier."),
+    ("Pourquoi la mer est-elle salée ?", "Les rivières apportent des sels minéraux qui s'accumulent."),
+    ("Qui est Ada Lovelace ?", "Ada Lovelace est considérée comme la première programmeuse."),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / "knowledge.pack"
+    assert build_pack(ENTRIES, path) == len(ENTRIES)
+    index = KnowledgeIndex(path)
+    yield index
+    index.close()
+
+
+def test_build_and_search_round_trip(index):
+    assert len(index) == len(ENTRIES)
+    for doc_id, (question, answer) in enumerate(ENTRIES):
+        assert index.document(doc_id) == (question, answer)
+
+    score, confidence, question, answer = index.search("qu'est-ce que le DNS", k=1)[0]
+    assert question == "Qu'est-ce que le DNS ?"
+    assert answer == ENTRIES[0][1]
+    assert score > 0
+    assert 0.5 < confidence <= 1.0
+
+
+def test_results_are_ranked(index):
+    hits = index.search("base de données sqlite", k=3)
+    assert hits[0][2] == "Qu'est-ce que SQLite ?"
+    scores = [hit[0] for hit in hits]
+    assert scores == sorted(scores, reverse=True)
+    assert len(index.search("qu'est-ce que", k=10)) <= len(ENTRIES)
+
+
+def test_query_without_match(index):
+    assert index.search("xyzzy plugh") == []
+    assert index.search("") == []
+    assert index.search("+ - *") == []
+
+
+def test_empty_pack(tmp_path):
+    path = tmp_path / "empty.pack"
+    assert build_pack([], path) == 0
+    index = KnowledgeIndex(path)
+    assert len(index) == 0
+    assert index.n_terms == 0
+    assert index.search("qu'est-ce que le DNS") == []
+    index.close()
+
+
+def test_bad_magic_is_rejected(tmp_path):
+    path = tmp_path / "bad.pack"
+    path.write_bytes(HEADER.pack(b"PASUNKB1", 1, 0, 0, 0.0, *([HEADER.size] * 5)))
+    with pytest.raises(ValueError):
+        KnowledgeIndex(path)
+
+
+def test_read_corpus_formats(tmp_path):
+    jsonl = tmp_path / "corpus.jsonl"
+    jsonl.write_text("\n".join(json.dumps({"question": q, "answer": a}, ensure_ascii=False) for q, a in ENTRIES),
+                     encoding="utf-8")
+    tsv = tmp_path / "corpus.tsv"
+    tsv.write_text("# commentaire\n" + "\n".join(f"{q}\t{a}" for q, a in ENTRIES) + "\n", encoding="utf-8")
+    assert list(read_corpus(jsonl)) == ENTRIES
+    assert list(read_corpus(tsv)) == ENTRIES
+
+
+def test_sample_corpus_answers_through_the_agent(tmp_path):
+    path = tmp_path / "knowledge.pack"
+    assert build_pack(read_corpus(SAMPLE_CORPUS), path) >= 30
+
+    agent = KnowledgeAgent(index_path=path)
+    assert agent.cpu_bound is True
+    assert "dioxyde de carbone" in agent.process("qu'est-ce que la photosynthèse")
+    assert "Enigma" in agent.process("qui est alan turing")
+    # Base intégrée prioritaire, réponses génériques sans correspondance suffisante
+    assert "Rayleigh" in agent.process("pourquoi le ciel est bleu")
+    assert agent.process("comment xyzzy plugh").startswith("🛠️")
+    agent.index.close()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+🦙 Tests de LLMAgent - Serveur local imitant l'API Ollama (/api/generate en flux ou non, /api/tags)
+"""
+
+import json
+import time
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from agents.deadline import Deadline, deadline_scope
+from agents.llm_agent import LLMAgent
+from agents.response_cache import ResponseCache
+
+MODEL = "llama3.2:3b"
+
+
+class OllamaStub(BaseHTTPRequestHandler):
+    """Réponses d'Ollama selon le mode du serveur : "ok", "error" (ligne d'erreur) ou "slow" """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": name} for name in self.server.models]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(payload)
+        mode = self.server.mode
+
+        if not payload["prompt"]:
+            self._send_json(200, {"model": payload["model"], "response": "", "done": True})
+            return
+        if mode == "slow":
+            time.sleep(1.0)
+        if not payload["stream"]:
+            if mode == "error":
+                self._send_json(500, {"error": "model crashed"})
+            else:
+                self._send_json(200, {"response": " Bonjour de Nina ", "done": True})
+            return
+
+        lines = [{"response": "Bonjour"}, {"response": " de"}]
+        lines.append({"error": "model crashed"} if mode == "error" else {"response": " Nina"})
+        lines.append({"response": "", "done": True})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for line in lines:
+            data = json.dumps(line).encode("utf-8") + b"\n"
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture
+def ollama():
+    """Serveur Ollama factice sur un port libre"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OllamaStub)
+    server.daemon_threads = True
+    server.handle_error = lambda request, address: None  # Client parti avant la réponse (délais dépassés)
+    server.mode = "ok"
+    server.models = [MODEL]
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_agent(host: str, timeout: float = 5.0) -> LLMAgent:
+    agent = LLMAgent(host=host, model=MODEL, timeout=timeout, connect_timeout=1.0)
+    agent.cache = ResponseCache()
+    return agent
+
+
+def closed_port() -> int:
+    """Port local sur lequel rien n'écoute"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_process_returns_full_response(ollama):
+    agent = make_agent(ollama.url)
+    assert agent.process("Raconte une histoire") == "Bonjour de Nina"
+    payload = ollama.requests[-1]
+    assert payload["model"] == MODEL
+    assert payload["stream"] is False
+    assert payload["system"]
+    assert payload["options"]["num_predict"] == agent.max_tokens
+    assert agent.is_available()
+
+
+def test_stream_is_assembled_and_cached(ollama):
+    agent = make_agent(ollama.url)
+    stream = agent.execute_stream("Raconte une histoire")
+    assert list(stream) == ["Bonjour", " de", " Nina"]
+    assert stream.result["cached"] is False
+
+    requests_before = len(ollama.requests)
+    result = agent.execute("Raconte une histoire")
+    assert result["cached"] is True
+    assert result["response"] == "Bonjour de Nina"
+    assert len(ollama.requests) == requests_before
+
+
+def test_async_stream(ollama):
+    agent = make_agent(ollama.url)
+
+    async def consume():
+        stream = agent.aexecute_stream("Raconte une histoire")
+        return await stream.text(), stream.result
+
+    text, result = asyncio.run(consume())
+    assert text == "Bonjour de Nina"
+    assert result["agent"] == "LLMAgent"
+
+
+def test_warm_up_checks_installed_models(ollama):
+    agent = make_agent(ollama.url)
+    assert agent.warm_up() is True
+    assert agent.warm_up_time is not None
+    assert ollama.requests[-1]["prompt"] == ""
+
+    ollama.models = ["mistral:latest"]
+    missing = make_agent(ollama.url)
+    assert missing.list_models() == ["mistral:latest"]
+    assert missing.warm_up() is False
+    assert not missing.is_available()
+
+
+def test_connection_refused_marks_unavailable():
+    agent = make_agent(f"http://127.0.0.1:{closed_port()}")
+    with pytest.raises(requests.ConnectionError):
+        agent.execute("Raconte une histoire")
+    assert not agent.is_available()
+    assert agent.warm_up() is False
+
+    # Retenté après retry_after secondes
+    agent.retry_after = 0.0
+    assert agent.is_available()
+
+
+def test_error_line_is_raised_and_not_cached(ollama):
+    ollama.mode = "error"
+    agent = make_agent(ollama.url)
+    with pytest.raises(RuntimeError, match="model crashed"):
+        list(agent.execute_stream("Raconte une histoire"))
+    with pytest.raises(requests.HTTPError):
+        agent.process("Raconte une histoire")
+    assert len(agent.cache) == 0
+
+    ollama.mode = "ok"
+    assert agent.execute("Raconte une histoire")["cached"] is False
+
+
+def test_read_timeout(ollama):
+    ollama.mode = "slow"
+    agent = make_agent(ollama.url, timeout=0.2)
+    start = time.perf_counter()
+    with pytest.raises(requests.Timeout):
+        agent.process("Raconte une histoire")
+    assert time.perf_counter() - start < 0.9
+    # Un serveur lent reste joignable
+    assert agent.is_available()
+
+
+def test_deadline_bounds_read_timeout(ollama):
+    ollama.mode = "slow"
+    agent = make_agent(ollama.url, timeout=15.0)
+    start = time.perf_counter()
+    with deadline_scope(Deadline(0.2)), pytest.raises(requests.Timeout):
+        agent.process("Raconte une histoire")
+    assert time.perf_counter() - start < 0.9
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+🌐 Tests du serveur - Routes /health et /query sur un port libre, rechargement par SIGHUP, ancienne instance libérée
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import signal
+import subprocess
+import weakref
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+CONFIG = {
+    "ollama": {"enabled": False},
+    "performance": {"process_workers": 0, "cache_backend": "memory"},
+    "journal": {"enabled": False},
+    "snapshots": {"enabled": False},
+}
+
+# Serveur préforké (un worker) dont le cache persistant est placé dans le dossier du test
+SERVER = """
+import sys
+from pathlib import Path
+import nina_advanced, nina_server
+
+directory = Path(sys.argv[1])
+nina_advanced.CACHE_DB = directory / "cache.db"
+nina_advanced.CACHE_FILE = directory / "cache.json"
+sys.argv = ["nina_server.py", "--port", "0", "--workers", "1"]
+nina_server.main()
+"""
+
+pytestmark = pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="workers préforkés : POSIX uniquement")
+
+
+def request(url: str, payload: dict = None) -> dict:
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    with urllib.request.urlopen(url, data=data, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def wait_for_pid_change(url: str, old_pid: int, timeout: float = 15.0) -> int:
+    """pid du worker qui répond, une fois différent de l'ancien"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            pid = request(url)["pid"]
+        except OSError:
+            pid = old_pid
+        if pid != old_pid:
+            return pid
+        time.sleep(0.1)
+    raise AssertionError("aucun nouveau worker après SIGHUP")
+
+
+@pytest.fixture
+def server(tmp_path):
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps(CONFIG), encoding="utf-8")
+    process = subprocess.Popen(
+        [sys.executable, "-u", "-c", SERVER, str(tmp_path)], cwd=SRC_DIR,
+        env=dict(os.environ, NINA_CONFIG=str(config)),
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8",
+    )
+    url = None
+    for line in process.stdout:
+        match = re.search(r"http://127\.0\.0\.1:(\d+)", line)
+        if match:
+            url = f"http://127.0.0.1:{match.group(1)}"
+            break
+    assert url is not None, "serveur non démarré"
+    yield process, url
+
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    process.stdout.close()
+
+
+def test_health_query_and_reload(server):
+    process, url = server
+
+    health = wait_for_pid_change(f"{url}/health", process.pid)
+    assert request(f"{url}/health")["status"] == "ok"
+
+    result = request(f"{url}/query", {"query": "combien font 2+3"})
+    assert result["agent"] == "MathAgent"
+    assert "5" in result["response"]
+
+    process.send_signal(signal.SIGHUP)
+    reloaded = wait_for_pid_change(f"{url}/health", health)
+    assert reloaded != process.pid
+    result = request(f"{url}/query", {"query": "combien font 6*7"})
+    assert "42" in result["response"]
+
+
+def test_reload_releases_the_previous_instance(tmp_path, monkeypatch):
+    import gc
+    import nina_advanced
+    import nina_server
+
+    monkeypatch.setattr(nina_advanced, "CACHE_DB", tmp_path / "cache.db")
+    monkeypatch.setattr(nina_advanced, "CACHE_FILE", tmp_path / "cache.json")
+    monkeypatch.setattr(nina_server, "nina", None)
+    server = nina_server.PreforkServer(port=0, workers=1)
+    try:
+        server.load()
+        previous = weakref.ref(nina_server.nina)
+        store = nina_server.nina.cache
+
+        server.load()
+        assert store._conn is None
+        # Plus de handler atexit qui retienne l'ancienne instance : le GC la libère
+        del store
+        gc.collect()
+        assert previous() is None
+    finally:
+        gc.unfreeze()
+        nina_server.nina.close()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+🏭 Tests du pool de processus - Agents gourmands en CPU exécutés hors du processus, y compris en flux
+"""
+
+import asyncio
+
+import pytest
+
+from agents.agent_manager import AgentManager
+from agents.knowledge_agent import KnowledgeAgent
+from agents.math_agent import MathAgent
+from agents.process_pool import AgentProcessPool
+from agents.registry import AGENT_SPECS
+from agents.response_cache import ResponseCache
+
+
+@pytest.fixture(scope="module")
+def manager():
+    pool = AgentProcessPool(AGENT_SPECS, workers=1)
+    math, knowledge = MathAgent(), KnowledgeAgent()
+    math.cache, knowledge.cache = ResponseCache(), ResponseCache()
+    manager = AgentManager(agents=[math, knowledge], process_pool=pool)
+    yield manager
+    pool.shutdown()
+
+
+def worker_tasks(manager) -> int:
+    return manager.process_pool.get_stats()["tasks"]
+
+
+def test_stream_runs_cpu_bound_agent_in_pool(manager):
+    before = worker_tasks(manager)
+    stream = manager.process_query_stream("12*12")
+    chunks = list(stream)
+    assert chunks == [stream.result["response"]]
+    assert "144" in chunks[0]
+    assert stream.result["agent"] == "MathAgent"
+    assert worker_tasks(manager) == before + 1
+
+    # Réponse mise en cache dans ce processus : le flux suivant ne sollicite plus le pool
+    assert manager.process_query_stream("12 * 12").text() == chunks[0]
+    assert worker_tasks(manager) == before + 1
+
+
+def test_async_stream_runs_cpu_bound_agent_in_pool(manager):
+    before = worker_tasks(manager)
+
+    async def consume():
+        stream = manager.aprocess_query_stream("13*13")
+        return await stream.text(), stream.result
+
+    text, result = asyncio.run(consume())
+    assert "169" in text
+    assert worker_tasks(manager) == before + 1
+
+
+def test_stream_stays_local_when_not_cpu_bound(manager):
+    before = worker_tasks(manager)
+    assert manager.process_query_stream("14*14", cpu_bound=False).text()
+    assert manager.process_query_stream("pourquoi le ciel est bleu").text()
+    assert worker_tasks(manager) == before
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+🧹 Tests de la forme canonique - Requêtes équivalentes regroupées, requêtes différentes jamais confondues
+"""
+
+import pytest
+
+from agents.math_agent import MathAgent
+from agents.query_normalizer import NearDuplicateIndex, canonicalize, has_literals
+from agents.response_cache import ResponseCache
+
+
+@pytest.mark.parametrize("first,second", [
+    (".5*2", "5*2"),
+    ("10 0 + 1", "10 000 + 1"),
+    ("5!", "5"),
+    ("√16", "16"),
+    ("2.50 + 1", "2.5 + 1"),
+    ("007 * 2", "7 * 2"),
+    ("2**3", "2*3"),
+    ("c#", "c"),
+    ("racine de π", "racine"),
+])
+def test_distinct_queries_never_collide(first, second):
+    assert canonicalize(first) != canonicalize(second)
+
+
+@pytest.mark.parametrize("first,second", [
+    ("Pourquoi le ciel est-il bleu ?", "pourquoi ciel est bleu"),
+    ("Qu'est-ce que Linux", "qu’est-ce que linux"),
+    ("Bonjour !", "bonjour"),
+    ("2 + 2", "2+2"),
+    ("  Combien font 3 *  4", "combien font 3*4"),
+    ("Économie", "economie"),
+])
+def test_equivalent_queries_share_a_key(first, second):
+    assert canonicalize(first) == canonicalize(second)
+
+
+def test_literals_are_detected():
+    assert has_literals("2+2")
+    assert has_literals("√16")
+    assert not has_literals("Pourquoi le ciel est-il bleu ?")
+
+
+def test_math_cache_keeps_distinct_results():
+    agent = MathAgent()
+    agent.cache = ResponseCache()
+    first = agent.execute("5*2")
+    second = agent.execute(".5*2")
+    assert second["cached"] is False
+    assert second["response"] != first["response"]
+    assert agent.execute("5 * 2")["cached"] is True
+
+
+def test_near_duplicates_ignore_literal_queries():
+    agent = MathAgent()
+    agent.cache = ResponseCache(near_duplicate_threshold=0.5)
+    assert agent._near_duplicate_text("combien font 2+2") is None
+    assert agent._near_duplicate_text("pourquoi le ciel est bleu") == "pourquoi ciel est bleu"
+
+
+def test_near_duplicate_buckets_are_capped():
+    index = NearDuplicateIndex(threshold=0.8, max_bucket=4)
+    for i in range(50):
+        index.add(f"k{i}", "pourquoi ciel est bleu")
+    assert len(index) == 50
+    assert max(len(members) for band in index._buckets for members in band.values()) == 4
+    # Les clés les plus récentes restent dans les buckets
+    assert index.find("pourquoi ciel est bleu")[0] in {f"k{i}" for i in range(46, 50)}
+
+    for i in range(50):
+        index.remove(f"k{i}")
+    assert len(index) == 0
+    assert all(not band for band in index._buckets)
+
+
+def test_near_duplicate_find_keeps_the_closest_candidate():
+    index = NearDuplicateIndex(threshold=0.5, max_candidates=2)
+    index.add("ciel", "pourquoi ciel est bleu")
+    index.add("mer", "pourquoi mer est salee")
+    index.add("linux", "comment installer linux")
+    assert index.find("pourquoi ciel est bleu ?")[0] == "ciel"
+    assert index.find("quelle heure est-il") is None
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+💾 Tests du stockage persistant - Migration de l'ancien cache et réécriture des clés
+"""
+
+import json
+import time
+
+from agents.query_normalizer import KEY_VERSION, canonicalize
+from agents.response_store import ResponseStore
+
+
+def test_legacy_json_keys_are_rekeyed(tmp_path):
+    legacy = tmp_path / "nina_advanced_cache.json"
+    legacy.write_text(json.dumps({
+        "pourquoi le ciel est-il bleu ?": "Diffusion de Rayleigh",
+        "2 + 2": {"response": "4 (ancien)", "agent": "MathAgent", "cached_at": 1.0},
+        "2+2": {"response": "4", "agent": "MathAgent", "cached_at": 2.0},
+    }), encoding="utf-8")
+
+    store = ResponseStore(tmp_path / "cache.db", legacy_json=legacy)
+    assert store.rekey(canonicalize, KEY_VERSION) == 2
+    assert store.get("pourquoi ciel est bleu")["response"] == "Diffusion de Rayleigh"
+    # Deux anciennes clés pour la même requête : la plus récente est gardée
+    assert store.get("2+2")["response"] == "4"
+    assert len(store) == 2
+
+    # Migration faite une seule fois : les clés écrites ensuite ne sont plus touchées
+    store.set("Clé Brute", {"response": "x", "agent": None, "cached_at": time.time()})
+    assert store.rekey(canonicalize, KEY_VERSION) == 0
+    assert store.get("Clé Brute") is not None
+    store.close()
+
+
+def test_nina_finds_legacy_entries(tmp_path):
+    from agents.agent_manager import AgentManager
+    from agents.math_agent import MathAgent
+    from nina_advanced import NinaAdvanced
+
+    path = tmp_path / "cache.db"
+    store = ResponseStore(path)
+    store.set("qu'est-ce que le cache ?", {"response": "Réponse gardée", "agent": None, "cached_at": time.time()})
+    store.close()
+
+    nina = NinaAdvanced(agent_manager=AgentManager(agents=[MathAgent()]), cache_db=path)
+    assert nina.get_response("Qu'est-ce que le cache ?").startswith("Réponse gardée")
+    nina.cache.close()
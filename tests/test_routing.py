@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+🧭 Tests du routage - RoutingIndex comparé au parcours can_handle des agents et aux choix de l'ancien routage
+"""
+
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from agents.agent_manager import AgentManager
+from agents.knowledge_agent import KnowledgeAgent
+from agents.math_agent import MathAgent
+from agents.system_agent import SystemAgent
+from agents.system_sampler import StaticSampler
+
+FIXTURE = Path(__file__).parent / "fixtures" / "routing_fr.tsv"
+
+
+def read_fixture() -> List[Tuple[str, str]]:
+    """Paires (requête, agent attendu) du fichier de référence"""
+    pairs = []
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            query, expected = line.rstrip("\n").split("\t")
+            pairs.append((query, expected))
+    return pairs
+
+
+CASES = read_fixture()
+
+
+@pytest.fixture(scope="module")
+def manager() -> AgentManager:
+    return AgentManager(agents=[MathAgent(), KnowledgeAgent(), SystemAgent(sampler=StaticSampler())])
+
+
+@pytest.mark.parametrize("query", [query for query, _ in CASES])
+def test_route_matches_can_handle_scan(manager, query):
+    """Les candidats de l'index sont exactement les agents dont can_handle accepte la requête"""
+    routed = [agent.name for agent, _ in manager.routing_index.route(query)]
+    scanned = [agent.name for agent in manager.agents if agent.can_handle(query)]
+    assert routed == scanned
+
+
+@pytest.mark.parametrize("query,expected", CASES)
+def test_best_agent_matches_previous_routing(manager, query, expected):
+    """find_best_agent choisit le même agent que l'ancien parcours (agents sans historique de performances)"""
+    agent = manager.find_best_agent(query)
+    assert (agent.name if agent is not None else "-") == expected
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+🤝 Tests du cache partagé - Écritures et lectures depuis plusieurs processus, compteurs fusionnés, fraîcheur
+"""
+
+import sys
+import time
+import sqlite3
+import hashlib
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from agents.response_cache import FreshnessPolicy, FRESH, STALE, create_response_cache, DEFAULT_SETTINGS
+from agents.shared_cache import SharedResponseCache
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+NAMESPACE = "TestAgent"
+LONG_ANSWER = "Une réponse partagée assez longue pour être compressée. " * 20
+
+# Processus distinct : écrit ou lit une clé, publie ses compteurs puis attend la fin du test sur stdin
+WORKER = """
+import sys, time, hashlib
+from agents.response_cache import FreshnessPolicy
+from agents.shared_cache import SharedResponseCache
+
+path, action, query, value, age = sys.argv[1:]
+cache = SharedResponseCache(path, "TestAgent", compress_threshold=64)
+key = hashlib.md5(query.encode()).digest()
+if action == "write":
+    cache.set(key, value, stored_at=time.time() - float(age))
+    cache.lookup(hashlib.md5(b"absente").digest(), FreshnessPolicy.forever())
+else:
+    entry = cache.lookup(key, FreshnessPolicy.forever())
+    print(entry[0] if entry else "", flush=True)
+cache.publish_stats()
+print("prêt", flush=True)
+sys.stdin.read()
+cache.close()
+"""
+
+
+def key_of(query: str) -> bytes:
+    return hashlib.md5(query.encode()).digest()
+
+
+def start_worker(path: Path, action: str, query: str, value: str = "", age: float = 0.0):
+    """Lance un processus sur le cache ; retourne le processus et ses lignes de sortie jusqu'à "prêt" """
+    process = subprocess.Popen(
+        [sys.executable, "-c", WORKER, str(path), action, query, value, str(age)],
+        cwd=SRC_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding="utf-8",
+    )
+    lines = []
+    for line in process.stdout:
+        if line.strip() == "prêt":
+            break
+        lines.append(line.rstrip("\n"))
+    return process, lines
+
+
+def stop(process):
+    process.stdin.close()
+    process.wait(timeout=10)
+
+
+def test_entries_and_stats_shared_between_processes(tmp_path):
+    path = tmp_path / "shared.db"
+    writer, _ = start_worker(path, "write", "question", LONG_ANSWER)
+    reader, lines = start_worker(path, "read", "question")
+    try:
+        assert lines == [LONG_ANSWER]
+
+        cache = SharedResponseCache(path, NAMESPACE)
+        stats = cache.global_stats()
+        assert set(stats["workers"]) >= {writer.pid, reader.pid}
+        assert stats["workers"][writer.pid]["misses"] == 1
+        assert stats["workers"][writer.pid]["compressed"] == 1
+        assert stats["workers"][reader.pid]["hits"] == 1
+        assert stats["total"]["hits"] == 1
+        assert stats["total"]["misses"] == 1
+        assert stats["total"]["hit_rate"] == 0.5
+    finally:
+        stop(writer)
+        stop(reader)
+
+    # Compteurs des processus terminés retirés à l'ouverture suivante
+    restarted = SharedResponseCache(path, NAMESPACE)
+    assert set(restarted.global_stats()["workers"]) == {restarted._pid}
+
+
+def test_keys_are_blobs_and_long_values_compressed(tmp_path):
+    path = tmp_path / "shared.db"
+    cache = SharedResponseCache(path, NAMESPACE, compress_threshold=64)
+    cache.set(key_of("longue"), LONG_ANSWER)
+    cache.set(key_of("courte"), "4")
+    cache.close()
+
+    with sqlite3.connect(path) as conn:
+        rows = dict(conn.execute("SELECT typeof(key), COUNT(*) FROM entries GROUP BY typeof(key)").fetchall())
+        types = dict(conn.execute("SELECT key, typeof(value) FROM entries").fetchall())
+    assert rows == {"blob": 2}
+    assert types[key_of("longue")] == "blob"
+    assert types[key_of("courte")] == "text"
+
+    reopened = SharedResponseCache(path, NAMESPACE)
+    assert reopened.get(key_of("longue")) == LONG_ANSWER
+    assert reopened.peek(key_of("courte")) == "4"
+
+
+def test_freshness_applied_on_read(tmp_path):
+    path = tmp_path / "shared.db"
+    writer, _ = start_worker(path, "write", "ancienne", "réponse ancienne", age=120)
+    try:
+        cache = SharedResponseCache(path, NAMESPACE)
+        key = key_of("ancienne")
+        assert cache.lookup(key, FreshnessPolicy.forever()) == ("réponse ancienne", FRESH)
+        assert cache.lookup(key, FreshnessPolicy.stale_while_revalidate(ttl=60, max_stale=300)) == \
+            ("réponse ancienne", STALE)
+        assert cache.stats["stale_hits"] == 1
+
+        # Expirée : supprimée pour tous les processus
+        assert cache.lookup(key, FreshnessPolicy.time_to_live(ttl=60)) is None
+        assert key not in cache
+    finally:
+        stop(writer)
+
+
+def test_create_response_cache_passes_compression(tmp_path):
+    settings = dict(DEFAULT_SETTINGS, cache_backend="shared", shared_cache_path=str(tmp_path / "shared.db"),
+                    cache_compress_threshold=128)
+    cache = create_response_cache(NAMESPACE, settings=settings)
+    assert isinstance(cache, SharedResponseCache)
+    assert cache.compress_threshold == 128
+    assert cache.max_entries == DEFAULT_SETTINGS["cache_max_entries"]
+
+
+@pytest.mark.parametrize("backend", ["memory", "shared"])
+def test_create_response_cache_applies_the_configured_budgets(tmp_path, backend):
+    settings = dict(DEFAULT_SETTINGS, cache_backend=backend, shared_cache_path=str(tmp_path / "shared.db"),
+                    cache_max_entries=3, cache_max_mb=0.5)
+    cache = create_response_cache(NAMESPACE, settings=settings)
+    assert cache.max_entries == 3
+    assert cache.max_bytes == 512 * 1024
+
+    # Le cache partagé contrôle son budget toutes les evict_every (32) écritures
+    for i in range(32):
+        cache.set(key_of(f"question {i}"), f"réponse {i}", stored_at=time.time())
+    assert len(cache) == 3
+
+
+def test_old_schema_is_recreated(tmp_path):
+    path = tmp_path / "shared.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, namespace TEXT NOT NULL, value TEXT NOT NULL, "
+                     "size INTEGER NOT NULL, stored_at REAL NOT NULL, used_at REAL NOT NULL)")
+        conn.execute("INSERT INTO entries VALUES ('ancienne', 'TestAgent', 'x', 1, 0, 0)")
+
+    cache = SharedResponseCache(path, NAMESPACE)
+    assert len(cache) == 0
+    cache.set(key_of("question"), "réponse", stored_at=time.time())
+    assert cache.get(key_of("question")) == "réponse"
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+🔗 Tests de la fusion des requêtes - Calculs identiques simultanés partagés, y compris en flux
+"""
+
+import time
+import asyncio
+import threading
+
+from agents.base_agent import BaseAgent
+from agents.deadline import Deadline, DeadlineExceeded, check_deadline, deadline_scope
+from agents.response_cache import ResponseCache
+
+
+class SlowStreamAgent(BaseAgent):
+    """Agent dont le flux est lent et compté"""
+
+    def __init__(self):
+        super().__init__("SlowStreamAgent", "Tests", cache=ResponseCache())
+        self.calls = 0
+        self.started = threading.Event()
+
+    def process(self, query: str) -> str:
+        return "".join(self.process_stream(query))
+
+    def process_stream(self, query: str):
+        self.calls += 1
+        self.started.set()
+        for chunk in ("un", " deux", " trois"):
+            time.sleep(0.05)
+            yield chunk
+
+
+class BudgetedAgent(BaseAgent):
+    """Agent lent qui respecte l'échéance de la requête"""
+
+    def __init__(self):
+        super().__init__("BudgetedAgent", "Tests", cache=ResponseCache())
+        self.calls = 0
+        self.started = threading.Event()
+
+    def process(self, query: str) -> str:
+        self.calls += 1
+        self.started.set()
+        time.sleep(0.15)
+        check_deadline()
+        return "réponse"
+
+
+def follow(agent: BaseAgent, query: str, results: list):
+    """Flux lancé une fois le premier en cours"""
+    agent.started.wait(1.0)
+    stream = agent.execute_stream(query)
+    results.append((list(stream), stream.result))
+
+
+def test_identical_streams_share_one_computation():
+    agent = SlowStreamAgent()
+    results = []
+    follower = threading.Thread(target=follow, args=(agent, "compte", results))
+    follower.start()
+
+    leader = agent.execute_stream("compte")
+    assert list(leader) == ["un", " deux", " trois"]
+    follower.join()
+
+    chunks, result = results[0]
+    assert chunks == ["un deux trois"]
+    assert result["coalesced"] is True
+    assert agent.calls == 1
+    assert agent.inflight.get_stats()["coalesced"] == 1
+    assert agent.inflight.in_flight() == 0
+
+
+def test_abandoned_stream_lets_followers_compute():
+    agent = SlowStreamAgent()
+    results = []
+    follower = threading.Thread(target=follow, args=(agent, "compte", results))
+    follower.start()
+
+    leader = iter(agent.execute_stream("compte"))
+    assert next(leader) == "un"
+    time.sleep(0.1)  # Le second flux attend celui-ci
+    leader.close()
+    follower.join()
+
+    chunks, result = results[0]
+    assert chunks == ["un deux trois"]
+    assert agent.calls == 2
+    assert agent.inflight.in_flight() == 0
+
+
+def test_identical_async_streams_share_one_computation():
+    agent = SlowStreamAgent()
+
+    async def consume():
+        first = agent.aexecute_stream("compte")
+        second = agent.aexecute_stream("compte")
+
+        async def text(stream):
+            return [chunk async for chunk in stream], stream.result
+
+        return await asyncio.gather(text(first), text(second))
+
+    (first_chunks, first), (second_chunks, second) = asyncio.run(consume())
+    assert first_chunks == ["un", " deux", " trois"]
+    assert second_chunks == ["un deux trois"]
+    assert second["coalesced"] is True
+    assert agent.calls == 1
+
+
+def test_deadline_caller_never_leads_a_shared_computation():
+    agent = BudgetedAgent()
+    errors = []
+
+    def hurried():
+        with deadline_scope(Deadline(0.05)):
+            try:
+                agent.execute("question")
+            except DeadlineExceeded as e:
+                errors.append(e)
+
+    caller = threading.Thread(target=hurried)
+    caller.start()
+    agent.started.wait(1.0)
+    # Appel sans échéance : ni le budget ni l'abandon de l'appel pressé ne le touchent
+    result = agent.execute("question")
+    caller.join()
+
+    assert result["response"] == "réponse"
+    assert not result.get("coalesced")
+    assert len(errors) == 1
+    assert agent.calls == 2
+    assert agent.inflight.in_flight() == 0
+
+
+def test_deadline_caller_follows_a_shared_computation():
+    agent = BudgetedAgent()
+    results = []
+
+    def hurried():
+        agent.started.wait(1.0)
+        with deadline_scope(Deadline(1.0)):
+            results.append(agent.execute("question"))
+
+    caller = threading.Thread(target=hurried)
+    caller.start()
+    assert not agent.execute("question").get("coalesced")
+    caller.join()
+
+    assert results[0]["coalesced"] is True
+    assert agent.calls == 1
+
+
+def test_deadline_stream_never_leads():
+    agent = SlowStreamAgent()
+    with deadline_scope(Deadline(1.0)):
+        stream = iter(agent.execute_stream("compte"))
+        assert next(stream) == "un"
+        assert agent.inflight.in_flight() == 0
+        stream.close()
+    assert agent.inflight.get_stats()["computations"] == 1
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+🚀 Test du démarrage à froid - Dépendances lourdes différées, budget performance.startup_budget_ms (--benchmarks)
+"""
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+import pytest
+
+from bench_nina import CONFIG_FILE, SRC_DIR, STARTUP_CODE, load_startup_budget, startup_time
+
+# Chargés au premier usage seulement (client HTTP du LLM, métriques système, cache partagé SQLite)
+DEFERRED_MODULES = ("requests", "urllib3", "psutil", "agents.system_sampler", "agents.shared_cache")
+
+
+@pytest.fixture
+def isolated_env(tmp_path):
+    """Environnement d'un démarrage sans Ollama, instantanés ni journal (configuration copiée)"""
+    config = json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+    config.setdefault("ollama", {})["enabled"] = False
+    config.setdefault("snapshots", {})["enabled"] = False
+    config.setdefault("journal", {})["enabled"] = False
+    config.setdefault("performance", {})["cache_backend"] = "memory"
+    path = tmp_path / "nina_pro_config.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return dict(os.environ, NINA_CONFIG=str(path))
+
+
+def test_cold_start_defers_heavy_modules(isolated_env):
+    code = STARTUP_CODE + "; print('\\n'.join(sorted(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code, str(SRC_DIR)], check=True, env=isolated_env,
+                            capture_output=True, text=True, encoding="utf-8").stdout
+    modules = set(output.split())
+    assert "nina_advanced" in modules
+    assert not modules & set(DEFERRED_MODULES)
+
+
+@pytest.mark.benchmark
+def test_cold_start_within_budget(isolated_env):
+    budget = load_startup_budget()
+    if not budget:
+        pytest.skip("performance.startup_budget_ms non configuré")
+
+    startup_time(isolated_env)  # Fichiers .pyc et cache disque préparés
+    median_ms = statistics.median(startup_time(isolated_env) for _ in range(3)) / 1e6
+    assert median_ms <= budget, f"démarrage à froid {median_ms:.0f}ms > budget {budget:.0f}ms"
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+📡 Tests de l'échantillonneur système - Processus relevés à la demande, hors de la boucle d'échantillonnage
+"""
+
+import psutil
+
+from agents.system_sampler import SystemSampler, load_sampler_settings
+
+
+def count_scans(monkeypatch):
+    """Compte les parcours de la table des processus"""
+    calls = []
+    process_iter = psutil.process_iter
+
+    def counting(*args, **kwargs):
+        calls.append(1)
+        return process_iter(*args, **kwargs)
+
+    monkeypatch.setattr(psutil, "process_iter", counting)
+    return calls
+
+
+def test_samples_do_not_scan_processes(monkeypatch):
+    calls = count_scans(monkeypatch)
+    sampler = SystemSampler(interval=60)
+    snapshot = sampler._collect(None)
+    assert "process_count" in snapshot
+    assert calls == []
+
+
+def test_top_processes_are_scanned_at_most_once_per_interval(monkeypatch):
+    calls = count_scans(monkeypatch)
+    sampler = SystemSampler(interval=60, process_interval=60)
+    top = sampler.get_top_processes(3)
+    scans = len(calls)
+    assert 0 < len(top) <= 3
+    assert all(isinstance(pid, int) and cpu >= 0 for pid, _, cpu in top)
+    assert [cpu for _, _, cpu in top] == sorted((cpu for _, _, cpu in top), reverse=True)
+
+    assert sampler.get_top_processes(3) == top
+    assert len(calls) == scans
+
+    sampler.process_interval = 0
+    sampler.get_top_processes(3)
+    assert len(calls) == scans + 1
+
+
+def test_settings_expose_intervals():
+    settings = load_sampler_settings()
+    assert settings["interval"] > 0
+    assert settings["process_interval"] >= 0